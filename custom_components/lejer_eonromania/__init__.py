@@ -20,20 +20,53 @@
 
 """The E-ON Romania integration."""
 
+import asyncio
 import logging
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+import time
+import voluptuous as vol
+from homeassistant.components import persistent_notification
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse, callback
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 
-from .const import DOMAIN, DEFAULT_UPDATE_INTERVAL
+from .const import (
+    DOMAIN, DEFAULT_UPDATE_INTERVAL, DEFAULT_MAX_CONCURRENCY, KEY_PAID_INVOICES,
+    DEFAULT_WARM_INTERVAL, DEFAULT_COLD_INTERVAL, DEFAULT_TOPOLOGY_INTERVAL, STORAGE_VERSION,
+    TOKEN_REFRESH_MARGIN, INVOICE_ARCHIVE_DIR, DEFAULT_MIRROR_CONCURRENCY, DATA_CLIENTS,
+)
 from .api import EonApiClient
-from .coordinator import EonRomaniaCoordinator
+from .clients import async_get_registry, async_release_client, shared_options
+from .archive import async_mirror_invoices
+from .coordinator import CONTRACT_FETCHERS, EonRomaniaCoordinator, snapshot_storage_key
 from . import sensor, button
 
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
+SUBMIT_READINGS_SCHEMA = vol.Schema({
+    vol.Required("readings"): vol.All(cv.ensure_list, [vol.Schema({
+        vol.Required("cod_incasare"): cv.string,
+        vol.Required("index"): vol.Coerce(int),
+        vol.Optional("ablbelnr"): cv.string,
+        vol.Optional("device_number"): cv.string,
+    })]),
+})
+
+MIRROR_INVOICES_SCHEMA = vol.Schema({
+    vol.Optional("cod_incasare"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("max_concurrency", default=DEFAULT_MIRROR_CONCURRENCY): vol.All(
+        vol.Coerce(int), vol.Range(min=1, max=16)
+    ),
+    vol.Optional("verify", default=False): cv.boolean,
+})
+
+REFRESH_KEYS_SCHEMA = vol.Schema({
+    vol.Required("keys"): vol.All(cv.ensure_list, [vol.In(list(CONTRACT_FETCHERS))]),
+    vol.Optional("cod_incasare"): vol.All(cv.ensure_list, [cv.string]),
+})
+
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup(hass: HomeAssistant, config: dict):
@@ -48,28 +81,55 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     _LOGGER.debug("Configurarea intrării pentru %s", DOMAIN)
     hass.data.setdefault(DOMAIN, {})
 
-    # Creăm clientul API
-    session = async_get_clientsession(hass)
+    # Clientul API al contului, cu sesiunea și limitele de cereri comune tuturor intrărilor
     username = entry.data["username"]
     password = entry.data["password"]
     update_interval = entry.options.get("update_interval", DEFAULT_UPDATE_INTERVAL)
+    max_concurrency = entry.options.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)
 
-    api_client = EonApiClient(session, username, password)
+    registry = async_get_registry(hass)
+    pool_is_cold = not registry
+    api_client = registry.get_client(entry.entry_id, username, password)
+    entry.async_on_unload(lambda: async_release_client(hass, entry.entry_id))
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    _async_setup_session(hass, entry, api_client)
 
     # Creăm un singur DataUpdateCoordinator pentru toate datele
     coordinator = EonRomaniaCoordinator(
         hass,
         api_client=api_client,
         update_interval=update_interval,
+        max_concurrency=max_concurrency,
+        warm_interval=entry.options.get("warm_interval", DEFAULT_WARM_INTERVAL),
+        cold_interval=entry.options.get("cold_interval", DEFAULT_COLD_INTERVAL),
+        topology_interval=entry.options.get("topology_interval", DEFAULT_TOPOLOGY_INTERVAL),
+        entry_id=entry.entry_id,
     )
 
-    # Facem prima actualizare
-    await coordinator.async_config_entry_first_refresh()
+    # Deschidem conexiunile către API în paralel cu autentificarea din prima actualizare
+    if pool_is_cold:
+        entry.async_create_background_task(
+            hass, api_client.async_prewarm(), f"{DOMAIN}_prewarm_{entry.entry_id}"
+        )
+
+    # Pornire rapidă din ultimul snapshot salvat; datele se revalidează în fundal.
+    # Fără snapshot facem prima actualizare completă.
+    if await coordinator.async_load_snapshot():
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN}_revalidate_{entry.entry_id}"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+
+    # Oprim reîncercările cheilor eșuate la descărcarea intrării
+    entry.async_on_unload(coordinator.cancel_stale_retry)
 
     # Salvăm coordinatorul în hass.data
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
         "api_client": api_client,
+        # Setările cu care a pornit intrarea, ca să știm când trebuie reîncărcată
+        "settings": _entry_settings(entry),
     }
 
     # Încărcăm platformele
@@ -80,26 +140,133 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     return True
 
+def _async_setup_session(hass: HomeAssistant, entry: ConfigEntry, api_client: EonApiClient):
+    """Reutilizează tokenul salvat și îl reînnoiește înainte de expirare."""
+    cancel_renewal = None
+
+    @callback
+    def _schedule_renewal():
+        nonlocal cancel_renewal
+        if cancel_renewal is not None:
+            cancel_renewal()
+            cancel_renewal = None
+        if (expires_at := api_client.token_expires_at) is None:
+            return
+        delay = max(expires_at - TOKEN_REFRESH_MARGIN - time.time(), 0)
+        cancel_renewal = async_call_later(hass, delay, _async_renew)
+
+    async def _async_renew(_now):
+        nonlocal cancel_renewal
+        cancel_renewal = None
+        _LOGGER.debug("Reînnoire programată a tokenului.")
+        await api_client.async_renew_token()
+
+    @callback
+    def _session_updated(session):
+        # Salvăm sesiunea în intrare, ca să evităm o autentificare nouă la repornire
+        hass.config_entries.async_update_entry(entry, data={**entry.data, "session": session})
+        _schedule_renewal()
+
+    @callback
+    def _cancel_renewal():
+        if cancel_renewal is not None:
+            cancel_renewal()
+
+    if api_client.restore_session(entry.data.get("session")):
+        _schedule_renewal()
+    api_client.on_session_update = _session_updated
+    entry.async_on_unload(_cancel_renewal)
+
+def _entry_settings(entry: ConfigEntry) -> tuple:
+    """Opțiunile și datele de autentificare ale intrării; sesiunea salvată nu contează."""
+    return dict(entry.options), entry.data.get("username"), entry.data.get("password")
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry):
+    """Reîncarcă intrarea când i s-au schimbat setările, iar pe toate când s-a schimbat conexiunea comună."""
+    registry = hass.data.get(DATA_CLIENTS)
+    if registry is None or registry.options == shared_options(hass):
+        loaded = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+        # Salvarea sesiunii actualizează și ea intrarea, fără să schimbe setările
+        if loaded is not None and loaded["settings"] != _entry_settings(entry):
+            _LOGGER.debug("Setările intrării %s s-au schimbat, o reîncărcăm.", entry.entry_id)
+            await hass.config_entries.async_reload(entry.entry_id)
+        return
+    _LOGGER.debug("Setările conexiunii comune s-au schimbat, reîncărcăm toate intrările.")
+    # Sesiunea comună se închide odată cu ultima intrare și se recreează cu noile setări
+    entries = [
+        other for other in hass.config_entries.async_entries(DOMAIN)
+        if other.state is ConfigEntryState.LOADED
+    ]
+    for other in entries:
+        await hass.config_entries.async_unload(other.entry_id)
+    for other in entries:
+        await hass.config_entries.async_setup(other.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Descărcarea intrării din config_entries."""
     _LOGGER.debug("Descărcarea intrării pentru %s", DOMAIN)
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor"])
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
     return unload_ok
 
     await async_setup_entry(hass, entry)
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Ștergerea datelor salvate la eliminarea intrării."""
+    await Store(hass, STORAGE_VERSION, snapshot_storage_key(entry.entry_id)).async_remove()
+
 async def async_setup_services(hass: HomeAssistant, entry: ConfigEntry):
     """Set up custom services."""
-    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    
+    if not hass.services.has_service(DOMAIN, "download_last_invoice"):
+        hass.services.async_register(DOMAIN, "download_last_invoice", _async_download_last_invoice(hass))
+
+    if not hass.services.has_service(DOMAIN, "refresh_keys"):
+        hass.services.async_register(
+            DOMAIN, "refresh_keys", _async_refresh_keys(hass), schema=REFRESH_KEYS_SCHEMA,
+        )
+
+    if not hass.services.has_service(DOMAIN, "mirror_invoices"):
+        hass.services.async_register(
+            DOMAIN, "mirror_invoices", _async_mirror_invoices(hass),
+            schema=MIRROR_INVOICES_SCHEMA, supports_response=SupportsResponse.OPTIONAL,
+        )
+
+    if not hass.services.has_service(DOMAIN, "submit_readings"):
+        hass.services.async_register(
+            DOMAIN, "submit_readings", _async_submit_readings(hass),
+            schema=SUBMIT_READINGS_SCHEMA, supports_response=SupportsResponse.OPTIONAL,
+        )
+
+def _async_download_last_invoice(hass: HomeAssistant):
+    """Handler pentru serviciul download_last_invoice, comun tuturor intrărilor."""
+
     async def get_last_invoice(call):
         """Download the last invoice."""
         _LOGGER.debug("Service download_last_invoice called.")
-        
-        # 1. Identify last invoice from paid list (usually most relevant)
-        invoices = coordinator.data.get("paid_invoices_list", [])
+
+        # Contractul cerut, căutat în toate conturile; implicit primul contract al primului cont
+        coordinators = [data["coordinator"] for data in hass.data.get(DOMAIN, {}).values()]
+        cod_incasare = call.data.get("cod_incasare") or next(
+            (cod for coordinator in coordinators for cod in coordinator.contract_index), None
+        )
+        if cod_incasare is None:
+            _LOGGER.warning("No contracts found.")
+            return
+        coordinator = next(
+            (coordinator for coordinator in coordinators if cod_incasare in coordinator.contract_index), None
+        )
+        if coordinator is None:
+            _LOGGER.warning("Contract %s not found on any account.", cod_incasare)
+            return
+
+        # 1. Identify last invoice from paid list (usually most relevant),
+        # refreshing only that list so a just-issued invoice is included
+        await coordinator.async_refresh_keys([(cod_incasare, KEY_PAID_INVOICES)])
+        contract_data = coordinator.data.get("data_per_contract", {}).get(cod_incasare, {})
+        invoices = contract_data.get(KEY_PAID_INVOICES) or []
+        if isinstance(invoices, dict):
+            invoices = invoices.get("list", [])
         if not invoices:
             _LOGGER.warning("No paid invoices found.")
             return
@@ -113,36 +280,114 @@ async def async_setup_services(hass: HomeAssistant, entry: ConfigEntry):
             _LOGGER.error("Could not determine invoice number.")
             return
 
-        # 2. Download PDF
-        pdf_content = await coordinator.api_client.async_get_invoice_pdf(
-            cod_incasare=coordinator.cod_incasare,
-            invoice_number=invoice_number
+        # 2. Stream the PDF straight to <config_dir>/www/eon_invoices/
+        filename = hass.config.path("www", "eon_invoices", f"factura_{invoice_number}.pdf")
+        result = await coordinator.api_client.async_download_invoice_pdf(
+            cod_incasare=cod_incasare,
+            invoice_number=invoice_number,
+            path=filename,
         )
 
-        if not pdf_content:
+        if result is None:
             _LOGGER.error("Failed to download PDF content.")
             return
 
-        # 3. Save to disk (in /config/www/invoices or similar)
-        # We'll save to <config_dir>/www/eon_invoices/
-        output_dir = hass.config.path("www", "eon_invoices")
-        import os
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        _LOGGER.info("Invoice saved to %s (%s bytes%s)", filename, result.size, ", unchanged" if result.skipped else "")
 
-        filename = f"{output_dir}/factura_{invoice_number}.pdf"
-        
-        def save_file():
-            with open(filename, "wb") as f:
-                f.write(pdf_content)
-        
-        await hass.async_add_executor_job(save_file)
-        _LOGGER.info("Invoice saved to %s", filename)
-        
         # Notification (optional)
-        hass.components.persistent_notification.create(
+        persistent_notification.async_create(
+            hass,
             f"Factura {invoice_number} a fost descărcată în {filename}",
             title="E-ON Factura Descărcată"
         )
 
-    hass.services.async_register(DOMAIN, "download_last_invoice", get_last_invoice)
+    return get_last_invoice
+
+def _async_refresh_keys(hass: HomeAssistant):
+    """Handler pentru serviciul refresh_keys, comun tuturor intrărilor."""
+
+    async def refresh_keys(call: ServiceCall):
+        requested = call.data.get("cod_incasare")
+        coordinators = [data["coordinator"] for data in hass.data.get(DOMAIN, {}).values()]
+        # Fără coduri explicite reîmprospătăm cheile tuturor contractelor
+        await asyncio.gather(*(
+            coordinator.async_refresh_keys(
+                (cod_incasare, key)
+                for cod_incasare in (requested or list(coordinator.contract_index))
+                for key in call.data["keys"]
+            )
+            for coordinator in coordinators
+        ))
+
+    return refresh_keys
+
+def _async_mirror_invoices(hass: HomeAssistant):
+    """Handler pentru serviciul mirror_invoices, comun tuturor intrărilor."""
+
+    async def mirror_invoices(call: ServiceCall):
+        base_dir = hass.config.path(*INVOICE_ARCHIVE_DIR)
+        requested = call.data.get("cod_incasare")
+        summaries = []
+        # Conturile rulează pe rând: manifestul din arhivă este comun
+        for data in list(hass.data.get(DOMAIN, {}).values()):
+            summaries.append(await async_mirror_invoices(
+                hass, data["coordinator"], base_dir, requested, call.data["max_concurrency"],
+                call.data["verify"],
+            ))
+        result = {
+            "downloaded": sum(summary["downloaded"] for summary in summaries),
+            "skipped": sum(summary["skipped"] for summary in summaries),
+            "failed": sum(summary["failed"] for summary in summaries),
+            "failed_invoices": [key for summary in summaries for key in summary["failed_invoices"]],
+        }
+        _LOGGER.info(
+            "Arhivă facturi: %s descărcate, %s existente, %s eșuate.",
+            result["downloaded"], result["skipped"], result["failed"],
+        )
+        return result
+
+    return mirror_invoices
+
+def _async_submit_readings(hass: HomeAssistant):
+    """Handler pentru serviciul submit_readings, comun tuturor intrărilor."""
+
+    async def submit_readings(call: ServiceCall):
+        readings = call.data["readings"]
+        results = [None] * len(readings)
+
+        # Grupăm citirile după coordinatorul (contul) care deține contractul,
+        # ca fiecare cont să facă o singură reîmprospătare la final
+        batches = {}
+        for position, reading in enumerate(readings):
+            coordinator = next(
+                (
+                    data["coordinator"] for data in hass.data.get(DOMAIN, {}).values()
+                    if reading["cod_incasare"] in data["coordinator"].contract_index
+                ),
+                None,
+            )
+            if coordinator is None:
+                results[position] = {
+                    "cod_incasare": reading["cod_incasare"], "index": reading["index"],
+                    "success": False, "error": "unknown_contract",
+                }
+            else:
+                batches.setdefault(coordinator, []).append((position, reading))
+
+        batch_results = await asyncio.gather(
+            *(
+                coordinator.async_submit_readings([reading for _, reading in batch])
+                for coordinator, batch in batches.items()
+            )
+        )
+        for batch, batch_result in zip(batches.values(), batch_results):
+            for (position, _), result in zip(batch, batch_result):
+                results[position] = result
+
+        _LOGGER.info(
+            "Citiri trimise: %s reușite din %s.",
+            sum(result["success"] for result in results), len(results),
+        )
+        return {"results": results}
+
+    return submit_readings
@@ -18,56 +18,468 @@
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
 
+import asyncio
+import base64
+import hashlib
+import json
 import logging
-from typing import Optional, Dict, List, Any
-from aiohttp import ClientSession, ClientTimeout
+import math
+import os
+import time
+from contextlib import aclosing
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Optional, Dict, List, Any, AsyncIterator, Callable, Tuple
+from urllib.parse import urlsplit
+from aiohttp import ClientConnectorError, ClientSession, ClientTimeout
 
 from .const import (
-    URLS, HEADERS_POST, 
+    URLS, DEFAULT_MAX_CONCURRENCY_PER_HOST, TOKEN_REFRESH_MARGIN,
+    PREWARM_CONNECTIONS, REQUEST_TIMEOUT, REQUEST_CONNECT_TIMEOUT, JSON_EXECUTOR_THRESHOLD,
+    DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST, MAX_RETRIES, BACKOFF_MAX,
+    DOWNLOAD_TIMEOUT, DOWNLOAD_READ_TIMEOUT, DOWNLOAD_CHUNK_SIZE, PAGE_PREFETCH, MAX_PAGES,
     KEY_CITIREINDEX, KEY_CONVENTIECONSUM, KEY_COMPARAREANUALAGRAFIC, 
     KEY_ARHIVA, KEY_FACTURASOLD, KEY_FACTURASOLD_PROSUM, 
     KEY_PROSUMER_INVOICES, KEY_PAID_INVOICES, KEY_RESCHEDULING_PLANS,
     KEY_PAYMENT_NOTICES, KEY_PAYMENTS, KEY_DATEUSER
 )
+from .codec import decode_body, loads
+from .metrics import ApiMetrics
+from .ratelimit import CircuitBreaker, RequestBudget, backoff_delay, endpoint_family, retry_after
+from .transport import REQUEST_HEADERS
+
+# Connection errors raised before the request was sent, so the server never saw it
+STATUS_NOT_SENT = -1
+# Statuses worth retrying: connection errors (0), throttling and transient server errors
+RETRY_STATUSES = {STATUS_NOT_SENT, 0, 429, 500, 502, 503, 504}
+# Requests that are not idempotent (e.g. submitting a reading) may already have been
+# applied after a 5xx or a timeout; they are only retried when surely not processed
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+NOT_PROCESSED_STATUSES = {STATUS_NOT_SENT, 429}
+
+# Content types accepted for invoice PDFs
+PDF_CONTENT_TYPES = {"application/pdf", "application/octet-stream"}
+
+# Timeout of JSON requests; a timed out request counts as a connection error and is retried
+REQUEST_CLIENT_TIMEOUT = ClientTimeout(total=REQUEST_TIMEOUT, sock_connect=REQUEST_CONNECT_TIMEOUT)
 
 _LOGGER = logging.getLogger(__name__)
 
+
+def _to_cents(value: Any) -> int:
+    """Convert an API amount (lei) to integer bani."""
+    try:
+        return int((Decimal(str(value)) * 100).to_integral_value(ROUND_HALF_UP))
+    except (InvalidOperation, TypeError, ValueError):
+        return 0
+
+
+def _parse_date(raw: Optional[str], fmt: str) -> Optional[date]:
+    """Parse a date string, returning None if it is missing or malformed."""
+    if not raw:
+        return None
+    try:
+        return datetime.strptime(raw, fmt).date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _index_value(idx: dict) -> Optional[int]:
+    """Return a meter's proposed (or previous) index, or None if the API value is malformed."""
+    raw = idx.get("currentValue") or idx.get("oldValue") or 0
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        _LOGGER.warning("Ignoring malformed meter index %r (ablbelnr %s).", raw, idx.get("ablbelnr"))
+        return None
+
+
+def _payment_date(raw: dict) -> Optional[date]:
+    return _parse_date((raw.get("paymentDate") or "")[:10], "%Y-%m-%d")
+
+
+def _total_pages(data: Any) -> Optional[int]:
+    """Return the page count announced by a list response, if any."""
+    if not isinstance(data, dict):
+        return None
+    try:
+        if data.get("totalPages"):
+            return int(data["totalPages"])
+        total = data.get("totalElements") or data.get("totalCount") or data.get("total")
+        size = data.get("pageSize") or data.get("size") or len(data.get("list") or [])
+        if total and size:
+            return math.ceil(int(total) / int(size))
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+def _date_str(value: Optional[date]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+@dataclass(frozen=True, slots=True)
+class Payment:
+    """Payment record, reduced to what the integration uses."""
+
+    # Identity of the raw record, used to stop incremental syncs at known payments
+    key: str
+    payment_date: Optional[date]
+
+    @classmethod
+    def from_api(cls, raw: dict) -> "Payment":
+        return cls(
+            key=hashlib.sha1(json.dumps(raw, sort_keys=True, default=str).encode()).hexdigest(),
+            payment_date=_payment_date(raw),
+        )
+
+    def as_dict(self) -> dict:
+        return {"key": self.key, "payment_date": _date_str(self.payment_date)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Payment":
+        return cls(key=data["key"], payment_date=_parse_date(data.get("payment_date"), "%Y-%m-%d"))
+
+
+@dataclass(frozen=True, slots=True)
+class Invoice:
+    """Unpaid invoice record with amounts in bani."""
+
+    invoice_number: Optional[str]
+    issued_cents: int
+    balance_cents: int
+    maturity_date: Optional[date]
+
+    @classmethod
+    def from_api(cls, raw: dict) -> "Invoice":
+        return cls(
+            invoice_number=raw.get("invoiceNumber"),
+            issued_cents=_to_cents(raw.get("issuedValue", 0)),
+            balance_cents=_to_cents(raw.get("balanceValue", 0)),
+            maturity_date=_parse_date(raw.get("maturityDate"), "%d.%m.%Y"),
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "invoice_number": self.invoice_number,
+            "issued_cents": self.issued_cents,
+            "balance_cents": self.balance_cents,
+            "maturity_date": _date_str(self.maturity_date),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Invoice":
+        return cls(
+            invoice_number=data.get("invoice_number"),
+            issued_cents=data["issued_cents"],
+            balance_cents=data["balance_cents"],
+            maturity_date=_parse_date(data.get("maturity_date"), "%Y-%m-%d"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class MeterReading:
+    """Current index of one meter."""
+
+    device_number: str
+    device_type: str
+    ablbelnr: Optional[str]
+    # Proposed and previous index as returned by the API; value is the sensor state
+    current_value: Any
+    old_value: Any
+    value: Optional[int]
+
+    @classmethod
+    def from_api(cls, raw: dict) -> "MeterReading":
+        indexes = raw.get("indexes") or []
+        idx = indexes[0] if indexes else {}
+        return cls(
+            device_number=raw.get("deviceNumber", "unknown"),
+            device_type=_device_type(raw),
+            ablbelnr=idx.get("ablbelnr"),
+            current_value=idx.get("currentValue"),
+            old_value=idx.get("oldValue"),
+            value=_index_value(idx) if indexes else None,
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "device_number": self.device_number,
+            "device_type": self.device_type,
+            "ablbelnr": self.ablbelnr,
+            "current_value": self.current_value,
+            "old_value": self.old_value,
+            "value": self.value,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MeterReading":
+        return cls(**data)
+
+
+@dataclass(frozen=True, slots=True)
+class IndexReadings:
+    """Current readings of a contract's meters and the submission window."""
+
+    devices: Tuple[MeterReading, ...]
+    start_date: Optional[str]
+    end_date: Optional[str]
+    allowed_reading: bool
+    allow_change: bool
+
+    @classmethod
+    def from_api(cls, raw: dict) -> "IndexReadings":
+        reading_period = raw.get("readingPeriod") or {}
+        devices = {}
+        for device in (raw.get("indexDetails") or {}).get("devices", []):
+            reading = MeterReading.from_api(device)
+            devices.setdefault(reading.device_number, reading)
+        return cls(
+            devices=tuple(devices.values()),
+            start_date=reading_period.get("startDate"),
+            end_date=reading_period.get("endDate"),
+            allowed_reading=bool(reading_period.get("allowedReading")),
+            allow_change=bool(reading_period.get("allowChange")),
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "devices": [device.as_dict() for device in self.devices],
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "allowed_reading": self.allowed_reading,
+            "allow_change": self.allow_change,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "IndexReadings":
+        return cls(**{**data, "devices": tuple(MeterReading.from_dict(d) for d in data["devices"])})
+
+
+def _device_type(device: dict) -> str:
+    """Guess device type (gas vs electric) based on metadata."""
+    # This is a heuristic: default to gas unless we see specific flags or "kWh"
+    if device.get("deviceType") == "ELECTRIC":
+        return "electric"
+    for idx in device.get("indexes", []):
+        if idx.get("unit") == "KWH":
+            return "electric"
+    return "gas"
+
+
+# Data key -> record type its fetcher returns (payments and invoices as lists)
+RECORD_TYPES = {
+    KEY_PAYMENTS: Payment,
+    KEY_FACTURASOLD: Invoice,
+    KEY_CITIREINDEX: IndexReadings,
+}
+
+
+def records_as_json(value: Any) -> Any:
+    """Convert parsed records (or lists of them) to JSON-serializable data."""
+    if isinstance(value, list):
+        return [records_as_json(item) for item in value]
+    if hasattr(value, "as_dict"):
+        return value.as_dict()
+    return value
+
+
+def records_from_json(key: str, value: Any) -> Any:
+    """Rebuild the parsed records of a data key from records_as_json output."""
+    if (record_type := RECORD_TYPES.get(key)) is None or value is None:
+        return value
+    if isinstance(value, list):
+        return [record_type.from_dict(item) for item in value]
+    return record_type.from_dict(value)
+
+
+def token_expiry(data: dict) -> Optional[float]:
+    """Return the token expiry (epoch seconds) from a login response, if known."""
+    if expires_in := data.get("expiresIn"):
+        try:
+            return time.time() + float(expires_in)
+        except (TypeError, ValueError):
+            pass
+
+    # Fall back to the "exp" claim of the JWT access token
+    try:
+        payload = data["accessToken"].split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class PdfDownload:
+    """Result of an invoice PDF download."""
+
+    path: str
+    size: int
+    sha1: Optional[str] = None
+    # True if an identical file already existed and was kept
+    skipped: bool = False
+
+
+def _sha1_hex(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()
+
+
+def file_sha1(path: str) -> Optional[str]:
+    """Return the sha1 of a file's content, or None if it cannot be read."""
+    digest = hashlib.sha1()
+    try:
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(DOWNLOAD_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _open_for_write(path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    return open(path, "wb")
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+@dataclass
+class CachedResponse:
+    """Last 200 response of a URL fetched with conditional requests."""
+
+    data: Any
+    body_hash: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
 class EonApiClient:
     """Class for communicating with the E-ON Romania API."""
 
-    def __init__(self, session: ClientSession, username: str, password: str):
-        """Initialize the API client."""
+    def __init__(
+        self,
+        session: ClientSession,
+        username: str,
+        password: str,
+        max_concurrency_per_host: int = DEFAULT_MAX_CONCURRENCY_PER_HOST,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        rate_burst: int = DEFAULT_RATE_BURST,
+        budget: Optional[RequestBudget] = None,
+    ):
+        """Initialize the API client.
+
+        Clients given the same budget share its rate, per-host and circuit
+        limits; otherwise the client gets its own, built from the other arguments.
+        """
         self._session = session
         self._username = username
         self._password = password
         self._token: Optional[str] = None
+        self._token_expires_at: Optional[float] = None
+        # Serializes re-authentication so concurrent 401s trigger a single login
+        self._auth_lock = asyncio.Lock()
+        # Called with the new session after every successful login, for persistence
+        self.on_session_update: Optional[Callable[[dict], None]] = None
+        # URL -> validators and parsed body, for endpoints using conditional requests
+        self._response_cache: Dict[str, CachedResponse] = {}
+        self.metrics = ApiMetrics()
+        self._budget = budget or RequestBudget(max_concurrency_per_host, rate_limit, rate_burst)
+        self._rate_limiter = self._budget.rate_limiter
+
+    @property
+    def token_expires_at(self) -> Optional[float]:
+        """Return the expiry (epoch seconds) of the current token, if known."""
+        return self._token_expires_at
+
+    @property
+    def session(self) -> Optional[dict]:
+        """Return the current session, suitable for persisting."""
+        if self._token is None:
+            return None
+        return {"access_token": self._token, "expires_at": self._token_expires_at}
+
+    def restore_session(self, session: Optional[dict]) -> bool:
+        """Reuse a persisted session if its token is still valid."""
+        if not session or not session.get("access_token"):
+            return False
+        self._token = session["access_token"]
+        self._token_expires_at = session.get("expires_at")
+        if not self._token_valid():
+            self._token = None
+            self._token_expires_at = None
+            return False
+        _LOGGER.debug("Reusing stored token (expires at %s).", self._token_expires_at)
+        return True
+
+    async def async_renew_token(self) -> bool:
+        """Renew the current token ahead of its expiry."""
+        return await self._async_refresh_token(self._token)
+
+    async def async_prewarm(self, connections: int = PREWARM_CONNECTIONS) -> int:
+        """Open connections to the API host ahead of the first requests.
+
+        Meant to run alongside the login, so the TLS handshakes are done by the
+        time the per-contract requests fan out. Returns how many succeeded;
+        failures are harmless, requests open connections on demand anyway.
+        """
+        origin = "{0.scheme}://{0.netloc}/".format(urlsplit(URLS["login"]))
+        timeout = ClientTimeout(total=REQUEST_CONNECT_TIMEOUT)
+
+        async def _open() -> None:
+            async with self._host_semaphore(origin):
+                async with self._session.head(origin, headers=REQUEST_HEADERS, timeout=timeout):
+                    pass
+
+        results = await asyncio.gather(*(_open() for _ in range(connections)), return_exceptions=True)
+        opened = sum(1 for result in results if not isinstance(result, BaseException))
+        _LOGGER.debug("Pre-warmed %s/%s connection(s) to %s.", opened, connections, origin)
+        return opened
 
     async def async_login(self) -> bool:
         """Obtain a new authentication token."""
         payload = {
             "username": self._username,
             "password": self._password,
-            "rememberMe": False
+            "rememberMe": True
         }
 
+        await self._rate_limiter.acquire()
+        started = time.monotonic()
         try:
             timeout = ClientTimeout(total=20)
             async with self._session.post(
-                URLS["login"], json=payload, headers=HEADERS_POST, timeout=timeout
+                URLS["login"], json=payload, headers=REQUEST_HEADERS, timeout=timeout
             ) as resp:
+                body = await resp.read()
+                self.metrics.record_request(URLS["login"], resp.status, time.monotonic() - started, len(body))
+                self.metrics.record_login(resp.status == 200)
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = loads(body)
                     self._token = data.get("accessToken")
-                    _LOGGER.debug("Token obtained successfully.")
+                    self._token_expires_at = token_expiry(data)
+                    _LOGGER.debug("Token obtained successfully (expires at %s).", self._token_expires_at)
+                    if self.on_session_update is not None:
+                        self.on_session_update(self.session)
                     return True
                 else:
-                    text = await resp.text()
+                    text = body.decode("utf-8", errors="replace")
                     _LOGGER.error("Login error. Status=%s, Response=%s", resp.status, text)
                     self._token = None
+                    self._token_expires_at = None
                     return False
         except Exception as e:
             _LOGGER.error("Error connecting to auth API: %s", e)
+            self.metrics.record_request(URLS["login"], 0, time.monotonic() - started)
+            self.metrics.record_login(False)
             self._token = None
+            self._token_expires_at = None
             return False
 
     async def async_fetch_dateuser_data(self, cod_incasare: str) -> Optional[dict]:
@@ -75,16 +487,18 @@ class EonApiClient:
         return await self._request_with_token(
             "GET",
             URLS["dateuser"].format(cod_incasare=cod_incasare),
-            "Error fetching user data."
+            "Error fetching user data.",
+            conditional=True,
         )
 
-    async def async_fetch_citireindex_data(self, cod_incasare: str) -> Optional[dict]:
+    async def async_fetch_citireindex_data(self, cod_incasare: str) -> Optional[IndexReadings]:
         """Fetch current index data."""
-        return await self._request_with_token(
+        data = await self._request_with_token(
             "GET",
             URLS["citireindex"].format(cod_incasare=cod_incasare),
             "Error fetching current index."
         )
+        return IndexReadings.from_api(data) if isinstance(data, dict) else None
 
     async def async_fetch_conventieconsum_data(self, cod_incasare: str) -> Optional[dict]:
         """Fetch consumption convention data."""
@@ -99,7 +513,8 @@ class EonApiClient:
         return await self._request_with_token(
             "GET",
             URLS["comparareanualagrafic"].format(cod_incasare=cod_incasare),
-            "Error fetching annual graphic comparison."
+            "Error fetching annual graphic comparison.",
+            conditional=True,
         )
 
     async def async_fetch_arhiva_data(self, cod_incasare: str) -> Optional[dict]:
@@ -107,16 +522,20 @@ class EonApiClient:
         return await self._request_with_token(
             "GET",
             URLS["arhiva"].format(cod_incasare=cod_incasare),
-            "Error fetching archive data."
+            "Error fetching archive data.",
+            conditional=True,
         )
 
-    async def async_fetch_facturasold_data(self, cod_incasare: str) -> Optional[dict]:
-        """Fetch invoice balance data."""
-        return await self._request_with_token(
+    async def async_fetch_facturasold_data(self, cod_incasare: str) -> Optional[List[Invoice]]:
+        """Fetch unpaid invoices."""
+        data = await self._request_with_token(
             "GET",
             URLS["facturasold"].format(cod_incasare=cod_incasare),
             "Error fetching invoice balance."
         )
+        if data is None:
+            return None
+        return [Invoice.from_api(item) for item in data] if isinstance(data, list) else []
 
     async def async_fetch_account_contracts_list(self) -> Optional[dict]:
         """Fetch account contracts list using list-with-subcontracts."""
@@ -158,12 +577,12 @@ class EonApiClient:
             "Error fetching prosumer balance."
         )
 
-    async def async_fetch_invoices_list_paid(self, cod_incasare: str) -> Optional[dict]:
-        """Fetch paid invoices list (page 1)."""
-        return await self._request_with_token(
-            "GET",
-            URLS["invoices_list_paid"].format(cod_incasare=cod_incasare),
-            "Error fetching paid invoices."
+    async def async_fetch_invoices_list_paid(
+        self, cod_incasare: str, known: Optional[List[dict]] = None
+    ) -> Optional[List[dict]]:
+        """Fetch the paid invoices list, all pages (or the new ones, given the known list)."""
+        return await self._async_fetch_invoice_list(
+            URLS["invoices_list_paid"], cod_incasare, "Error fetching paid invoices.", known
         )
 
     async def async_fetch_rescheduling_plans(self, cod_incasare: str) -> Optional[dict]:
@@ -174,13 +593,40 @@ class EonApiClient:
             "Error fetching rescheduling plans."
         )
 
-    async def async_fetch_invoices_list_prosum(self, cod_incasare: str) -> Optional[dict]:
-        """Fetch prosumer invoices list."""
-        return await self._request_with_token(
-            "GET",
-            URLS["invoices_list_prosum"].format(cod_incasare=cod_incasare),
-            "Error fetching prosumer invoices."
+    async def async_fetch_invoices_list_prosum(
+        self, cod_incasare: str, known: Optional[List[dict]] = None
+    ) -> Optional[List[dict]]:
+        """Fetch the prosumer invoices list, all pages (or the new ones, given the known list)."""
+        return await self._async_fetch_invoice_list(
+            URLS["invoices_list_prosum"], cod_incasare, "Error fetching prosumer invoices.", known
         )
+
+    async def _async_fetch_invoice_list(
+        self, url: str, cod_incasare: str, on_error: str, known: Optional[List[dict]]
+    ) -> Optional[List[dict]]:
+        """Fetch an invoice list newest first, stopping at the first page with known invoices.
+
+        Returns None if any page could not be fetched: a partial list would
+        become the known history and the missing invoices would never be fetched.
+        """
+        known = known if isinstance(known, list) else []
+        known_numbers = {item.get("invoiceNumber") for item in known if isinstance(item, dict)}
+        results = []
+        pages = 0
+        url_template = url.replace("{cod_incasare}", cod_incasare)
+        async with aclosing(self.async_iter_pages(url_template, on_error)) as page_iter:
+            async for records in page_iter:
+                if records is None:
+                    return None
+                pages += 1
+                new_records = [r for r in records if r.get("invoiceNumber") not in known_numbers]
+                results.extend(new_records)
+                # Reached the known history: older pages hold nothing new
+                if known and len(new_records) < len(records):
+                    break
+        if not pages:
+            return None
+        return results + known
     
     async def async_fetch_payment_notices(self, cod_incasare: str) -> Optional[dict]:
         """Fetch payment notices."""
@@ -198,36 +644,101 @@ class EonApiClient:
             "Error fetching user wallet."
         )
 
-    async def async_fetch_payments_data(self, cod_incasare: str) -> List[dict]:
-        """Fetch all payment records with manual pagination."""
-        if not await self._ensure_token():
-            return []
+    async def async_fetch_payments_data(
+        self, cod_incasare: str, known: Optional[List[Payment]] = None
+    ) -> Optional[List[Payment]]:
+        """Fetch payment records (newest first) from all pages.
+
+        When the locally held history is passed as ``known``, pagination stops at
+        the first page reaching already-known records, or holding nothing newer
+        than the newest known payment, and only the new records are merged in
+        front of the history. Returns None if any page could not be fetched, so
+        the history is never replaced by a partial one.
+        """
+        known = known or []
+        known_keys = {p.key for p in known}
+        newest_known_date = max((p.payment_date for p in known if p.payment_date), default=None)
 
         results = []
+        pages = 0
+        url_template = URLS["payments_list"].replace("{cod_incasare}", cod_incasare)
+        async with aclosing(self.async_iter_pages(
+            url_template, "Error fetching payments.", cutoff=newest_known_date, date_of=_payment_date,
+        )) as page_iter:
+            async for records in page_iter:
+                if records is None:
+                    return None
+                pages += 1
+                chunk = [Payment.from_api(p) for p in records]
+                new_records = [p for p in chunk if p.key not in known_keys]
+                results.extend(new_records)
+                # Reached the known history: older pages hold nothing new
+                if known and len(new_records) < len(chunk):
+                    break
+
+        if not pages:
+            return None
+        if known:
+            _LOGGER.debug("Payments %s: %s new record(s) in %s page(s).", cod_incasare, len(results), pages)
+        return results + known
+
+    async def async_iter_pages(
+        self,
+        url_template: str,
+        on_error: str,
+        cutoff: Optional[date] = None,
+        date_of: Optional[Callable[[dict], Optional[date]]] = None,
+    ) -> AsyncIterator[Optional[List[dict]]]:
+        """Yield the records of each page of a list endpoint, in page order.
+
+        url_template must contain a {page} placeholder (pages start at 1). When
+        the first page announces the page count, the next PAGE_PREFETCH pages
+        are fetched concurrently ahead of the consumer; otherwise pages are
+        followed one by one through hasNext. With cutoff and date_of, records
+        dated before cutoff are dropped and iteration ends at the first page
+        reaching them, as lists are sorted newest first. A failed page yields
+        None and ends the iteration, so consumers can tell an incomplete list
+        from a complete one.
+        """
+        def fetch(page: int):
+            return self._request_with_token("GET", url_template.format(page=page), on_error)
+
         page = 1
-        while True:
-            url = URLS["payments_list"].format(cod_incasare=cod_incasare, page=page)
-            
-            data, status = await self._do_request("GET", url)
-            
-            if status == 401:
-                 # Retry logic
-                 if await self.async_login():
-                     data, status = await self._do_request("GET", url)
-                 else:
-                     break
-            
-            if status != 200 or not data:
-                break
-
-            chunk = data.get("list", [])
-            results.extend(chunk)
-
-            if not data.get("hasNext", False):
-                break
-            page += 1
-
-        return results
+        data = await fetch(page)
+        total_pages = min(_total_pages(data) or 0, MAX_PAGES)
+        prefetched: Dict[int, asyncio.Task] = {}
+        try:
+            while True:
+                if isinstance(data, list):
+                    records, has_next = data, False
+                elif isinstance(data, dict):
+                    records = data.get("list") or []
+                    has_next = page < total_pages if total_pages else bool(data.get("hasNext", False))
+                else:
+                    yield None
+                    return
+
+                reached_cutoff = False
+                if cutoff is not None and date_of is not None:
+                    kept = [r for r in records if (day := date_of(r)) is None or day >= cutoff]
+                    reached_cutoff = len(kept) < len(records)
+                    records = kept
+                yield records
+
+                if reached_cutoff or not has_next or page >= MAX_PAGES:
+                    return
+                page += 1
+                if total_pages:
+                    for ahead in range(page, min(page + PAGE_PREFETCH, total_pages + 1)):
+                        if ahead not in prefetched:
+                            prefetched[ahead] = asyncio.ensure_future(fetch(ahead))
+                    data = await prefetched.pop(page)
+                else:
+                    data = await fetch(page)
+        finally:
+            # The consumer stopped early: drop the pages fetched ahead
+            for task in prefetched.values():
+                task.cancel()
 
     async def async_trimite_index(self, account_contract: str, ablbelnr: str, index_value: int) -> Optional[dict]:
         """Send meter reading to API."""
@@ -243,75 +754,276 @@ class EonApiClient:
             json_data=payload
         )
 
-    async def async_get_invoice_pdf(self, cod_incasare: str, invoice_number: str) -> Optional[bytes]:
-        """Download invoice PDF."""
+    async def async_download_invoice_pdf(
+        self, cod_incasare: str, invoice_number: str, path: str
+    ) -> Optional[PdfDownload]:
+        """Stream an invoice PDF to path, keeping memory use bounded.
+
+        The body is written in chunks to a temporary file next to path and
+        renamed over it once its type and length are verified. An existing file
+        with the same content is left untouched. Returns None on failure.
+        """
         url = URLS["download_invoice"].format(cod_incasare=cod_incasare, invoice_number=invoice_number)
-        
-        if not await self._ensure_token():
-            return None
+        for _ in range(2):
+            if not await self._ensure_token():
+                return None
+            token = self._token
+            status, result = await self._async_stream_pdf(url, path)
+            if status != 401:
+                return result
+            # Token rejected: renew it once and try again
+            if not await self._async_refresh_token(token):
+                return None
+        _LOGGER.error("Error downloading PDF (Status 401 persistent).")
+        return None
 
-        headers = {**HEADERS_POST}
+    async def _async_stream_pdf(self, url: str, path: str) -> Tuple[int, Optional[PdfDownload]]:
+        """Download url to path; returns the HTTP status (0 on errors) and the result."""
+        loop = asyncio.get_running_loop()
+        headers = {**REQUEST_HEADERS, "Accept": "application/pdf", "Accept-Encoding": "identity"}
         if self._token:
             headers["Authorization"] = f"Bearer {self._token}"
+        timeout = ClientTimeout(total=DOWNLOAD_TIMEOUT, sock_read=DOWNLOAD_READ_TIMEOUT)
+        tmp_path = f"{path}.part"
+        size = 0
+        recorded = False
 
+        await self._rate_limiter.acquire()
+        started = time.monotonic()
         try:
-            async with self._session.get(url, headers=headers) as resp:
-                if resp.status == 200:
-                    return await resp.read()
-                else:
-                    _LOGGER.error("Error downloading PDF. Status=%s", resp.status)
-                    return None
+            async with self._host_semaphore(url):
+                async with self._session.get(url, headers=headers, timeout=timeout) as resp:
+                    if resp.status != 200:
+                        self.metrics.record_request(url, resp.status, time.monotonic() - started)
+                        if resp.status != 401:
+                            _LOGGER.error("Error downloading PDF. Status=%s", resp.status)
+                        return resp.status, None
+
+                    content_type = resp.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                    if content_type not in PDF_CONTENT_TYPES:
+                        raise ValueError(f"unexpected content type {content_type!r}")
+
+                    expected = resp.content_length
+                    digest = hashlib.sha1()
+                    file = await loop.run_in_executor(None, _open_for_write, tmp_path)
+                    try:
+                        async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                            if size == 0 and not chunk.startswith(b"%PDF"):
+                                raise ValueError("response is not a PDF document")
+                            size += len(chunk)
+                            digest.update(chunk)
+                            await loop.run_in_executor(None, file.write, chunk)
+                    finally:
+                        await loop.run_in_executor(None, file.close)
+
+            self.metrics.record_request(url, 200, time.monotonic() - started, size)
+            recorded = True
+            if expected is not None and size != expected:
+                raise ValueError(f"incomplete download, {size} of {expected} bytes")
+            sha1 = digest.hexdigest()
+
+            if await loop.run_in_executor(None, file_sha1, path) == sha1:
+                await loop.run_in_executor(None, _remove_quietly, tmp_path)
+                _LOGGER.debug("%s is unchanged, keeping the existing file.", path)
+                return 200, PdfDownload(path, size, sha1, skipped=True)
+
+            await loop.run_in_executor(None, os.replace, tmp_path, path)
+            return 200, PdfDownload(path, size, sha1)
         except Exception as e:
-            _LOGGER.error("Error downloading PDF: %s", e)
-            return None
+            _LOGGER.error("Error downloading PDF %s: %s", url, e)
+            if not recorded:
+                self.metrics.record_request(url, 0, time.monotonic() - started, size)
+            await loop.run_in_executor(None, _remove_quietly, tmp_path)
+            return 0, None
 
-    async def _ensure_token(self) -> bool:
-        """Ensure a valid token exists."""
+    def _token_valid(self) -> bool:
+        """Return True if a token exists and is not about to expire."""
         if self._token is None:
+            return False
+        if self._token_expires_at is None:
+            return True
+        return time.time() < self._token_expires_at - TOKEN_REFRESH_MARGIN
+
+    async def _ensure_token(self) -> bool:
+        """Ensure a valid token exists, renewing it before it expires."""
+        if self._token_valid():
+            return True
+        return await self._async_refresh_token(self._token)
+
+    async def _async_refresh_token(self, stale_token: Optional[str]) -> bool:
+        """Replace stale_token with a new one, logging in at most once at a time.
+
+        Requests waiting on the lock reuse the token obtained by the first one.
+        """
+        async with self._auth_lock:
+            if self._token != stale_token and self._token_valid():
+                return True
             return await self.async_login()
-        return True
 
-    async def _request_with_token(self, method: str, url: str, on_error: str, json_data: dict = None) -> Optional[Any]:
+    async def _request_with_token(
+        self, method: str, url: str, on_error: str, json_data: dict = None, conditional: bool = False
+    ) -> Optional[Any]:
         """Execute request with automatic token refresh."""
         if not await self._ensure_token():
             return None
 
         # First attempt
-        resp_data, status = await self._do_request(method, url, json_data)
+        token = self._token
+        resp_data, status = await self._do_request(method, url, json_data, conditional=conditional)
         if status != 401:
             return resp_data
 
         # Retry logic for 401
         _LOGGER.debug("%s (Status 401) -> Refreshing token...", on_error)
-        self._token = None
-        if not await self.async_login():
+        self.metrics.record_retry(url)
+        if not await self._async_refresh_token(token):
             return None
 
-        resp_data, status = await self._do_request(method, url, json_data)
+        resp_data, status = await self._do_request(method, url, json_data, conditional=conditional)
         if status == 401:
             _LOGGER.error("%s (Status 401 persistent) -> Abort.", on_error)
             return None
 
         return resp_data
 
-    async def _do_request(self, method: str, url: str, json_data: dict = None):
-        """Perform the actual HTTP request."""
-        headers = {**HEADERS_POST}
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Return the semaphore limiting parallel requests to the host of url."""
+        return self._budget.host_semaphore(url)
+
+    def _circuit_breaker(self, url: str) -> CircuitBreaker:
+        """Return the circuit breaker of the endpoint family of url."""
+        return self._budget.circuit_breaker(url)
+
+    @property
+    def rate_limit(self) -> float:
+        """Return the current request rate (requests per second), lowered while throttled."""
+        return self._rate_limiter.rate
+
+    @property
+    def circuit_states(self) -> Dict[str, str]:
+        """Return the circuit state of every endpoint family called so far."""
+        return {family: breaker.state for family, breaker in sorted(self._budget.circuit_breakers.items())}
+
+    async def _do_request(self, method: str, url: str, json_data: dict = None, conditional: bool = False):
+        """Perform the HTTP request, retrying throttled and transient failures.
+
+        Every attempt waits for the shared rate limiter. 429, 5xx and connection
+        errors are retried after Retry-After or a jittered exponential backoff;
+        POSTs only on 429 or when the connection failed before sending. Repeated
+        failures open the circuit of the endpoint family, so its requests fail
+        fast until it is probed again.
+        """
+        breaker = self._circuit_breaker(url)
+        if not breaker.allow():
+            _LOGGER.debug("Circuit open for %s, skipping %s %s", endpoint_family(url), method, url)
+            self.metrics.record_rejected(url)
+            return None, 0
+
+        attempt = 0
+        while True:
+            resp_data, status, delay = await self._do_request_once(method, url, json_data, conditional)
+            if status not in RETRY_STATUSES:
+                breaker.record_success()
+                self._rate_limiter.recover()
+                return resp_data, status
+
+            breaker.record_failure()
+            if delay is None:
+                delay = backoff_delay(attempt)
+            if status == 429:
+                self._rate_limiter.throttle(delay)
+            if status == STATUS_NOT_SENT:
+                status = 0
+            elif method not in IDEMPOTENT_METHODS and status not in NOT_PROCESSED_STATUSES:
+                _LOGGER.error("%s %s failed and is not retried. Status=%s", method, url, status)
+                return None, status
+            if attempt >= MAX_RETRIES or delay > BACKOFF_MAX or not breaker.allow():
+                _LOGGER.error("%s %s failed after %s attempt(s). Status=%s", method, url, attempt + 1, status)
+                return None, status
+
+            attempt += 1
+            self.metrics.record_retry(url)
+            _LOGGER.debug("%s %s returned %s, retry %s in %.1fs", method, url, status, attempt, delay)
+            await asyncio.sleep(delay)
+
+    async def _do_request_once(self, method: str, url: str, json_data: dict = None, conditional: bool = False):
+        """Perform a single HTTP request.
+
+        Returns the data, the status and the server's Retry-After delay, if any.
+        With ``conditional``, the ETag/Last-Modified validators of the previous
+        response are sent and a 304, or a body identical to the previous one,
+        returns the previously parsed object itself, so callers can detect an
+        unchanged payload with an identity check.
+        """
+        headers = {**REQUEST_HEADERS}
         if self._token:
             headers["Authorization"] = f"Bearer {self._token}"
 
+        cached = self._response_cache.get(url) if conditional else None
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        await self._rate_limiter.acquire()
+        started = None
         try:
-            async with self._session.request(method, url, headers=headers, json=json_data) as resp:
-                if resp.status == 200:
-                    try:
-                        return (await resp.json()), resp.status
-                    except Exception:
-                        return (await resp.text()), resp.status
-                else:
-                    text = await resp.text()
-                    if resp.status != 401:
-                         _LOGGER.error("%s %s failed. Status=%s, Response=%s", method, url, resp.status, text)
-                    return None, resp.status
+            async with self._host_semaphore(url):
+                # Latency is measured from the moment the request leaves the queue
+                started = time.monotonic()
+                async with self._session.request(
+                    method, url, headers=headers, json=json_data, timeout=REQUEST_CLIENT_TIMEOUT
+                ) as resp:
+                    body = await resp.read()
+                    self.metrics.record_request(url, resp.status, time.monotonic() - started, len(body))
+                    if resp.status == 304 and cached is not None:
+                        return cached.data, 200, None
+                    if resp.status == 200:
+                        if conditional:
+                            return await self._async_cache_response(url, resp, body), resp.status, None
+                        return await self._async_decode(body), resp.status, None
+                    else:
+                        text = body.decode("utf-8", errors="replace")
+                        if resp.status in RETRY_STATUSES:
+                            _LOGGER.debug("%s %s failed. Status=%s, Response=%s", method, url, resp.status, text)
+                        elif resp.status != 401:
+                             _LOGGER.error("%s %s failed. Status=%s, Response=%s", method, url, resp.status, text)
+                        return None, resp.status, retry_after(resp.headers)
         except Exception as e:
-            _LOGGER.error("Request error %s %s: %s", method, url, e)
-            return None, 0
+            _LOGGER.warning("Request error %s %s: %s", method, url, e)
+            if started is not None:
+                self.metrics.record_request(url, 0, time.monotonic() - started)
+            # The connection could not be opened: nothing reached the server
+            return None, STATUS_NOT_SENT if isinstance(e, ClientConnectorError) else 0, None
+
+    async def _async_decode(self, body: bytes) -> Any:
+        """Parse a response body as JSON (or text), off the event loop if it is large."""
+        if len(body) >= JSON_EXECUTOR_THRESHOLD:
+            self.metrics.record_decode(None)
+            return await asyncio.get_running_loop().run_in_executor(None, decode_body, body)
+        started = time.perf_counter()
+        data = decode_body(body)
+        self.metrics.record_decode(time.perf_counter() - started)
+        return data
+
+    async def _async_cache_response(self, url: str, resp, body: bytes) -> Any:
+        """Parse a conditional response body, reusing the cached object if it is unchanged."""
+        if len(body) >= JSON_EXECUTOR_THRESHOLD:
+            # hashlib releases the GIL on large buffers
+            body_hash = await asyncio.get_running_loop().run_in_executor(None, _sha1_hex, body)
+        else:
+            body_hash = _sha1_hex(body)
+        cached = self._response_cache.get(url)
+        if cached is not None and cached.body_hash == body_hash:
+            self.metrics.record_decode_skipped()
+            data = cached.data
+        else:
+            data = await self._async_decode(body)
+        self._response_cache[url] = CachedResponse(
+            data=data,
+            body_hash=body_hash,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+        return data
@@ -0,0 +1,196 @@
+#  Copyright (c) 2026 tbutiu
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""Invoice archive mirroring for E-ON Romania."""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+
+from .api import Invoice, file_sha1
+from .const import DEFAULT_MIRROR_CONCURRENCY, KEY_FACTURASOLD, KEY_PAID_INVOICES, KEY_PROSUMER_INVOICES
+
+_LOGGER = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+# Save the manifest after this many downloads, so an interrupted run resumes close to where it stopped
+MANIFEST_SAVE_EVERY = 20
+
+# Invoice list kind -> data key holding it
+INVOICE_LISTS = (
+    ("paid", KEY_PAID_INVOICES),
+    ("unpaid", KEY_FACTURASOLD),
+    ("prosum", KEY_PROSUMER_INVOICES),
+)
+
+
+def invoice_numbers(contract_data: dict) -> List[Tuple[str, str]]:
+    """Return (kind, invoice_number) for every invoice of a contract, without duplicates."""
+    seen = set()
+    result = []
+    for kind, key in INVOICE_LISTS:
+        items = contract_data.get(key) or []
+        if isinstance(items, dict):
+            items = items.get("list", [])
+        for item in items:
+            number = item.invoice_number if isinstance(item, Invoice) else (item or {}).get("invoiceNumber")
+            if number and number not in seen:
+                seen.add(number)
+                result.append((kind, number))
+    return result
+
+
+def invoice_filename(invoice_number: str) -> str:
+    """Return a safe file name for an invoice number."""
+    return f"factura_{re.sub(r'[^A-Za-z0-9_-]', '_', invoice_number)}.pdf"
+
+
+def _load_manifest(path: str) -> Dict[str, dict]:
+    try:
+        with open(path, encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _save_manifest(path: str, manifest: Dict[str, dict]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.part"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _missing_files(
+    base_dir: str, manifest: Dict[str, dict], keys: Iterable[str], verify: bool = False
+) -> Tuple[set, int]:
+    """Return the manifest keys whose file is gone or changed, and how many entries were refreshed.
+
+    Files with the recorded size and modification time are trusted; the others
+    (or all of them, with verify) are hashed and compared with the recorded sha1.
+    Entries whose file only got a new modification time are updated in place.
+    """
+    missing = set()
+    refreshed = 0
+    for key in keys:
+        entry = manifest[key]
+        try:
+            path = os.path.join(base_dir, entry["file"])
+            stat = os.stat(path)
+            if stat.st_size != entry.get("size"):
+                missing.add(key)
+            elif verify or stat.st_mtime != entry.get("mtime"):
+                if file_sha1(path) != entry.get("sha1"):
+                    missing.add(key)
+                elif stat.st_mtime != entry.get("mtime"):
+                    entry["mtime"] = stat.st_mtime
+                    refreshed += 1
+        except (OSError, KeyError):
+            missing.add(key)
+    return missing, refreshed
+
+
+def _file_mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+async def async_mirror_invoices(
+    hass: HomeAssistant,
+    coordinator,
+    base_dir: str,
+    codes: Optional[Iterable[str]] = None,
+    max_concurrency: int = DEFAULT_MIRROR_CONCURRENCY,
+    verify: bool = False,
+) -> dict:
+    """Download every invoice of the contracts into base_dir/<cod_incasare>/.
+
+    Invoices recorded in the manifest whose file is still intact are skipped,
+    so a run interrupted midway resumes with the invoices it had not saved.
+    With verify, every saved file is hashed, not only those that look modified.
+    Returns counts of downloaded, skipped and failed invoices.
+    """
+    codes = [cod for cod in (codes or coordinator.contract_index) if cod in coordinator.contract_index]
+    # Fresh lists, so invoices issued since the last tick are included
+    await coordinator.async_refresh_keys(
+        (cod_incasare, key) for cod_incasare in codes for _, key in INVOICE_LISTS
+    )
+    data_per_contract = coordinator.data.get("data_per_contract", {})
+
+    manifest_path = os.path.join(base_dir, MANIFEST_NAME)
+    manifest = await hass.async_add_executor_job(_load_manifest, manifest_path)
+
+    jobs = [
+        (f"{cod_incasare}/{number}", cod_incasare, kind, number)
+        for cod_incasare in codes
+        for kind, number in invoice_numbers(data_per_contract.get(cod_incasare, {}))
+    ]
+    known = [key for key, *_ in jobs if key in manifest]
+    missing, refreshed = await hass.async_add_executor_job(_missing_files, base_dir, manifest, known, verify)
+    pending = [job for job in jobs if job[0] not in manifest or job[0] in missing]
+    summary = {"downloaded": 0, "skipped": len(jobs) - len(pending), "failed": 0, "failed_invoices": []}
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    save_lock = asyncio.Lock()
+    unsaved = 0
+
+    async def save_manifest():
+        async with save_lock:
+            await hass.async_add_executor_job(_save_manifest, manifest_path, dict(manifest))
+
+    async def mirror(key: str, cod_incasare: str, kind: str, number: str):
+        nonlocal unsaved
+        relative = os.path.join(cod_incasare, invoice_filename(number))
+        async with semaphore:
+            result = await coordinator.api_client.async_download_invoice_pdf(
+                cod_incasare, number, os.path.join(base_dir, relative)
+            )
+        if result is None:
+            summary["failed"] += 1
+            summary["failed_invoices"].append(key)
+            return
+        summary["skipped" if result.skipped else "downloaded"] += 1
+        manifest[key] = {
+            "file": relative,
+            "kind": kind,
+            "size": result.size,
+            "sha1": result.sha1,
+            "mtime": await hass.async_add_executor_job(_file_mtime, result.path),
+            "saved_at": time.time(),
+        }
+        unsaved += 1
+        if unsaved >= MANIFEST_SAVE_EVERY:
+            unsaved = 0
+            await save_manifest()
+
+    _LOGGER.debug("Mirroring %s invoice(s), %s already saved.", len(pending), summary["skipped"])
+    await asyncio.gather(*(mirror(*job) for job in pending))
+    if pending or refreshed:
+        await save_manifest()
+    return summary
@@ -21,13 +21,14 @@
 
 import logging
 from datetime import datetime
+from functools import partial
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorDeviceClass
 
-from .const import DOMAIN, KEY_CITIREINDEX, KEY_FACTURASOLD, KEY_CONTRACTS
-from .entity import EonEntity
+from .const import DOMAIN, KEY_CITIREINDEX
+from .entity import EonEntity, async_track_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,30 +36,28 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, asyn
     """Set up the E-ON Romania binary sensors."""
     data = hass.data[DOMAIN][config_entry.entry_id]
     coordinator = data["coordinator"]
+
+    async_track_entities(
+        coordinator, config_entry, async_add_entities,
+        lambda known: _build_sensors(coordinator, config_entry),
+    )
+
+
+def _build_sensors(coordinator, config_entry):
+    """Return a topology key and factory for each binary sensor the current coordinator data calls for."""
+    sensors = {}
     
-    contracts_list = coordinator.data.get(KEY_CONTRACTS, [])
-    sensors = []
-    
-    for contract in contracts_list:
-        cod_incasare = None
-        if "contractDetails" in contract:
-            cod_incasare = contract["contractDetails"].get("accountContract")
-        else:
-            cod_incasare = contract.get("contractId") or contract.get("accountContract")
-
-        if not cod_incasare:
-            continue
-            
-        sensors.extend([
-            EonWindowOpenBinarySensor(coordinator, config_entry, cod_incasare),
-            EonInvoiceDueBinarySensor(coordinator, config_entry, cod_incasare),
-        ])
-
-    async_add_entities(sensors)
+    for cod_incasare in coordinator.topology.codes:
+        sensors[("windowopen", cod_incasare)] = partial(EonWindowOpenBinarySensor, coordinator, config_entry, cod_incasare)
+        sensors[("invoicedue", cod_incasare)] = partial(EonInvoiceDueBinarySensor, coordinator, config_entry, cod_incasare)
+
+    return sensors
 
 class EonWindowOpenBinarySensor(EonEntity, BinarySensorEntity):
     """Binary sensor indicating if index submission is allowed."""
 
+    _data_keys = (KEY_CITIREINDEX,)
+
     def __init__(self, coordinator, config_entry, cod_incasare):
         super().__init__(coordinator, config_entry, cod_incasare)
         self._attr_name = "Perioadă transmitere index"
@@ -70,7 +69,7 @@ class EonWindowOpenBinarySensor(EonEntity, BinarySensorEntity):
     def is_on(self):
         data = self.contract_data.get(KEY_CITIREINDEX)
         if not data: return False
-        return data.get("readingPeriod", {}).get("allowedReading", False)
+        return data.allowed_reading
 
     @property
     def icon(self):
@@ -80,6 +79,9 @@ class EonWindowOpenBinarySensor(EonEntity, BinarySensorEntity):
 class EonInvoiceDueBinarySensor(EonEntity, BinarySensorEntity):
     """Binary sensor indicating if an invoice is due soon (within 3 days) or overdue."""
 
+    # Depends on the current date as well, so it is re-evaluated on every update
+    _data_keys = None
+
     def __init__(self, coordinator, config_entry, cod_incasare):
         super().__init__(coordinator, config_entry, cod_incasare)
         self._attr_name = "Scadență factură"
@@ -89,21 +91,8 @@ class EonInvoiceDueBinarySensor(EonEntity, BinarySensorEntity):
 
     @property
     def is_on(self):
-        data = self.contract_data.get(KEY_FACTURASOLD)
-        if not data or not isinstance(data, list):
+        due_date = self.contract_index.next_maturity
+        if due_date is None:
             return False
-            
-        now = datetime.now()
-        for item in data:
-            if item.get("balanceValue", 0) > 0:
-                raw_date = item.get("maturityDate")
-                if raw_date:
-                    try:
-                        # Assuming date format is dd.mm.YYYY
-                        due_date = datetime.strptime(raw_date, "%d.%m.%Y")
-                        days_until = (due_date - now).days
-                        if days_until <= 3: # Due soon or overdue
-                            return True
-                    except ValueError:
-                         continue
-        return False
+        days_until = (datetime.combine(due_date, datetime.min.time()) - datetime.now()).days
+        return days_until <= 3 # Due soon or overdue
@@ -21,14 +21,15 @@
 """Button platform for E-ON Romania."""
 
 import logging
+from functools import partial
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from homeassistant.components.button import ButtonEntity
 
-from .const import DOMAIN, KEY_CITIREINDEX, KEY_CONTRACTS
-from .entity import EonEntity
+from .const import DOMAIN
+from .entity import EonEntity, async_track_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,26 +37,27 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, asyn
     """Set up the E-ON Romania buttons."""
     data = hass.data[DOMAIN][config_entry.entry_id]
     coordinator = data["coordinator"]
-    
-    contracts_list = coordinator.data.get(KEY_CONTRACTS, [])
-    buttons = []
-    
-    for contract in contracts_list:
-        cod_incasare = None
-        if "contractDetails" in contract:
-            cod_incasare = contract["contractDetails"].get("accountContract")
-        else:
-            cod_incasare = contract.get("contractId") or contract.get("accountContract")
 
-        if not cod_incasare:
-            continue
-        buttons.append(TrimiteIndexButton(coordinator, config_entry, cod_incasare))
+    async_track_entities(
+        coordinator, config_entry, async_add_entities,
+        lambda known: _build_buttons(coordinator, config_entry),
+    )
+
 
-    async_add_entities(buttons)
+def _build_buttons(coordinator, config_entry):
+    """Return a topology key and factory for each button the current coordinator data calls for."""
+    buttons = {}
+    
+    for cod_incasare in coordinator.topology.codes:
+        buttons[("trimiteindex", cod_incasare)] = partial(TrimiteIndexButton, coordinator, config_entry, cod_incasare)
+
+    return buttons
 
 class TrimiteIndexButton(EonEntity, ButtonEntity):
     """Button to send meter reading."""
 
+    _data_keys = ()
+
     def __init__(self, coordinator, config_entry, cod_incasare):
         super().__init__(coordinator, config_entry, cod_incasare)
         self._attr_name = "Trimite index"
@@ -80,27 +82,13 @@ class TrimiteIndexButton(EonEntity, ButtonEntity):
                 _LOGGER.error("Invalid value in %s: %s", input_entity_id, state.state)
                 return
 
-            # Get internal meter ID (ablbelnr)
-            ablbelnr = None
-            if data := self.contract_data.get(KEY_CITIREINDEX):
-                if devices := data.get("indexDetails", {}).get("devices", []):
-                    for device in devices:
-                        if indexes := device.get("indexes", []):
-                            ablbelnr = indexes[0].get("ablbelnr")
-                            break
-            
-            if not ablbelnr:
-                _LOGGER.error("Internal meter ID (ablbelnr) not found.")
-                return
-
-            # Call API
-            await self.coordinator.api_client.async_trimite_index(
-                account_contract=self._cod_incasare,
-                ablbelnr=ablbelnr,
-                index_value=index_value,
+            # Sent for the first meter; only this contract's readings are refreshed afterwards
+            result, = await self.coordinator.async_submit_readings(
+                [{"cod_incasare": self._cod_incasare, "index": index_value}]
             )
-
-            await self.coordinator.async_request_refresh()
+            if not result["success"]:
+                _LOGGER.error("Error sending index for account %s: %s", self._cod_incasare, result["error"])
+                return
             _LOGGER.info("Index sent successfully for account %s", self._cod_incasare)
 
         except Exception as e:
@@ -0,0 +1,134 @@
+#  Copyright (c) 2026 tbutiu
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""Client registry shared by all E-ON Romania config entries."""
+
+import logging
+from typing import Dict
+
+from aiohttp import ClientSession
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant, callback
+
+from .api import EonApiClient
+from .const import (
+    DOMAIN, DATA_CLIENTS, DEFAULT_POOL_LIMIT_PER_HOST, DEFAULT_KEEPALIVE_TIMEOUT, DEFAULT_DNS_TTL,
+    DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST,
+)
+from .ratelimit import RequestBudget
+from .transport import create_session
+
+_LOGGER = logging.getLogger(__name__)
+
+# Options of the shared session and budget, with their defaults
+SHARED_OPTIONS = {
+    "pool_limit_per_host": DEFAULT_POOL_LIMIT_PER_HOST,
+    "keepalive_timeout": DEFAULT_KEEPALIVE_TIMEOUT,
+    "dns_ttl": DEFAULT_DNS_TTL,
+    "rate_limit": DEFAULT_RATE_LIMIT,
+    "rate_burst": DEFAULT_RATE_BURST,
+}
+
+
+class EonClientRegistry:
+    """Owns the API clients of all config entries.
+
+    The clients share one HTTP session and one request budget, so the total
+    load on the API stays bounded however many accounts are set up. Each
+    account keeps its own client, with its own token and metrics.
+    """
+
+    def __init__(self, session: ClientSession, budget: RequestBudget, options: Dict[str, int]):
+        self.session = session
+        self.budget = budget
+        # The shared options the session and budget were created with
+        self.options = options
+        self._clients: Dict[str, EonApiClient] = {}
+        self._unsub_close = None
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get_client(self, entry_id: str, username: str, password: str) -> EonApiClient:
+        """Return a new client for a config entry, drawing from the shared budget."""
+        client = EonApiClient(self.session, username, password, budget=self.budget)
+        self._clients[entry_id] = client
+        _LOGGER.debug("%s account(s) share the request budget.", len(self._clients))
+        return client
+
+    def release(self, entry_id: str) -> None:
+        """Forget the client of an unloaded config entry."""
+        self._clients.pop(entry_id, None)
+
+
+@callback
+def is_primary_entry(hass: HomeAssistant, entry_id: str) -> bool:
+    """Return True if entry_id is the first config entry, the one holding the shared options."""
+    entries = hass.config_entries.async_entries(DOMAIN)
+    return bool(entries) and entries[0].entry_id == entry_id
+
+
+@callback
+def shared_options(hass: HomeAssistant) -> Dict[str, int]:
+    """Return the options of the shared session and budget.
+
+    They are read from the first config entry, whichever entry sets up first.
+    """
+    entries = hass.config_entries.async_entries(DOMAIN)
+    options = entries[0].options if entries else {}
+    return {key: options.get(key, default) for key, default in SHARED_OPTIONS.items()}
+
+
+@callback
+def async_get_registry(hass: HomeAssistant) -> EonClientRegistry:
+    """Return the client registry, creating it with the first config entry set up."""
+    if (registry := hass.data.get(DATA_CLIENTS)) is None:
+        options = shared_options(hass)
+        session = create_session(
+            limit_per_host=options["pool_limit_per_host"],
+            keepalive_timeout=options["keepalive_timeout"],
+            dns_ttl=options["dns_ttl"],
+        )
+        budget = RequestBudget(
+            max_concurrency_per_host=options["pool_limit_per_host"],
+            rate_limit=options["rate_limit"],
+            rate_burst=options["rate_burst"],
+        )
+        registry = EonClientRegistry(session, budget, options)
+
+        async def _async_close(_event) -> None:
+            await session.close()
+
+        registry._unsub_close = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close)
+        hass.data[DATA_CLIENTS] = registry
+    return registry
+
+
+@callback
+def async_release_client(hass: HomeAssistant, entry_id: str) -> None:
+    """Release an entry's client, closing the session once no entry uses it."""
+    if (registry := hass.data.get(DATA_CLIENTS)) is None:
+        return
+    registry.release(entry_id)
+    if not registry:
+        hass.data.pop(DATA_CLIENTS)
+        if registry._unsub_close is not None:
+            registry._unsub_close()
+        hass.async_create_task(registry.session.close())
@@ -26,8 +26,14 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
-from .const import DOMAIN, DEFAULT_UPDATE_INTERVAL, DEFAULT_USER, DEFAULT_PASS
+from .const import (
+    DOMAIN, DEFAULT_UPDATE_INTERVAL, DEFAULT_MAX_CONCURRENCY, DEFAULT_USER, DEFAULT_PASS,
+    DEFAULT_WARM_INTERVAL, DEFAULT_COLD_INTERVAL, DEFAULT_TOPOLOGY_INTERVAL, MIN_TIER_INTERVAL,
+    DEFAULT_POOL_LIMIT_PER_HOST, DEFAULT_KEEPALIVE_TIMEOUT, DEFAULT_DNS_TTL,
+    DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST, MAX_RATE_LIMIT, MAX_RATE_BURST,
+)
 from .api import EonApiClient
+from .clients import SHARED_OPTIONS, is_primary_entry
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -87,27 +93,53 @@ class EonRomaniaOptionsFlow(config_entries.OptionsFlow):
     async def async_step_init(self, user_input=None):
         """Manage the options."""
         if user_input is not None:
-            # We can only update 'options' here directly via async_create_entry 
-            # or we enforce new data via async_update_entry if we want to change credentials too.
+            # Options are saved by async_create_entry; the credentials live in the entry
+            # data, next to the saved session, which only belongs to the same account.
             updated_data = {
+                **self.config_entry.data,
                 "username": user_input["username"],
                 "password": user_input["password"],
             }
+            if (
+                updated_data["username"] != self.config_entry.data.get("username")
+                or updated_data["password"] != self.config_entry.data.get("password")
+            ):
+                updated_data.pop("session", None)
             updated_options = {
-                "update_interval": user_input["update_interval"]
+                "update_interval": user_input["update_interval"],
+                "max_concurrency": user_input["max_concurrency"],
+                "warm_interval": user_input["warm_interval"],
+                "cold_interval": user_input["cold_interval"],
+                "topology_interval": user_input["topology_interval"],
             }
+            # Connection pool and rate settings are only shown in advanced mode; keep the saved ones otherwise
+            for key in SHARED_OPTIONS:
+                if key in user_input:
+                    updated_options[key] = user_input[key]
+                elif key in self.config_entry.options:
+                    updated_options[key] = self.config_entry.options[key]
             
-            self.hass.config_entries.async_update_entry(
-                self.config_entry,
-                data=updated_data,
-                options=updated_options
-            )
-            return self.async_create_entry(title="", data={})
+            self.hass.config_entries.async_update_entry(self.config_entry, data=updated_data)
+            return self.async_create_entry(title="", data=updated_options)
 
-        data_schema = vol.Schema({
+        fields = {
             vol.Optional("username", default=self.config_entry.data.get("username", "")): str,
             vol.Optional("password", default=self.config_entry.data.get("password", "")): str,
             vol.Optional("update_interval", default=self.config_entry.options.get("update_interval", DEFAULT_UPDATE_INTERVAL)): int,
-        })
+            vol.Optional("max_concurrency", default=self.config_entry.options.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)): vol.All(int, vol.Range(min=1, max=32)),
+            vol.Optional("warm_interval", default=self.config_entry.options.get("warm_interval", DEFAULT_WARM_INTERVAL)): vol.All(int, vol.Range(min=MIN_TIER_INTERVAL)),
+            vol.Optional("cold_interval", default=self.config_entry.options.get("cold_interval", DEFAULT_COLD_INTERVAL)): vol.All(int, vol.Range(min=MIN_TIER_INTERVAL)),
+            vol.Optional("topology_interval", default=self.config_entry.options.get("topology_interval", DEFAULT_TOPOLOGY_INTERVAL)): vol.All(int, vol.Range(min=MIN_TIER_INTERVAL)),
+        }
+        # The shared connection pool and rate are set on the first entry only, since all entries use them
+        if self.show_advanced_options and is_primary_entry(self.hass, self.config_entry.entry_id):
+            fields.update({
+                vol.Optional("pool_limit_per_host", default=self.config_entry.options.get("pool_limit_per_host", DEFAULT_POOL_LIMIT_PER_HOST)): vol.All(int, vol.Range(min=1, max=32)),
+                vol.Optional("keepalive_timeout", default=self.config_entry.options.get("keepalive_timeout", DEFAULT_KEEPALIVE_TIMEOUT)): vol.All(int, vol.Range(min=0, max=3600)),
+                vol.Optional("dns_ttl", default=self.config_entry.options.get("dns_ttl", DEFAULT_DNS_TTL)): vol.All(int, vol.Range(min=0, max=86400)),
+                vol.Optional("rate_limit", default=self.config_entry.options.get("rate_limit", DEFAULT_RATE_LIMIT)): vol.All(int, vol.Range(min=1, max=MAX_RATE_LIMIT)),
+                vol.Optional("rate_burst", default=self.config_entry.options.get("rate_burst", DEFAULT_RATE_BURST)): vol.All(int, vol.Range(min=1, max=MAX_RATE_BURST)),
+            })
+        data_schema = vol.Schema(fields)
 
         return self.async_show_form(step_id="init", data_schema=data_schema)
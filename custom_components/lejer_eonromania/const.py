@@ -27,6 +27,61 @@ DOMAIN: Final = "lejer_eonromania"
 DEFAULT_USER: Final = "username"
 DEFAULT_PASS: Final = "password"
 DEFAULT_UPDATE_INTERVAL: Final = 3600
+DEFAULT_MAX_CONCURRENCY: Final = 8
+DEFAULT_MAX_CONCURRENCY_PER_HOST: Final = 8
+
+# HTTP transport - pooled connections per host, idle keep-alive and DNS cache lifetime (seconds)
+DEFAULT_POOL_LIMIT_PER_HOST: Final = DEFAULT_MAX_CONCURRENCY_PER_HOST
+DEFAULT_KEEPALIVE_TIMEOUT: Final = 60
+DEFAULT_DNS_TTL: Final = 300
+# Connections opened to the API host while logging in, and request timeouts (seconds)
+PREWARM_CONNECTIONS: Final = 2
+REQUEST_TIMEOUT: Final = 30
+REQUEST_CONNECT_TIMEOUT: Final = 10
+
+# JSON bodies at least this large (bytes) are decoded in the executor, off the event loop
+JSON_EXECUTOR_THRESHOLD: Final = 256 * 1024
+
+# hass.data key of the client registry shared by all config entries
+DATA_CLIENTS: Final = f"{DOMAIN}_clients"
+
+# Authentication - renew the token this many seconds before it expires
+TOKEN_REFRESH_MARGIN: Final = 120
+
+# Throttling - requests per second and burst shared by all accounts (one client if standalone),
+# tunable in the advanced options
+DEFAULT_RATE_LIMIT: Final = 10
+DEFAULT_RATE_BURST: Final = 20
+MAX_RATE_LIMIT: Final = 100
+MAX_RATE_BURST: Final = 200
+# Retries of 429/5xx responses and connection errors, with jittered exponential backoff
+MAX_RETRIES: Final = 3
+BACKOFF_BASE: Final = 1.0
+BACKOFF_MAX: Final = 30
+# Consecutive failures that open the circuit of an endpoint family, and how long it stays open
+CIRCUIT_FAILURE_THRESHOLD: Final = 5
+CIRCUIT_RESET_TIMEOUT: Final = 300
+
+# Stale-while-revalidate - first retry delay of failed keys, doubled up to the maximum
+STALE_RETRY_DELAY: Final = 60
+STALE_RETRY_MAX_DELAY: Final = 900
+
+# Invoice PDF downloads - whole-request and per-read timeouts (seconds), chunk size (bytes)
+DOWNLOAD_TIMEOUT: Final = 120
+DOWNLOAD_READ_TIMEOUT: Final = 30
+DOWNLOAD_CHUNK_SIZE: Final = 65536
+
+# Invoice archive mirroring - <config>/www/eon_invoices/<cod_incasare>/, parallel downloads
+INVOICE_ARCHIVE_DIR: Final = ("www", "eon_invoices")
+DEFAULT_MIRROR_CONCURRENCY: Final = 4
+
+# Paginated lists - pages fetched ahead in parallel when the page count is known, and a safety cap
+PAGE_PREFETCH: Final = 4
+MAX_PAGES: Final = 200
+
+# Snapshot Storage
+STORAGE_VERSION: Final = 1
+STORAGE_SAVE_DELAY: Final = 30
 
 # API URLs
 BASE_URL: Final = "https://api2.eon.ro"
@@ -45,10 +100,10 @@ URLS: Final = {
     "current_date": f"{BASE_URL}/utils/v2/date/current?timeZone=Europe/Bucharest&pattern=yyyy-MM-dd",
     "invoice_balance": f"{BASE_URL}/invoices/v1/invoices/invoice-balance?accountContract={{cod_incasare}}&includeSubcontracts=true",
     "invoice_balance_prosum": f"{BASE_URL}/invoices/v1/invoices/invoice-balance-prosum?accountContract={{cod_incasare}}&includeSubcontracts=true",
-    "invoices_list_paid": f"{BASE_URL}/invoices/v1/invoices/list-paid?accountContract={{cod_incasare}}&status=paid&includeSubcontracts=true&page=1",
+    "invoices_list_paid": f"{BASE_URL}/invoices/v1/invoices/list-paid?accountContract={{cod_incasare}}&status=paid&includeSubcontracts=true&page={{page}}",
     "invoices_list_unpaid": f"{BASE_URL}/invoices/v1/invoices/list?accountContract={{cod_incasare}}&status=unpaid&includeSubcontracts=true",
     "rescheduling_plans": f"{BASE_URL}/invoices/v1/rescheduling-plans?accountContract={{cod_incasare}}&includeSubcontracts=true",
-    "invoices_list_prosum": f"{BASE_URL}/invoices/v1/invoices/list-prosum?accountContract={{cod_incasare}}&includeSubcontracts=true&page=1",
+    "invoices_list_prosum": f"{BASE_URL}/invoices/v1/invoices/list-prosum?accountContract={{cod_incasare}}&includeSubcontracts=true&page={{page}}",
     "payment_notices": f"{BASE_URL}/invoices/v1/payment-notices?accountContract={{cod_incasare}}&status=unpaid",
     "user_wallet": f"{BASE_URL}/users/v1/users/user-wallet",
     "payments_list": f"{BASE_URL}/invoices/v1/payments/payment-list?accountContract={{cod_incasare}}&page={{page}}",
@@ -83,6 +138,31 @@ KEY_RESCHEDULING_PLANS: Final = "rescheduling_plans"
 KEY_PAYMENT_NOTICES: Final = "payment_notices"
 KEY_PAYMENTS: Final = "payments"
 
+# Refresh Tiers - how often each per-contract key is re-fetched
+TIER_HOT: Final = "hot"
+TIER_WARM: Final = "warm"
+TIER_COLD: Final = "cold"
+DEFAULT_WARM_INTERVAL: Final = 21600
+DEFAULT_COLD_INTERVAL: Final = 86400
+# Shortest TTL accepted for the warm and cold tiers (seconds)
+MIN_TIER_INTERVAL: Final = 60
+# The account's contract list (topology) rarely changes
+DEFAULT_TOPOLOGY_INTERVAL: Final = 86400
+KEY_TIERS: Final = {
+    KEY_CITIREINDEX: TIER_HOT,
+    KEY_FACTURASOLD: TIER_HOT,
+    KEY_FACTURASOLD_PROSUM: TIER_HOT,
+    KEY_PAYMENT_NOTICES: TIER_HOT,
+    KEY_PAID_INVOICES: TIER_WARM,
+    KEY_PROSUMER_INVOICES: TIER_WARM,
+    KEY_RESCHEDULING_PLANS: TIER_WARM,
+    KEY_PAYMENTS: TIER_WARM,
+    KEY_DATEUSER: TIER_COLD,
+    KEY_CONVENTIECONSUM: TIER_COLD,
+    KEY_COMPARAREANUALAGRAFIC: TIER_COLD,
+    KEY_ARHIVA: TIER_COLD,
+}
+
 # Attribution
 ATTRIBUTION: Final = "Date furnizate de E-ON România"
 
@@ -18,13 +18,25 @@
 #  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 #  SOFTWARE.
 
+import asyncio
+import hashlib
 import logging
+import time
+from contextlib import aclosing
 from datetime import timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.event import async_call_later
+from homeassistant.core import HomeAssistant, callback
 
-from .api import EonApiClient
+from .api import EonApiClient, records_as_json, records_from_json
+from .codec import dumps_sorted
+from .models import ContractIndex, ContractTopology, EMPTY_INDEX, EMPTY_TOPOLOGY
 from .const import (
+    DOMAIN, DEFAULT_MAX_CONCURRENCY, DEFAULT_WARM_INTERVAL, DEFAULT_COLD_INTERVAL, DEFAULT_TOPOLOGY_INTERVAL,
+    STORAGE_VERSION, STORAGE_SAVE_DELAY, STALE_RETRY_DELAY, STALE_RETRY_MAX_DELAY,
+    KEY_TIERS, TIER_HOT, TIER_WARM, TIER_COLD,
     KEY_CONTRACTS, KEY_USER_WALLET, KEY_DATEUSER, KEY_CITIREINDEX,
     KEY_CONVENTIECONSUM, KEY_COMPARAREANUALAGRAFIC, KEY_ARHIVA,
     KEY_FACTURASOLD, KEY_FACTURASOLD_PROSUM, KEY_PROSUMER_INVOICES,
@@ -33,6 +45,63 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Keys whose presence decides whether optional entities are created
+OPTIONAL_ENTITY_KEYS = (KEY_CITIREINDEX, KEY_FACTURASOLD_PROSUM, KEY_RESCHEDULING_PLANS, KEY_PAYMENT_NOTICES)
+
+# Data key -> EonApiClient method fetching it for one contract (cod_incasare)
+CONTRACT_FETCHERS = {
+    KEY_DATEUSER: "async_fetch_dateuser_data",
+    KEY_CITIREINDEX: "async_fetch_citireindex_data",
+    KEY_CONVENTIECONSUM: "async_fetch_conventieconsum_data",
+    KEY_COMPARAREANUALAGRAFIC: "async_fetch_comparareanualagrafic_data",
+    KEY_ARHIVA: "async_fetch_arhiva_data",
+    # Invoices and Balances
+    KEY_FACTURASOLD: "async_fetch_facturasold_data",
+    KEY_FACTURASOLD_PROSUM: "async_fetch_invoice_balance_prosum",
+    # Lists
+    KEY_PROSUMER_INVOICES: "async_fetch_invoices_list_prosum",
+    KEY_PAID_INVOICES: "async_fetch_invoices_list_paid",
+    # Plans and Notices
+    KEY_RESCHEDULING_PLANS: "async_fetch_rescheduling_plans",
+    KEY_PAYMENT_NOTICES: "async_fetch_payment_notices",
+    # History
+    KEY_PAYMENTS: "async_fetch_payments_data",
+}
+
+# Keys whose fetcher takes the history held so far and only pages in what is new
+INCREMENTAL_KEYS = (KEY_PAYMENTS, KEY_PAID_INVOICES, KEY_PROSUMER_INVOICES)
+
+async def iter_completed(aws: Iterable[Awaitable], limit: Optional[int] = None) -> AsyncIterator[Any]:
+    """Yield the results of awaitables as they complete, running at most limit at a time.
+
+    Awaitables are taken from aws lazily, so with a limit only that many
+    results are ever held at once.
+    """
+    aws = iter(aws)
+    pending = set()
+    try:
+        while True:
+            while limit is None or len(pending) < limit:
+                if (aw := next(aws, None)) is None:
+                    break
+                pending.add(asyncio.ensure_future(aw))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+def fingerprint(value: Any) -> str:
+    """Return a structural hash of a JSON-like value."""
+    return hashlib.sha1(dumps_sorted(value)).hexdigest()
+
+def snapshot_storage_key(entry_id: str) -> str:
+    """Return the storage key of a config entry's snapshot."""
+    return f"{DOMAIN}.{entry_id}.snapshot"
+
 class EonRomaniaCoordinator(DataUpdateCoordinator):
     """Coordinator handling all E-ON Romania data."""
 
@@ -41,6 +110,11 @@ class EonRomaniaCoordinator(DataUpdateCoordinator):
         hass: HomeAssistant,
         api_client: EonApiClient,
         update_interval: int,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        warm_interval: int = DEFAULT_WARM_INTERVAL,
+        cold_interval: int = DEFAULT_COLD_INTERVAL,
+        topology_interval: int = DEFAULT_TOPOLOGY_INTERVAL,
+        entry_id: Optional[str] = None,
     ):
         """Initialize the coordinator."""
         super().__init__(
@@ -50,97 +124,618 @@ class EonRomaniaCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=update_interval),
         )
         self.api_client = api_client
+        # Global limit for in-flight fetches, shared by all contracts
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Held by full and partial refreshes, so a partial one never merges into
+        # data that a concurrent full refresh is about to replace (or vice versa)
+        self._refresh_lock = asyncio.Lock()
+        # Hot keys follow the coordinator tick, warm/cold keys have longer TTLs
+        self._tier_intervals = {
+            TIER_HOT: update_interval,
+            TIER_WARM: warm_interval,
+            TIER_COLD: cold_interval,
+        }
+        # Flattened contract list, shared by the platforms; the list itself is
+        # fetched again only once its own TTL expired (and after a restart)
+        self.topology: ContractTopology = EMPTY_TOPOLOGY
+        self._topology_interval = topology_interval
+        self._topology_fetched_at: Optional[float] = None
+        # Bumped whenever the entities the data calls for may have changed, so the
+        # platforms only rediscover their entities then
+        self.topology_generation = 0
+        self._topology_signature: Optional[tuple] = None
+        # (cod_incasare, key) -> timestamp of the last successful fetch
+        self._fetched_at: Dict[Tuple[str, str], float] = {}
+        # (cod_incasare, key) -> structural hash of the last fetched value;
+        # account-level keys use None as cod_incasare
+        self._fingerprints: Dict[Tuple[Optional[str], str], str] = {}
+        # Keys whose value changed in the last refresh, so entities can skip state writes
+        self.changed_keys: Dict[str, Set[str]] = {}
+        self.changed_account_keys: Set[str] = set()
+        # cod_incasare -> callbacks of its entities, notified when the contract is
+        # published ahead of the rest of a refresh
+        self._contract_listeners: Dict[str, List[Callable[[], None]]] = {}
+        # cod_incasare -> indexed view of the contract data, rebuilt when its keys change
+        self.contract_index: Dict[str, ContractIndex] = {}
+        # Duration (seconds) of each phase of the last refresh, for diagnostics
+        self.refresh_timings: Dict[str, float] = {}
+        self.refresh_count = 0
+        self.last_refresh_at: Optional[float] = None
+        # (cod_incasare, key) -> time of the last successful fetch, for keys whose
+        # last fetch failed and which serve the previous value meanwhile
+        self._stale: Dict[Tuple[Optional[str], str], Optional[float]] = {}
+        self._stale_retries = 0
+        self._cancel_stale_retry = None
+        # Last known data, persisted so entities can be created right after a restart
+        self._store: Optional[Store] = (
+            Store(hass, STORAGE_VERSION, snapshot_storage_key(entry_id)) if entry_id else None
+        )
+
+    async def async_load_snapshot(self) -> bool:
+        """Load the persisted snapshot as the current data.
+
+        Returns False if there is no usable snapshot and a first refresh is needed.
+        """
+        if self._store is None:
+            return False
+        try:
+            snapshot = await self._store.async_load()
+        except Exception as e:
+            _LOGGER.warning("Could not load the stored snapshot: %s", e)
+            return False
+        if not snapshot or not snapshot.get("data"):
+            return False
+
+        self._fetched_at = {
+            (cod_incasare, key): fetched_at
+            for cod_incasare, keys in snapshot.get("fetched_at", {}).items()
+            for key, fetched_at in keys.items()
+        }
+        data = snapshot["data"]
+        data["data_per_contract"] = {
+            cod_incasare: {key: records_from_json(key, value) for key, value in contract_data.items()}
+            for cod_incasare, contract_data in data.get("data_per_contract", {}).items()
+        }
+        self.topology = ContractTopology(data.get(KEY_CONTRACTS))
+        self._update_contract_index(data["data_per_contract"])
+        self._update_topology_generation(data)
+        self.async_set_updated_data(data)
+        _LOGGER.debug(
+            "Loaded snapshot saved at %s with %s contract(s).",
+            snapshot.get("saved_at"), len(data["data_per_contract"]),
+        )
+        return True
+
+    @callback
+    def _snapshot(self) -> dict:
+        """Return the data to persist: current data and per-key fetch times."""
+        fetched_at: Dict[str, Dict[str, float]] = {}
+        for (cod_incasare, key), timestamp in self._fetched_at.items():
+            fetched_at.setdefault(cod_incasare, {})[key] = timestamp
+        data = dict(self.data or {})
+        data["data_per_contract"] = {
+            cod_incasare: {key: records_as_json(value) for key, value in contract_data.items()}
+            for cod_incasare, contract_data in data.get("data_per_contract", {}).items()
+        }
+        return {
+            "saved_at": time.time(),
+            "fetched_at": fetched_at,
+            "data": data,
+        }
 
     async def _async_update_data(self):
         """Fetch data from API using defined keys."""
-        
-        # 1. General Data - Get all contracts
-        contracts_data = await self.api_client.async_fetch_account_contracts_list()
-        user_wallet_data = await self.api_client.async_fetch_user_wallet()
-        
+        async with self._refresh_lock:
+            return await self._async_refresh_all()
+
+    async def _async_refresh_all(self):
+        """Fetch the account data and every expired key of every contract."""
+        started = phase_started = time.monotonic()
+        timings = {}
+        previous_data = self.data or {}
+        changed_account_keys = set()
+
+        # 1. General Data - the wallet on every tick, the contract list when its TTL expired
+        fetch_contracts = self._topology_due(time.time())
+        if fetch_contracts:
+            contracts_data, user_wallet_data = await asyncio.gather(
+                self._async_fetch_limited(self.api_client.async_fetch_account_contracts_list),
+                self._async_fetch_limited(self.api_client.async_fetch_user_wallet),
+            )
+            if contracts_data is not None:
+                self._topology_fetched_at = time.time()
+            # Keep the last good account data if a fetch failed, instead of dropping all contracts
+            contracts_data = self._serve_stale(
+                None, KEY_CONTRACTS, contracts_data, previous_data.get(KEY_CONTRACTS), changed_account_keys
+            )
+        else:
+            contracts_data = previous_data.get(KEY_CONTRACTS)
+            user_wallet_data = await self._async_fetch_limited(self.api_client.async_fetch_user_wallet)
+        user_wallet_data = self._serve_stale(
+            None, KEY_USER_WALLET, user_wallet_data, previous_data.get(KEY_USER_WALLET), changed_account_keys
+        )
+
         if isinstance(contracts_data, list):
             contracts_list = contracts_data
         elif isinstance(contracts_data, dict):
             contracts_list = contracts_data.get("list", [])
         else:
             contracts_list = []
-        
-        data_per_contract = {}
-        
-        # 2. Iterate over each contract found (Flattening sub-contracts)
-        processed_contracts = []
-        for contract in contracts_list:
-            # Check for subcontracts
-            if sub_contracts := contract.get("subContracts"):
-                # If subcontracts exist, this is likely a Collective/DUO contract.
-                # Processing the parent usually results in API errors (3230 Collective Contract not permitted).
-                # We should ONLY process the subcontracts.
-                for sub in sub_contracts:
-                     # Subcontracts usually have direct structure
-                     processed_contracts.append(sub)
-                
-                # Do NOT append the parent contract if subcontracts were found
-                continue
-                     
-            # Include the contract if it has no subcontracts (Standard contract)
-            processed_contracts.append(contract)
-            
-        data_per_contract = {}
-
-        for contract in processed_contracts:
-            cod_incasare = None
-            if "contractDetails" in contract:
-                cod_incasare = contract["contractDetails"].get("accountContract")
-            else:
-                # Fallback for old structure or direct object from subcontracts
-                cod_incasare = contract.get("contractId") or contract.get("accountContract")
-
-            if not cod_incasare:
-                 continue
-                 
-            # Skip if already processed (deduplication)
-            if cod_incasare in data_per_contract:
-                continue
-                 
-            # Specific Data per Contract
-            dateuser_data = await self.api_client.async_fetch_dateuser_data(cod_incasare)
-            citireindex_data = await self.api_client.async_fetch_citireindex_data(cod_incasare)
-            conventieconsum_data = await self.api_client.async_fetch_conventieconsum_data(cod_incasare)
-            comparareanualagrafic_data = await self.api_client.async_fetch_comparareanualagrafic_data(cod_incasare)
-            arhiva_data = await self.api_client.async_fetch_arhiva_data(cod_incasare)
-            
-            # Invoices and Balances
-            facturasold_data = await self.api_client.async_fetch_facturasold_data(cod_incasare)
-            facturasold_prosum_data = await self.api_client.async_fetch_invoice_balance_prosum(cod_incasare)
-            
-            # Lists
-            prosumer_invoices_list_data = await self.api_client.async_fetch_invoices_list_prosum(cod_incasare)
-            paid_invoices_list_data = await self.api_client.async_fetch_invoices_list_paid(cod_incasare)
-
-            # Plans and Notices
-            rescheduling_plans_data = await self.api_client.async_fetch_rescheduling_plans(cod_incasare)
-            payment_notices_data = await self.api_client.async_fetch_payment_notices(cod_incasare)
-
-            # History
-            payments_data = await self.api_client.async_fetch_payments_data(cod_incasare)
-            
-            data_per_contract[cod_incasare] = {
-                KEY_DATEUSER: dateuser_data,
-                KEY_CITIREINDEX: citireindex_data,
-                KEY_CONVENTIECONSUM: conventieconsum_data,
-                KEY_COMPARAREANUALAGRAFIC: comparareanualagrafic_data,
-                KEY_ARHIVA: arhiva_data,
-                KEY_FACTURASOLD: facturasold_data,
-                KEY_FACTURASOLD_PROSUM: facturasold_prosum_data,
-                KEY_PROSUMER_INVOICES: prosumer_invoices_list_data,
-                KEY_PAID_INVOICES: paid_invoices_list_data,
-                KEY_RESCHEDULING_PLANS: rescheduling_plans_data,
-                KEY_PAYMENT_NOTICES: payment_notices_data,
-                KEY_PAYMENTS: payments_data,
-            }
 
-        return {
+        # 2. Flatten sub-contracts and deduplicate, only when the list changed
+        if KEY_CONTRACTS not in previous_data or self._has_changed(
+            None, KEY_CONTRACTS, previous_data[KEY_CONTRACTS], contracts_list
+        ):
+            changed_account_keys.add(KEY_CONTRACTS)
+            self.topology = ContractTopology(contracts_list)
+        codes = self.topology.codes
+        timings["accounts"] = time.monotonic() - phase_started
+
+        # 3. Specific Data per Contract - all contracts and keys in parallel,
+        # bounded by the global semaphore (and the per-host limit in the client).
+        # Once entities exist, each contract completing before the last one is
+        # published to its own entities right away.
+        previous = previous_data.get("data_per_contract", {})
+        phase_started = time.monotonic()
+        results = {}
+        published = set()
+        async with aclosing(iter_completed(
+            self._async_fetch_contract_bundle(cod_incasare, previous.get(cod_incasare)) for cod_incasare in codes
+        )) as bundles:
+            async for cod_incasare, contract_data, changed in bundles:
+                results[cod_incasare] = (contract_data, changed)
+                if self.data is not None and changed and len(results) < len(codes):
+                    self._publish_contract(cod_incasare, contract_data, changed)
+                    published.add(cod_incasare)
+        timings["contracts"] = time.monotonic() - phase_started
+        phase_started = time.monotonic()
+        data_per_contract = {cod_incasare: results[cod_incasare][0] for cod_incasare in codes}
+        # All changes are reported again with the final data; writes of states
+        # already published early are no-ops in the state machine
+        self.changed_keys = {cod_incasare: results[cod_incasare][1] for cod_incasare in codes}
+        if KEY_USER_WALLET not in previous_data or self._has_changed(
+            None, KEY_USER_WALLET, previous_data[KEY_USER_WALLET], user_wallet_data
+        ):
+            changed_account_keys.add(KEY_USER_WALLET)
+        self.changed_account_keys = changed_account_keys
+
+        # Forget fetch times and hashes of contracts that are no longer on the account
+        self._fetched_at = {
+            pair: fetched_at for pair, fetched_at in self._fetched_at.items()
+            if pair[0] in data_per_contract
+        }
+        self._fingerprints = {
+            pair: value for pair, value in self._fingerprints.items()
+            if pair[0] is None or pair[0] in data_per_contract
+        }
+        self._stale = {
+            pair: value for pair, value in self._stale.items()
+            if pair[0] is None or pair[0] in data_per_contract
+        }
+        self._schedule_stale_retry()
+
+        self._update_contract_index(data_per_contract, current=published)
+        timings["index"] = time.monotonic() - phase_started
+        timings["total"] = time.monotonic() - started
+        self.refresh_timings = timings
+        self.refresh_count += 1
+        self.last_refresh_at = time.time()
+
+        data = {
             KEY_CONTRACTS: contracts_list,
             KEY_USER_WALLET: user_wallet_data,
             "data_per_contract": data_per_contract
         }
+        self._update_topology_generation(data)
+        if self._store is not None:
+            # The snapshot is built when the save runs, after self.data was replaced
+            self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+        return data
+
+    @callback
+    def async_add_contract_listener(self, cod_incasare: str, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Listen for a contract published ahead of the rest of a refresh; returns the remover.
+
+        The full update at the end of the refresh still goes to the coordinator's
+        regular listeners.
+        """
+        self._contract_listeners.setdefault(cod_incasare, []).append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners = self._contract_listeners.get(cod_incasare, [])
+            if update_callback in listeners:
+                listeners.remove(update_callback)
+            if not listeners:
+                self._contract_listeners.pop(cod_incasare, None)
+
+        return remove_listener
+
+    @callback
+    def _publish_contract(self, cod_incasare: str, contract_data: dict, changed: Set[str]) -> None:
+        """Show one contract's new data while the others are still being fetched.
+
+        Only that contract's listeners are notified.
+        """
+        self.contract_index[cod_incasare] = ContractIndex(contract_data)
+        self.changed_keys = {cod_incasare: changed}
+        self.changed_account_keys = set()
+        self.data = {
+            **self.data,
+            "data_per_contract": {**self.data.get("data_per_contract", {}), cod_incasare: contract_data},
+        }
+        for update_callback in list(self._contract_listeners.get(cod_incasare, ())):
+            update_callback()
+
+    async def async_iter_contracts(
+        self,
+        codes: Optional[Iterable[str]] = None,
+        keys: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[str, dict]]:
+        """Fetch contracts and yield (cod_incasare, data) for each as soon as it completes.
+
+        Meant for consumers processing many contracts (exports, scripts): every
+        key (or the given keys) is fetched fresh, nothing is kept on the
+        coordinator, and with limit at most that many contracts are in flight
+        and held in memory at once. Defaults to the contracts on the account.
+        """
+        codes = list(codes if codes is not None else self.contract_index)
+        keys = [key for key in (keys or CONTRACT_FETCHERS) if key in CONTRACT_FETCHERS]
+
+        async def fetch(cod_incasare: str) -> Tuple[str, dict]:
+            values = await asyncio.gather(
+                *(
+                    self._async_fetch_limited(
+                        getattr(self.api_client, CONTRACT_FETCHERS[key]), *self._fetch_args(key, cod_incasare, {})
+                    )
+                    for key in keys
+                )
+            )
+            return cod_incasare, dict(zip(keys, values))
+
+        async with aclosing(iter_completed((fetch(cod_incasare) for cod_incasare in codes), limit)) as bundles:
+            async for bundle in bundles:
+                yield bundle
+
+    async def _async_fetch_contract_bundle(
+        self, cod_incasare: str, previous: Optional[dict] = None
+    ) -> Tuple[str, dict, Set[str]]:
+        contract_data, changed = await self._async_fetch_contract(cod_incasare, previous)
+        return cod_incasare, contract_data, changed
+
+    async def _async_fetch_contract(
+        self, cod_incasare: str, previous: Optional[dict] = None, keys: Optional[Iterable[str]] = None
+    ) -> Tuple[dict, Set[str]]:
+        """Fetch the expired data keys of one contract (or the given keys) concurrently.
+
+        Other keys are carried over from the previous snapshot.
+        Returns the contract data and the keys whose value changed.
+        """
+        now = time.time()
+        previous = previous or {}
+        contract_data = dict(previous)
+        changed = set()
+        if keys is None:
+            keys = [
+                key for key in CONTRACT_FETCHERS
+                if key not in contract_data or self._is_due(cod_incasare, key, now)
+            ]
+        else:
+            keys = [key for key in keys if key in CONTRACT_FETCHERS]
+        results = await asyncio.gather(
+            *(
+                self._async_fetch_limited(
+                    getattr(self.api_client, CONTRACT_FETCHERS[key]),
+                    *self._fetch_args(key, cod_incasare, contract_data),
+                )
+                for key in keys
+            )
+        )
+        for key, result in zip(keys, results):
+            result = self._serve_stale(cod_incasare, key, result, previous.get(key), changed)
+            contract_data[key] = result
+            if key not in previous or self._has_changed(cod_incasare, key, previous[key], result):
+                changed.add(key)
+            # Failed fetches are not timestamped, so they are retried next tick
+            if (cod_incasare, key) not in self._stale and result is not None:
+                self._fetched_at[(cod_incasare, key)] = now
+        return contract_data, changed
+
+    def _serve_stale(
+        self, cod_incasare: Optional[str], key: str, result: Any, previous: Any, changed: Set[str]
+    ) -> Any:
+        """Return result, or the previous value if the fetch failed and one exists.
+
+        Keys entering or leaving the stale state are added to changed, so their
+        entities write the new age attribute.
+        """
+        pair = (cod_incasare, key)
+        if result is None and previous is not None:
+            if pair not in self._stale:
+                _LOGGER.debug("Fetching %s failed, keeping the last good value (contract %s).", key, cod_incasare)
+                self._stale[pair] = self._fetched_at.get(pair) if cod_incasare else self.last_refresh_at
+                changed.add(key)
+            return previous
+        if self._stale.pop(pair, False) is not False:
+            changed.add(key)
+        return result
+
+    def stale_age(self, cod_incasare: Optional[str], keys: Iterable[str]) -> Optional[float]:
+        """Return the age (seconds) of the oldest stale value among keys, or None if all are fresh."""
+        if not self._stale:
+            return None
+        now = time.time()
+        ages = [
+            now - (self._stale[pair] or now)
+            for key in keys
+            for pair in ((cod_incasare, key), (None, key))
+            if pair in self._stale
+        ]
+        return max(ages) if ages else None
+
+    @callback
+    def _schedule_stale_retry(self) -> None:
+        """Retry stale keys ahead of the next tick, with exponential backoff."""
+        if not self._stale:
+            self._stale_retries = 0
+            self.cancel_stale_retry()
+            return
+        if self._cancel_stale_retry is not None:
+            return
+        delay = min(
+            STALE_RETRY_DELAY * 2 ** self._stale_retries,
+            STALE_RETRY_MAX_DELAY,
+            self._tier_intervals[TIER_HOT],
+        )
+        self._stale_retries += 1
+        _LOGGER.debug("%s stale key(s), retrying in %s s.", len(self._stale), delay)
+        self._cancel_stale_retry = async_call_later(self.hass, delay, self._async_retry_stale)
+
+    async def _async_retry_stale(self, _now) -> None:
+        self._cancel_stale_retry = None
+        if (None, KEY_CONTRACTS) in self._stale:
+            # The contract list decides which contracts exist, so it needs a full refresh
+            await self.async_request_refresh()
+            return
+        # Only the failed pairs are fetched again
+        await self.async_refresh_keys(list(self._stale))
+
+    @callback
+    def cancel_stale_retry(self) -> None:
+        """Cancel the pending retry of stale keys."""
+        if self._cancel_stale_retry is not None:
+            self._cancel_stale_retry()
+            self._cancel_stale_retry = None
+
+    def _has_changed(self, cod_incasare: Optional[str], key: str, previous: Any, value: Any) -> bool:
+        """Return True if value differs structurally from the last fetched one."""
+        # Conditional requests hand back the very same object for unchanged payloads
+        if value is previous:
+            return False
+        pair = (cod_incasare, key)
+        new_fingerprint = fingerprint(value)
+        old_fingerprint = self._fingerprints.get(pair)
+        self._fingerprints[pair] = new_fingerprint
+        if old_fingerprint is None:
+            # No hash yet (e.g. data loaded from the snapshot): compare with the previous value
+            return fingerprint(previous) != new_fingerprint
+        return old_fingerprint != new_fingerprint
+
+    def _update_topology_generation(self, data: dict) -> None:
+        """Bump topology_generation if the contracts, meters, years or optional lists changed.
+
+        Only what decides which entities exist is compared, not their values.
+        """
+        data_per_contract = data.get("data_per_contract", {})
+        wallet = data.get(KEY_USER_WALLET)
+        signature = (
+            isinstance(wallet, dict) and wallet.get("balance") is not None,
+            tuple(
+                (
+                    cod_incasare,
+                    tuple(index.devices),
+                    tuple(index.history_by_year),
+                    tuple(index.payments_by_year),
+                    tuple(index.consumption_by_year),
+                    tuple(bool(data_per_contract.get(cod_incasare, {}).get(key)) for key in OPTIONAL_ENTITY_KEYS),
+                )
+                for cod_incasare, index in (
+                    (cod_incasare, self.contract_index.get(cod_incasare, EMPTY_INDEX))
+                    for cod_incasare in self.topology.codes
+                )
+            ),
+        )
+        if signature != self._topology_signature:
+            self._topology_signature = signature
+            self.topology_generation += 1
+
+    def _update_contract_index(self, data_per_contract: dict, current: Iterable[str] = ()) -> None:
+        """Rebuild the index of contracts that are new or whose data changed.
+
+        Contracts in current already have an up-to-date index.
+        """
+        current = set(current)
+        self.contract_index = {
+            cod_incasare: (
+                self.contract_index[cod_incasare]
+                if cod_incasare in self.contract_index
+                and (cod_incasare in current or not self.changed_keys.get(cod_incasare))
+                else ContractIndex(contract_data)
+            )
+            for cod_incasare, contract_data in data_per_contract.items()
+        }
+
+    async def async_refresh_keys(self, pairs: Iterable[Tuple[Optional[str], str]]) -> None:
+        """Fetch only the given (cod_incasare, key) pairs and merge them into the current data.
+
+        The account's wallet is refreshed with (None, KEY_USER_WALLET). Contracts
+        not on the account and unknown keys are ignored. Listeners are
+        notified once, with only the refreshed keys reported as changed. A full
+        refresh in progress is waited for, and the merge uses its result.
+        """
+        if not self.data:
+            await self.async_request_refresh()
+            return
+
+        async with self._refresh_lock:
+            data_per_contract = self.data.get("data_per_contract", {})
+            requested: Dict[str, List[str]] = {}
+            refresh_wallet = False
+            for cod_incasare, key in pairs:
+                if cod_incasare is None and key == KEY_USER_WALLET:
+                    refresh_wallet = True
+                elif cod_incasare in data_per_contract and key in CONTRACT_FETCHERS:
+                    keys = requested.setdefault(cod_incasare, [])
+                    if key not in keys:
+                        keys.append(key)
+            if not requested and not refresh_wallet:
+                return
+
+            results = await asyncio.gather(
+                *(
+                    self._async_fetch_contract(cod_incasare, data_per_contract[cod_incasare], keys)
+                    for cod_incasare, keys in requested.items()
+                ),
+                *(
+                    [self._async_fetch_limited(self.api_client.async_fetch_user_wallet)]
+                    if refresh_wallet else []
+                ),
+            )
+            _LOGGER.debug(
+                "Refreshed %s key(s) of %s contract(s).",
+                sum(len(keys) for keys in requested.values()), len(requested),
+            )
+            merged = dict(data_per_contract)
+            self.changed_keys = {}
+            for cod_incasare, (contract_data, changed) in zip(requested, results):
+                merged[cod_incasare] = contract_data
+                self.changed_keys[cod_incasare] = changed
+            data = {**self.data, "data_per_contract": merged}
+
+            changed_account_keys = set()
+            if refresh_wallet:
+                previous_wallet = self.data.get(KEY_USER_WALLET)
+                wallet = self._serve_stale(None, KEY_USER_WALLET, results[-1], previous_wallet, changed_account_keys)
+                if self._has_changed(None, KEY_USER_WALLET, previous_wallet, wallet):
+                    changed_account_keys.add(KEY_USER_WALLET)
+                data[KEY_USER_WALLET] = wallet
+            self.changed_account_keys = changed_account_keys
+            self._update_contract_index(merged)
+            self._update_topology_generation(data)
+            self._schedule_stale_retry()
+
+            # Not async_set_updated_data: that would restart the coordinator's
+            # timer, and frequent partial refreshes (stale retries) would keep
+            # postponing the full refresh of every other key
+            self.data = data
+            self.async_update_listeners()
+            if self._store is not None:
+                self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+
+    async def async_submit_readings(self, readings: Iterable[dict]) -> List[dict]:
+        """Submit meter readings for many contracts concurrently.
+
+        Each reading has cod_incasare and index, and optionally ablbelnr or
+        device_number (the contract's first meter otherwise). Returns one result
+        per reading, in order, then refreshes the readings of the contracts that
+        accepted one.
+        """
+        results = await asyncio.gather(*(self._async_submit_reading(reading) for reading in readings))
+        submitted = {result["cod_incasare"] for result in results if result["success"]}
+        await self.async_refresh_keys((cod_incasare, KEY_CITIREINDEX) for cod_incasare in submitted)
+        return list(results)
+
+    async def _async_submit_reading(self, reading: dict) -> dict:
+        """Submit one meter reading, returning its result."""
+        cod_incasare = reading["cod_incasare"]
+        result = {"cod_incasare": cod_incasare, "index": reading["index"], "success": False}
+        if (index := self.contract_index.get(cod_incasare)) is None:
+            result["error"] = "unknown_contract"
+            return result
+
+        ablbelnr = reading.get("ablbelnr")
+        if not ablbelnr and (device_number := reading.get("device_number")):
+            device = index.device(device_number)
+            ablbelnr = device.ablbelnr if device else None
+        elif not ablbelnr:
+            # The first meter that accepts readings; some devices carry no indexes
+            ablbelnr = index.first_ablbelnr
+        if not ablbelnr:
+            result["error"] = "unknown_meter"
+            return result
+        result["ablbelnr"] = ablbelnr
+
+        response = await self._async_fetch_limited(
+            self.api_client.async_trimite_index, cod_incasare, ablbelnr, int(reading["index"])
+        )
+        if response is None:
+            result["error"] = "submission_failed"
+        else:
+            result["success"] = True
+        return result
+
+    def diagnostics(self) -> dict:
+        """Return the refresh state, for the diagnostics download.
+
+        Contract codes are replaced by their position, so the result can be shared.
+        """
+        now = time.time()
+        fetch_ages: Dict[str, Dict[str, float]] = {}
+        for (cod_incasare, key), fetched_at in self._fetched_at.items():
+            fetch_ages.setdefault(cod_incasare, {})[key] = round(now - fetched_at, 1)
+        return {
+            "refresh": {
+                "count": self.refresh_count,
+                "last_at": self.last_refresh_at,
+                "last_success": self.last_update_success,
+                "timings": self.refresh_timings,
+                "tier_intervals": dict(self._tier_intervals),
+                "contracts": len(self.contract_index),
+                "stale_keys": sorted(key for _, key in self._stale),
+                # Seconds since each key was last fetched, per contract
+                "key_ages": {f"contract_{i}": ages for i, ages in enumerate(fetch_ages.values(), 1)},
+            },
+            "topology": {
+                "contracts": len(self.topology.codes),
+                "sub_contracts": len(self.topology.parents),
+                "product_types": sorted(set(self.topology.product_types.values())),
+                "interval": self._topology_interval,
+                "age": (
+                    round(now - self._topology_fetched_at, 1)
+                    if self._topology_fetched_at is not None else None
+                ),
+            },
+        }
+
+    def keys_changed(self, cod_incasare: str, keys: Iterable[str]) -> bool:
+        """Return True if any of the keys changed for the contract in the last refresh."""
+        changed = self.changed_keys.get(cod_incasare, set()) | self.changed_account_keys
+        return not changed.isdisjoint(keys)
+
+    @staticmethod
+    def _fetch_args(key: str, cod_incasare: str, contract_data: dict) -> tuple:
+        """Return the fetcher arguments for a key, including retained history for incremental keys."""
+        if key in INCREMENTAL_KEYS:
+            return cod_incasare, contract_data.get(key)
+        return (cod_incasare,)
+
+    def _topology_due(self, now: float) -> bool:
+        """Return True if the contract list has to be fetched again."""
+        if self._topology_fetched_at is None:
+            return True
+        return now - self._topology_fetched_at >= self._topology_interval - self._tier_intervals[TIER_HOT] / 2
+
+    def _is_due(self, cod_incasare: str, key: str, now: float) -> bool:
+        """Return True if the key's tier TTL has expired for this contract."""
+        fetched_at = self._fetched_at.get((cod_incasare, key))
+        if fetched_at is None:
+            return True
+        interval = self._tier_intervals[KEY_TIERS.get(key, TIER_HOT)]
+        # Half a tick of slack, so a key is not skipped because the tick fired slightly early
+        return now - fetched_at >= interval - self._tier_intervals[TIER_HOT] / 2
+
+    async def _async_fetch_limited(self, fetch, *args):
+        """Run one API fetch under the global concurrency limit."""
+        async with self._semaphore:
+            return await fetch(*args)
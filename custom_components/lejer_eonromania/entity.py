@@ -21,25 +21,113 @@
 """Base entity class for E-ON Romania integration."""
 
 
+from typing import AbstractSet, Callable, Dict, Hashable, Optional, Tuple
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.device_registry import DeviceEntryType
 
 from .const import DOMAIN, ATTRIBUTION
+from .models import ContractIndex, EMPTY_INDEX
+
+@callback
+def async_track_entities(
+    coordinator,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    build: Callable[[AbstractSet[Hashable]], Dict[Hashable, Callable[[], Entity]]],
+) -> None:
+    """Add a platform's entities now and keep them in sync with the coordinator data.
+
+    `build` receives the keys of the entities already added and returns a
+    topology key (contract, meter, year...) with an entity factory for each
+    entity the current data calls for. It is re-run whenever the coordinator's
+    topology_generation changes, so new years, meters and contracts get their
+    entities without reloading the entry; only new keys are constructed, and
+    entities whose key is no longer returned are removed from the state machine.
+    Their registry entries are kept, so an entity that comes back keeps its
+    entity_id and user customizations.
+    """
+    known: Dict[Hashable, Entity] = {}
+    synced_generation: Optional[int] = None
+
+    @callback
+    def _async_sync() -> None:
+        nonlocal synced_generation
+        if coordinator.data is None or coordinator.topology_generation == synced_generation:
+            return
+        wanted = build(known.keys())
+        new = {key: factory() for key, factory in wanted.items() if key not in known}
+        known.update(new)
+        if new:
+            async_add_entities(list(new.values()))
+
+        # A failed refresh says nothing about what the account still has
+        if not coordinator.last_update_success:
+            return
+        synced_generation = coordinator.topology_generation
+        for key in [key for key in known if key not in wanted]:
+            entity = known.pop(key)
+            if entity.hass is not None:
+                entity.hass.async_create_task(entity.async_remove(force_remove=True))
+
+    _async_sync()
+    config_entry.async_on_unload(coordinator.async_add_listener(_async_sync))
+
 
 class EonEntity(CoordinatorEntity):
     """Base class for E-ON Romania entities."""
 
+    # Coordinator data keys the state is computed from. None writes state on every
+    # update (e.g. time-dependent states), an empty tuple never does.
+    _data_keys: Optional[Tuple[str, ...]] = None
+
     def __init__(self, coordinator, config_entry, cod_incasare):
         """Initialize the base entity."""
         super().__init__(coordinator)
         self.config_entry = config_entry
         self._cod_incasare = cod_incasare
+        self._was_available = True
+
+    async def async_added_to_hass(self) -> None:
+        """Also listen for this contract's data published ahead of a full refresh."""
+        await super().async_added_to_hass()
+        # Entities without data keys wait for the full update
+        if self._data_keys:
+            self.async_on_remove(
+                self.coordinator.async_add_contract_listener(self._cod_incasare, self._handle_coordinator_update)
+            )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if the entity's data keys or availability changed.
+
+        Entities serving stale data are written on every update, to refresh its age.
+        """
+        available = self.available
+        if (
+            self._data_keys is not None
+            and available == self._was_available
+            and not self.coordinator.keys_changed(self._cod_incasare, self._data_keys)
+            and self.coordinator.stale_age(self._cod_incasare, self._data_keys) is None
+        ):
+            return
+        self._was_available = available
+        super()._handle_coordinator_update()
 
     @property
     def contract_data(self):
         """Return data for this specific contract."""
         return self.coordinator.data.get("data_per_contract", {}).get(self._cod_incasare, {})
 
+    @property
+    def contract_index(self) -> ContractIndex:
+        """Return the indexed view of this contract's data."""
+        return self.coordinator.contract_index.get(self._cod_incasare, EMPTY_INDEX)
+
     @property
     def device_info(self):
         """Return device information."""
@@ -64,7 +152,7 @@ class EonEntity(CoordinatorEntity):
 
         full_address = f"{street_type} {street_name} {street_no} ap. {apartment}, {locality_name}"
 
-        product_type = data.get("productType", "")
+        product_type = data.get("productType") or self.coordinator.topology.product_types.get(self._cod_incasare, "")
         type_suffix = ""
         if "ELECTRIC" in product_type or "F_EE" in product_type or "E.ON ENERGY" in product_type:
              type_suffix = " (Electricitate)"
@@ -83,6 +171,10 @@ class EonEntity(CoordinatorEntity):
     @property
     def extra_state_attributes(self):
         """Return common attributes."""
-        return {
+        attrs = {
             "attribution": ATTRIBUTION,
         }
+        # The last fetch failed and the previous value is shown meanwhile
+        if self._data_keys and (age := self.coordinator.stale_age(self._cod_incasare, self._data_keys)) is not None:
+            attrs["Vechime date (secunde)"] = round(age)
+        return attrs
@@ -0,0 +1,188 @@
+#  Copyright (c) 2026 tbutiu
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""Request and refresh metrics for E-ON Romania."""
+
+import bisect
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .const import URLS
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open
+LATENCY_BUCKETS: Tuple[float, ...] = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _compile_endpoints() -> List[Tuple[str, re.Pattern]]:
+    """Build path patterns for URLS, static paths first so they win over {placeholders}."""
+    patterns = []
+    for name, url in URLS.items():
+        path = urlsplit(url.split("?", 1)[0]).path
+        regex = re.sub(r"\\\{[^}]+\\\}", "[^/]+", re.escape(path))
+        patterns.append((name, re.compile(f"^{regex}$")))
+    return sorted(patterns, key=lambda item: "[^/]+" in item[1].pattern)
+
+
+_ENDPOINT_PATTERNS = _compile_endpoints()
+_endpoint_cache: Dict[str, str] = {}
+
+
+def endpoint_name(url: str) -> str:
+    """Return the URLS key a request URL was built from, or its path if unknown."""
+    path = urlsplit(url).path
+    if (name := _endpoint_cache.get(path)) is None:
+        name = next((name for name, pattern in _ENDPOINT_PATTERNS if pattern.match(path)), path)
+        _endpoint_cache[path] = name
+    return name
+
+
+@dataclass
+class EndpointStats:
+    """Counters of one endpoint."""
+
+    requests: int = 0
+    errors: int = 0
+    unauthorized: int = 0
+    retries: int = 0
+    throttled: int = 0
+    # Requests not sent because the endpoint family's circuit was open
+    rejected: int = 0
+    not_modified: int = 0
+    bytes_received: int = 0
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+    # Request count per LATENCY_BUCKETS bucket, plus one for slower requests
+    latency_histogram: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    @property
+    def latency_avg(self) -> Optional[float]:
+        return self.latency_total / self.requests if self.requests else None
+
+    def as_dict(self) -> dict:
+        labels = [f"<={bound}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "unauthorized": self.unauthorized,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+            "not_modified": self.not_modified,
+            "bytes_received": self.bytes_received,
+            "latency_avg": round(self.latency_avg, 4) if self.requests else None,
+            "latency_max": round(self.latency_max, 4),
+            "latency_histogram": dict(zip(labels, self.latency_histogram)),
+        }
+
+
+class ApiMetrics:
+    """Per-endpoint request metrics collected by EonApiClient."""
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.logins = 0
+        self.login_failures = 0
+        # JSON decoding: bodies parsed on the loop (and the time it took), in the
+        # executor, and not parsed at all because they were unchanged
+        self.decoded = 0
+        self.decode_time = 0.0
+        self.decoded_off_loop = 0
+        self.decode_skipped = 0
+        self.started_at = time.time()
+
+    def _stats(self, url: str) -> EndpointStats:
+        name = endpoint_name(url)
+        if (stats := self.endpoints.get(name)) is None:
+            stats = self.endpoints[name] = EndpointStats()
+        return stats
+
+    def record_request(self, url: str, status: int, latency: float, size: int = 0) -> None:
+        """Record a finished request; status 0 means it failed without a response."""
+        stats = self._stats(url)
+        stats.requests += 1
+        stats.bytes_received += size
+        stats.latency_total += latency
+        stats.latency_max = max(stats.latency_max, latency)
+        stats.latency_histogram[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+        if status == 401:
+            stats.unauthorized += 1
+        elif status == 304:
+            stats.not_modified += 1
+        elif status != 200:
+            stats.errors += 1
+            if status == 429:
+                stats.throttled += 1
+
+    def record_retry(self, url: str) -> None:
+        self._stats(url).retries += 1
+
+    def record_rejected(self, url: str) -> None:
+        self._stats(url).rejected += 1
+
+    def record_login(self, success: bool) -> None:
+        self.logins += 1
+        if not success:
+            self.login_failures += 1
+
+    def record_decode(self, seconds: Optional[float]) -> None:
+        """Record a decoded body; seconds is None if it was decoded off the loop."""
+        if seconds is None:
+            self.decoded_off_loop += 1
+        else:
+            self.decoded += 1
+            self.decode_time += seconds
+
+    def record_decode_skipped(self) -> None:
+        self.decode_skipped += 1
+
+    @property
+    def total_requests(self) -> int:
+        return sum(stats.requests for stats in self.endpoints.values())
+
+    @property
+    def total_errors(self) -> int:
+        return sum(stats.errors for stats in self.endpoints.values())
+
+    @property
+    def latency_avg(self) -> Optional[float]:
+        requests = self.total_requests
+        if not requests:
+            return None
+        return sum(stats.latency_total for stats in self.endpoints.values()) / requests
+
+    def as_dict(self) -> dict:
+        return {
+            "since": self.started_at,
+            "total_requests": self.total_requests,
+            "total_errors": self.total_errors,
+            "total_bytes_received": sum(stats.bytes_received for stats in self.endpoints.values()),
+            "logins": self.logins,
+            "login_failures": self.login_failures,
+            "json": {
+                "decoded": self.decoded,
+                "decode_time": round(self.decode_time, 4),
+                "decoded_off_loop": self.decoded_off_loop,
+                "decode_skipped": self.decode_skipped,
+            },
+            "endpoints": {name: stats.as_dict() for name, stats in sorted(self.endpoints.items())},
+        }
@@ -0,0 +1,168 @@
+#  Copyright (c) 2026 tbutiu
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""Indexed per-contract data model for E-ON Romania entities."""
+
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from .api import IndexReadings, Invoice, MeterReading, Payment
+from .const import (
+    KEY_CITIREINDEX, KEY_ARHIVA, KEY_PAYMENTS, KEY_FACTURASOLD, KEY_COMPARAREANUALAGRAFIC,
+)
+
+
+class ContractTopology:
+    """Flattened view of the account's contracts, built when the contract list is fetched.
+
+    Collective (DUO) contracts are replaced by their sub-contracts, since the
+    API rejects per-contract requests for the parent (error 3230).
+    """
+
+    def __init__(self, contracts_list: Optional[list] = None):
+        # cod_incasare -> contract object, in account order and without duplicates
+        self.contracts: Dict[str, dict] = {}
+        # cod_incasare of a sub-contract -> cod_incasare of its collective contract
+        self.parents: Dict[str, str] = {}
+        self.product_types: Dict[str, str] = {}
+
+        for contract in contracts_list or []:
+            if not isinstance(contract, dict):
+                continue
+            if sub_contracts := contract.get("subContracts"):
+                parent = _account_contract(contract)
+                for sub in sub_contracts:
+                    if (cod_incasare := self._add(sub)) and parent and parent != cod_incasare:
+                        self.parents.setdefault(cod_incasare, parent)
+                continue
+            self._add(contract)
+
+        self.codes: List[str] = list(self.contracts)
+
+    def _add(self, contract: dict) -> Optional[str]:
+        """Add a contract unless it has no code or was already seen; return its code."""
+        cod_incasare = _account_contract(contract)
+        if not cod_incasare or cod_incasare in self.contracts:
+            return None
+        self.contracts[cod_incasare] = contract
+        details = contract.get("contractDetails") or contract
+        if product_type := details.get("productType") or details.get("type"):
+            self.product_types[cod_incasare] = product_type
+        return cod_incasare
+
+
+def _account_contract(contract: dict) -> Optional[str]:
+    """Return the cod_incasare of a contract list item."""
+    if "contractDetails" in contract:
+        return (contract["contractDetails"] or {}).get("accountContract")
+    # Old structure, or a sub-contract object
+    return contract.get("contractId") or contract.get("accountContract")
+
+
+class ContractIndex:
+    """Lookup tables built once per refresh from the data of one contract.
+
+    Entities read their state from here with dictionary lookups instead of
+    scanning the payloads on every state read.
+    """
+
+    def __init__(self, contract_data: Optional[dict] = None):
+        contract_data = contract_data or {}
+
+        # Meter readings: devices by deviceNumber
+        readings = contract_data.get(KEY_CITIREINDEX)
+        self.readings: Optional[IndexReadings] = readings if isinstance(readings, IndexReadings) else None
+        self.devices: Dict[str, MeterReading] = {
+            device.device_number: device for device in (self.readings.devices if self.readings else ())
+        }
+        self.first_ablbelnr: Optional[str] = next(
+            (device.ablbelnr for device in self.devices.values() if device.ablbelnr), None
+        )
+
+        # Reading history by year
+        arhiva = contract_data.get(KEY_ARHIVA) or {}
+        self.history_by_year: Dict[Any, dict] = {
+            item["year"]: item for item in arhiva.get("history", []) if item.get("year")
+        }
+
+        # Payments bucketed by year
+        payments_by_year = defaultdict(list)
+        for payment in contract_data.get(KEY_PAYMENTS) or []:
+            if isinstance(payment, Payment) and payment.payment_date:
+                payments_by_year[payment.payment_date.year].append(payment)
+        self.payments_by_year: Dict[int, List[Payment]] = dict(payments_by_year)
+
+        # Monthly consumption by year
+        consumption_by_year = defaultdict(dict)
+        comp_data = contract_data.get(KEY_COMPARAREANUALAGRAFIC) or {}
+        for item in comp_data.get("consumption", []) if isinstance(comp_data, dict) else []:
+            year = item.get("year")
+            month = item.get("month")
+            if year and month:
+                consumption_by_year[year][month] = {
+                    "consumptionValue": item.get("consumptionValue"),
+                    "consumptionValueDayValue": item.get("consumptionValueDayValue"),
+                }
+        self.consumption_by_year: Dict[Any, Dict[Any, dict]] = dict(consumption_by_year)
+
+        # Unpaid invoices: numbered lines for display and open balances by maturity
+        invoices = [i for i in contract_data.get(KEY_FACTURASOLD) or [] if isinstance(i, Invoice)]
+        self.has_unpaid: bool = any(invoice.issued_cents > 0 for invoice in invoices)
+        self.unpaid_lines: List[tuple] = [
+            (i, invoice.balance_cents / 100, _maturity_label(invoice.maturity_date))
+            for i, invoice in enumerate(invoices, 1)
+            if invoice.balance_cents > 0
+        ]
+        self.unpaid_total: float = sum(invoice.balance_cents for invoice in invoices if invoice.balance_cents > 0) / 100
+        self.invoices_by_maturity: List[tuple] = sorted(
+            (
+                (invoice.maturity_date, invoice) for invoice in invoices
+                if invoice.balance_cents > 0 and invoice.maturity_date is not None
+            ),
+            key=lambda pair: pair[0],
+        )
+
+    def device(self, device_number: Optional[str]) -> Optional[MeterReading]:
+        """Return the device with this number, or the first one if no number is given."""
+        if device_number:
+            return self.devices.get(device_number)
+        return next(iter(self.devices.values()), None)
+
+    def device_type(self, device_number: Optional[str]) -> str:
+        """Return "electric" or "gas" for a device (gas if unknown)."""
+        if device_number:
+            device = self.devices.get(device_number)
+            return device.device_type if device else "gas"
+        return next((d.device_type for d in self.devices.values() if d.device_type == "electric"), "gas")
+
+    @property
+    def next_maturity(self) -> Optional[date]:
+        """Return the earliest maturity date of an invoice with an open balance."""
+        return self.invoices_by_maturity[0][0] if self.invoices_by_maturity else None
+
+
+def _maturity_label(maturity_date: Optional[date]) -> str:
+    """Format a maturity date the way the API sends it (dd.mm.YYYY)."""
+    return maturity_date.strftime("%d.%m.%Y") if maturity_date else "N/A"
+
+
+EMPTY_INDEX = ContractIndex()
+EMPTY_TOPOLOGY = ContractTopology()
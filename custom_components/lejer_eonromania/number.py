@@ -20,13 +20,14 @@
 """Number platform for E-ON Romania."""
 
 import logging
+from functools import partial
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, KEY_CONTRACTS
-from .entity import EonEntity
+from .const import DOMAIN
+from .entity import EonEntity, async_track_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,27 +35,27 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, asyn
     """Set up the E-ON Romania numbers."""
     data = hass.data[DOMAIN][config_entry.entry_id]
     coordinator = data["coordinator"]
-    
-    contracts_list = coordinator.data.get(KEY_CONTRACTS, [])
-    entities = []
-    
-    for contract in contracts_list:
-        cod_incasare = None
-        if "contractDetails" in contract:
-            cod_incasare = contract["contractDetails"].get("accountContract")
-        else:
-            cod_incasare = contract.get("contractId") or contract.get("accountContract")
 
-        if not cod_incasare:
-            continue
-            
-        entities.append(EonIndexInput(coordinator, config_entry, cod_incasare))
+    async_track_entities(
+        coordinator, config_entry, async_add_entities,
+        lambda known: _build_numbers(coordinator, config_entry),
+    )
+
 
-    async_add_entities(entities)
+def _build_numbers(coordinator, config_entry):
+    """Return a topology key and factory for each number the current coordinator data calls for."""
+    entities = {}
+    
+    for cod_incasare in coordinator.topology.codes:
+        entities[("indexinput", cod_incasare)] = partial(EonIndexInput, coordinator, config_entry, cod_incasare)
+
+    return entities
 
 class EonIndexInput(EonEntity, NumberEntity):
     """Number entity to input the index value."""
 
+    _data_keys = ()
+
     def __init__(self, coordinator, config_entry, cod_incasare):
         super().__init__(coordinator, config_entry, cod_incasare)
         self._attr_name = "Index de transmis"
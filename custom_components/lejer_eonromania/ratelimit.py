@@ -0,0 +1,188 @@
+#  Copyright (c) 2026 tbutiu
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""Client-side throttling for the E-ON Romania API."""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+from .const import (
+    BACKOFF_BASE, BACKOFF_MAX, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT,
+    DEFAULT_MAX_CONCURRENCY_PER_HOST, DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST,
+)
+
+# The rate is never lowered below this fraction of the configured one
+MIN_RATE_FACTOR = 0.1
+
+
+class TokenBucket:
+    """Token bucket limiting the request rate, adapting to throttling responses.
+
+    A throttling response halves the rate and blocks all requests until the
+    server's Retry-After; the rate then recovers a little with every success.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        # Waiters are served in order
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def throttle(self, delay: float) -> None:
+        """Back off after a 429: pause for delay seconds and halve the rate."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        self.rate = max(self.rate / 2, self.max_rate * MIN_RATE_FACTOR)
+        self._tokens = 0.0
+
+    def recover(self) -> None:
+        """Raise the rate back towards the configured one after a success."""
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * MIN_RATE_FACTOR)
+
+
+class CircuitBreaker:
+    """Stops calling an endpoint family after repeated failures.
+
+    Once open, requests fail fast until reset_timeout passes; then a single
+    trial request is let through and its outcome closes or reopens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._trial_in_flight or time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Return True if a request may be sent."""
+        if self.opened_at is None:
+            return True
+        if not self._trial_in_flight and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial_in_flight or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class RequestBudget:
+    """Request rate, parallel requests per host and endpoint circuits.
+
+    Every client drawing from the same budget shares these limits, so several
+    accounts together load the API no more than a single one may.
+    """
+
+    def __init__(
+        self,
+        max_concurrency_per_host: int = DEFAULT_MAX_CONCURRENCY_PER_HOST,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        rate_burst: int = DEFAULT_RATE_BURST,
+    ):
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.rate_limiter = TokenBucket(rate_limit, rate_burst)
+        self.host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # Endpoint family (first path segment) -> circuit breaker
+        self.circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+    def host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Return the semaphore limiting parallel requests to the host of url."""
+        host = urlsplit(url).netloc
+        if (semaphore := self.host_semaphores.get(host)) is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency_per_host)
+            self.host_semaphores[host] = semaphore
+        return semaphore
+
+    def circuit_breaker(self, url: str) -> CircuitBreaker:
+        """Return the circuit breaker of the endpoint family of url."""
+        family = endpoint_family(url)
+        if (breaker := self.circuit_breakers.get(family)) is None:
+            breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
+            self.circuit_breakers[family] = breaker
+        return breaker
+
+
+def endpoint_family(url: str) -> str:
+    """Return the endpoint family of a URL: the first segment of its path (e.g. "invoices")."""
+    return urlsplit(url).path.strip("/").split("/", 1)[0]
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_MAX) -> float:
+    """Return the delay before retry number attempt (0-based), with full jitter."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds from now."""
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
@@ -21,9 +21,10 @@
 
 import logging
 from datetime import datetime
-from collections import defaultdict
+from functools import partial
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.components.sensor import SensorEntity
@@ -34,9 +35,10 @@ from .const import (
     KEY_COMPARAREANUALAGRAFIC, KEY_ARHIVA, KEY_FACTURASOLD, 
     KEY_FACTURASOLD_PROSUM, KEY_USER_WALLET, KEY_RESCHEDULING_PLANS, 
     KEY_FACTURASOLD_PROSUM, KEY_USER_WALLET, KEY_RESCHEDULING_PLANS, 
-    KEY_PAYMENT_NOTICES, KEY_PAYMENTS, KEY_CONTRACTS
+    KEY_PAYMENT_NOTICES, KEY_PAYMENTS
 )
-from .entity import EonEntity
+from .entity import EonEntity, async_track_entities
+from .models import EMPTY_INDEX
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -44,95 +46,63 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, asyn
     """Set up the E-ON Romania sensors."""
     data = hass.data[DOMAIN][config_entry.entry_id]
     coordinator = data["coordinator"]
-    
-    contracts_list = coordinator.data.get(KEY_CONTRACTS, [])
-    # If contracts_list is empty, we might have no data yet or auth failed silently? 
-    # But coordinator should have run once.
-    
-    sensors = []
 
-    for contract in contracts_list:
-        cod_incasare = None
-        if "contractDetails" in contract:
-            cod_incasare = contract["contractDetails"].get("accountContract")
-        else:
-            cod_incasare = contract.get("contractId") or contract.get("accountContract")
-        if not cod_incasare:
-            continue
-            
+    async_track_entities(
+        coordinator, config_entry, async_add_entities,
+        lambda known: _build_sensors(coordinator, config_entry, known),
+    )
+
+
+def _build_sensors(coordinator, config_entry, known):
+    """Return a topology key and factory for each sensor the current coordinator data calls for.
+
+    Optional sensors appear once their data does, and are kept while their
+    contract exists even if the data becomes empty again.
+    """
+    codes = coordinator.topology.codes
+    sensors = {}
+
+    def add(key, sensor_class, *args, present=True):
+        if present or key in known:
+            sensors[key] = partial(sensor_class, coordinator, config_entry, *args)
+
+    for cod_incasare in codes:
         # Get data slice for this contract to check existence before creating sensors
         contract_data_slice = coordinator.data.get("data_per_contract", {}).get(cod_incasare, {})
-        
-        sensors.extend([
-            DateContractSensor(coordinator, config_entry, cod_incasare),
-            ConventieConsumSensor(coordinator, config_entry, cod_incasare),
-            FacturaRestantaSensor(coordinator, config_entry, cod_incasare),
-        ])
-
-        # Citire Index Data
-        citireindex_data = contract_data_slice.get(KEY_CITIREINDEX)
-        if citireindex_data:
-            devices = citireindex_data.get("indexDetails", {}).get("devices", [])
-            if devices:
-                seen_devices = set()
-                for device in devices:
-                    device_number = device.get("deviceNumber", "unknown")
-                    if device_number not in seen_devices:
-                        sensors.append(CitireIndexSensor(coordinator, config_entry, cod_incasare, device_number))
-                        sensors.append(CitirePermisaSensor(coordinator, config_entry, cod_incasare, device_number))
-                        seen_devices.add(device_number)
-            else:
-                 # Fallback if no devices found
-                 sensors.append(CitireIndexSensor(coordinator, config_entry, cod_incasare, None))
-                 sensors.append(CitirePermisaSensor(coordinator, config_entry, cod_incasare, None))
+
+        add(("datecontract", cod_incasare), DateContractSensor, cod_incasare)
+        add(("conventieconsum", cod_incasare), ConventieConsumSensor, cod_incasare)
+        add(("facturarestanta", cod_incasare), FacturaRestantaSensor, cod_incasare)
+
+        index = coordinator.contract_index.get(cod_incasare, EMPTY_INDEX)
+
+        # Citire Index Data - one sensor per meter, or a single one if no devices found.
+        # Without readings this time, the meters already known are kept.
+        if contract_data_slice.get(KEY_CITIREINDEX):
+            meters = list(index.devices) or [None]
+        else:
+            meters = [key[2] for key in known if key[:2] == ("citireindex", cod_incasare)]
+        for device_number in meters:
+            add(("citireindex", cod_incasare, device_number), CitireIndexSensor, cod_incasare, device_number)
+            add(("citirepermisa", cod_incasare, device_number), CitirePermisaSensor, cod_incasare, device_number)
 
         # Archive Data (History)
-        arhiva_data = contract_data_slice.get(KEY_ARHIVA)
-        if arhiva_data:
-            history_list = arhiva_data.get("history", [])
-            for item in history_list:
-                if year := item.get("year"):
-                    sensors.append(ArhivaSensor(coordinator, config_entry, cod_incasare, year))
+        for year in index.history_by_year:
+            add(("arhiva", cod_incasare, year), ArhivaSensor, cod_incasare, year)
 
         # Payments History
-        payments_data = contract_data_slice.get(KEY_PAYMENTS, {})
-        if isinstance(payments_data, list):
-             payments_list = payments_data
-        else:
-             payments_list = payments_data.get("list", []) if payments_data else []
-        
-        if payments_list:
-            payments_by_year = defaultdict(list)
-            for payment in payments_list:
-                if raw_date := payment.get("paymentDate"):
-                    try:
-                        year = int(raw_date.split("-")[0])
-                        payments_by_year[year].append(payment)
-                    except ValueError:
-                        continue
-            
-            for year in payments_by_year:
-                sensors.append(ArhivaPlatiSensor(coordinator, config_entry, cod_incasare, year))
+        for year in index.payments_by_year:
+            add(("arhivaplati", cod_incasare, year), ArhivaPlatiSensor, cod_incasare, year)
 
         # Annual Comparison
-        comp_data = contract_data_slice.get(KEY_COMPARAREANUALAGRAFIC, {})
-        if "consumption" in comp_data:
-            yearly_data = defaultdict(dict)
-            for item in comp_data["consumption"]:
-                year = item.get("year")
-                month = item.get("month")
-                if year and month:
-                    yearly_data[year][month] = {
-                        "consumptionValue": item.get("consumptionValue"),
-                        "consumptionValueDayValue": item.get("consumptionValueDayValue")
-                    }
-            
-            for year, monthly_values in yearly_data.items():
-                 sensors.append(ArhivaComparareConsumAnualGraficSensor(coordinator, config_entry, cod_incasare, year, monthly_values))
+        for year in index.consumption_by_year:
+            add(("comparareanual", cod_incasare, year), ArhivaComparareConsumAnualGraficSensor, cod_incasare, year)
 
         # Prosumer Balance
-        if contract_data_slice.get(KEY_FACTURASOLD_PROSUM):
-            sensors.append(EonInvoiceBalanceProsumSensor(coordinator, config_entry, cod_incasare))
+        add(
+            ("soldprosum", cod_incasare), EonInvoiceBalanceProsumSensor, cod_incasare,
+            present=bool(contract_data_slice.get(KEY_FACTURASOLD_PROSUM)),
+        )
 
         # Wallet - Wallet is per USER, not per contract, but we can treat it as global 
         # or attach to the first contract? Or attach to "Service" device. 
@@ -141,23 +111,39 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry, asyn
         # If I attach Wallet to every contract, I get duplicates.
         # I should probably attach Wallet ONLY to the first contract found OR create a separate "Account" device.
         # Simpler: Attach to the first contract only.
-        if contract == contracts_list[0] and (wallet := coordinator.data.get(KEY_USER_WALLET)) and wallet.get("balance") is not None:
-             sensors.append(EonUserWalletSensor(coordinator, config_entry, cod_incasare))
+        if cod_incasare == codes[0]:
+            wallet = coordinator.data.get(KEY_USER_WALLET)
+            add(
+                ("wallet", cod_incasare), EonUserWalletSensor, cod_incasare,
+                present=bool(wallet) and wallet.get("balance") is not None,
+            )
+
+        # Diagnostics - account level as well, attached to the first contract
+        if cod_incasare == codes[0]:
+            add(("apirequests", cod_incasare), EonApiRequestsSensor, cod_incasare)
+            add(("apilatency", cod_incasare), EonApiLatencySensor, cod_incasare)
+            add(("refreshduration", cod_incasare), EonRefreshDurationSensor, cod_incasare)
 
         # Rescheduling Plans
-        if contract_data_slice.get(KEY_RESCHEDULING_PLANS):
-            sensors.append(EonReschedulingPlanSensor(coordinator, config_entry, cod_incasare))
+        add(
+            ("reschedulingplans", cod_incasare), EonReschedulingPlanSensor, cod_incasare,
+            present=bool(contract_data_slice.get(KEY_RESCHEDULING_PLANS)),
+        )
 
         # Payment Notices
-        if contract_data_slice.get(KEY_PAYMENT_NOTICES):
-            sensors.append(EonPaymentNoticeSensor(coordinator, config_entry, cod_incasare))
+        add(
+            ("paymentnotices", cod_incasare), EonPaymentNoticeSensor, cod_incasare,
+            present=bool(contract_data_slice.get(KEY_PAYMENT_NOTICES)),
+        )
 
-    async_add_entities(sensors)
+    return sensors
 
 
 
 class DateContractSensor(EonEntity, SensorEntity):
     """Sensor for contract data."""
+
+    _data_keys = (KEY_DATEUSER,)
     
     def __init__(self, coordinator, config_entry, cod_incasare):
         super().__init__(coordinator, config_entry, cod_incasare)
@@ -201,6 +187,8 @@ class DateContractSensor(EonEntity, SensorEntity):
 class CitireIndexSensor(EonEntity, SensorEntity):
     """Sensor for current meter index."""
 
+    _data_keys = (KEY_CITIREINDEX,)
+
     def __init__(self, coordinator, config_entry, cod_incasare, device_number):
         super().__init__(coordinator, config_entry, cod_incasare)
         self.device_number = device_number
@@ -210,7 +198,7 @@ class CitireIndexSensor(EonEntity, SensorEntity):
         self._attr_state_class = "total_increasing"  # For Energy Dashboard
         
         # Determine device type (Gas vs Electric)
-        self._device_type = self._determine_device_type()
+        self._device_type = self.contract_index.device_type(device_number)
         if self._device_type == "electric":
             self._attr_device_class = "energy"
             self._attr_native_unit_of_measurement = "kWh"
@@ -220,78 +208,40 @@ class CitireIndexSensor(EonEntity, SensorEntity):
             self._attr_native_unit_of_measurement = "m³"
             self._attr_icon = "mdi:fire"
 
-    def _determine_device_type(self):
-        """Guess device type based on metadata."""
-        data = self.contract_data.get(KEY_CITIREINDEX)
-        if not data: return "gas" # default
-
-        devices = data.get("indexDetails", {}).get("devices", [])
-        for dev in devices:
-            if self.device_number and dev.get("deviceNumber") != self.device_number:
-                continue
-            
-            # Check for unit, series code, or description if available
-            # This is a heuristic; API exploration might be needed for precise field
-            # For now, default to gas unless we see "kWh" or specific flags
-            if dev.get("deviceType") == "ELECTRIC": 
-                return "electric"
-            
-            # Checking indexes for unit of measurement if available
-            indexes = dev.get("indexes", [])
-            for idx in indexes:
-                if idx.get("unit") == "KWH":
-                    return "electric"
-        
-        return "gas"
-
     @property
     def native_value(self):
-        data = self.contract_data.get(KEY_CITIREINDEX)
-        if not data: return None
-        
-        devices = data.get("indexDetails", {}).get("devices", [])
-        for dev in devices:
-            if self.device_number and dev.get("deviceNumber") != self.device_number:
-                continue
-            
-            indexes = dev.get("indexes", [])
-            if indexes:
-                return int(indexes[0].get("currentValue") or indexes[0].get("oldValue") or 0)
-        return None
+        dev = self.contract_index.device(self.device_number)
+        return dev.value if dev else None
 
     @property
     def extra_state_attributes(self):
-        data = self.contract_data.get(KEY_CITIREINDEX)
-        if not data: return {}
-
-        devices = data.get("indexDetails", {}).get("devices", [])
-        reading_period = data.get("readingPeriod", {})
-        
+        index = self.contract_index
+        dev = index.device(self.device_number)
         attrs = super().extra_state_attributes
-        for dev in devices:
-            if self.device_number and dev.get("deviceNumber") != self.device_number:
-                continue
-
-            if indexes := dev.get("indexes", []):
-                idx = indexes[0]
-                attrs.update({
-                    "Număr dispozitiv": dev.get("deviceNumber"),
-                    "Tip": self._device_type,
-                    "ID Citire": idx.get("ablbelnr"),
-                    "Start citire": reading_period.get("startDate"),
-                    "Final citire": reading_period.get("endDate"),
-                    "Permis citire": "Da" if reading_period.get("allowedReading") else "Nu",
-                    "Permis modificare": "Da" if reading_period.get("allowChange") else "Nu",
-                    "Index propus": idx.get("currentValue"),
-                    "Ultima citire": idx.get("oldValue"),
-                })
-                return attrs
+        # Devices without indexes have no reading to describe
+        if not dev or dev.value is None:
+            return attrs
+
+        readings = index.readings
+        attrs.update({
+            "Număr dispozitiv": dev.device_number,
+            "Tip": self._device_type,
+            "ID Citire": dev.ablbelnr,
+            "Start citire": readings.start_date,
+            "Final citire": readings.end_date,
+            "Permis citire": "Da" if readings.allowed_reading else "Nu",
+            "Permis modificare": "Da" if readings.allow_change else "Nu",
+            "Index propus": dev.current_value,
+            "Ultima citire": dev.old_value,
+        })
         return attrs
 
 
 class CitirePermisaSensor(EonEntity, SensorEntity):
     """Sensor indicating if reading submission is allowed."""
 
+    _data_keys = (KEY_CITIREINDEX,)
+
     def __init__(self, coordinator, config_entry, cod_incasare, device_number):
         super().__init__(coordinator, config_entry, cod_incasare)
         self.device_number = device_number
@@ -304,13 +254,14 @@ class CitirePermisaSensor(EonEntity, SensorEntity):
     def state(self):
         data = self.contract_data.get(KEY_CITIREINDEX)
         if not data: return "Indisponibil"
-        allowed = data.get("readingPeriod", {}).get("allowedReading")
-        return "Da" if allowed else "Nu"
+        return "Da" if data.allowed_reading else "Nu"
 
 
 class FacturaRestantaSensor(EonEntity, SensorEntity):
     """Sensor for unpaid invoices."""
 
+    _data_keys = (KEY_FACTURASOLD,)
+
     def __init__(self, coordinator, config_entry, cod_incasare):
         super().__init__(coordinator, config_entry, cod_incasare)
         self._attr_name = "Factură restantă"
@@ -320,37 +271,23 @@ class FacturaRestantaSensor(EonEntity, SensorEntity):
 
     @property
     def state(self):
-        data = self.contract_data.get(KEY_FACTURASOLD)
-        if not data or not isinstance(data, list):
-            return "Nu"
-        return "Da" if any(item.get("issuedValue", 0) > 0 for item in data) else "Nu"
+        return "Da" if self.contract_index.has_unpaid else "Nu"
 
     @property
     def extra_state_attributes(self):
-        data = self.contract_data.get(KEY_FACTURASOLD)
+        index = self.contract_index
         attrs = super().extra_state_attributes
-        if not data or not isinstance(data, list):
-            attrs["Total neachitat"] = "0.00 lei"
-            return attrs
-
-        total = 0.0
-        for i, item in enumerate(data, 1):
-            val = float(item.get("issuedValue", 0))
-            bal = float(item.get("balanceValue", 0))
-            display = val if val == bal else bal
-            
-            if display > 0:
-                total += display
-                due_date = item.get("maturityDate", "N/A")
-                attrs[f"Factură {i}"] = f"{display:.2f} lei (Scadentă: {due_date})"
-
-        attrs["Total neachitat"] = f"{total:.2f} lei"
+        for i, display, due_date in index.unpaid_lines:
+            attrs[f"Factură {i}"] = f"{display:.2f} lei (Scadentă: {due_date})"
+        attrs["Total neachitat"] = f"{index.unpaid_total:.2f} lei"
         return attrs
 
 
 class ConventieConsumSensor(EonEntity, SensorEntity):
     """Sensor for consumption convention."""
 
+    _data_keys = (KEY_CONVENTIECONSUM,)
+
     def __init__(self, coordinator, config_entry, cod_incasare):
         super().__init__(coordinator, config_entry, cod_incasare)
         self._attr_name = "Convenție consum"
@@ -399,6 +336,8 @@ class ConventieConsumSensor(EonEntity, SensorEntity):
 class ArhivaSensor(EonEntity, SensorEntity):
     """Sensor for archive data by year."""
 
+    _data_keys = (KEY_ARHIVA,)
+
     def __init__(self, coordinator, config_entry, cod_incasare, year):
         super().__init__(coordinator, config_entry, cod_incasare)
         self._year = year
@@ -409,18 +348,18 @@ class ArhivaSensor(EonEntity, SensorEntity):
 
     @property
     def state(self):
-        data = self.contract_data.get(KEY_ARHIVA, {})
-        for y in data.get("history", []):
-            if y.get("year") == self._year:
-                if meters := y.get("meters", []):
-                    if indexes := meters[0].get("indexes", []):
-                        return len(indexes[0].get("readings", []))
+        if y := self.contract_index.history_by_year.get(self._year):
+            if meters := y.get("meters", []):
+                if indexes := meters[0].get("indexes", []):
+                    return len(indexes[0].get("readings", []))
         return 0
 
 
 class ArhivaPlatiSensor(EonEntity, SensorEntity):
     """Sensor for payment history by year."""
 
+    _data_keys = (KEY_PAYMENTS,)
+
     def __init__(self, coordinator, config_entry, cod_incasare, year):
         super().__init__(coordinator, config_entry, cod_incasare)
         self._year = year
@@ -434,28 +373,29 @@ class ArhivaPlatiSensor(EonEntity, SensorEntity):
         return len(self._get_payments())
 
     def _get_payments(self):
-        data = self.contract_data.get(KEY_PAYMENTS, {})
-        if not data: return []
-        payments = data.get("list", [])
-        return [p for p in payments
-                if p.get("paymentDate", "").startswith(str(self._year))]
+        return self.contract_index.payments_by_year.get(self._year, [])
 
 
 class ArhivaComparareConsumAnualGraficSensor(EonEntity, SensorEntity):
     """Sensor for annual consumption comparison."""
+
+    _data_keys = (KEY_COMPARAREANUALAGRAFIC,)
     
-    def __init__(self, coordinator, config_entry, cod_incasare, year, monthly_values):
+    def __init__(self, coordinator, config_entry, cod_incasare, year):
         super().__init__(coordinator, config_entry, cod_incasare)
         self._year = year
-        self._monthly_values = monthly_values
         self._attr_name = f"Arhivă consum - {year}"
         self._attr_unique_id = f"{DOMAIN}_arhiva_consum_{config_entry.entry_id}_{cod_incasare}_{year}"
         self._attr_entity_id = f"sensor.{DOMAIN}_arhiva_consum_{cod_incasare}_{year}"
         self._attr_icon = "mdi:chart-bar"
 
+    @property
+    def _monthly_values(self):
+        return self.contract_index.consumption_by_year.get(self._year, {})
+
     @property
     def state(self):
-        return sum(v["consumptionValue"] for v in self._monthly_values.values())
+        return sum(v["consumptionValue"] or 0 for v in self._monthly_values.values())
 
     @property
     def extra_state_attributes(self):
@@ -468,6 +408,8 @@ class ArhivaComparareConsumAnualGraficSensor(EonEntity, SensorEntity):
 
 class EonInvoiceBalanceProsumSensor(EonEntity, SensorEntity):
     """Sensor for Prosumer Balance."""
+
+    _data_keys = (KEY_FACTURASOLD_PROSUM,)
     
     def __init__(self, coordinator, config_entry, cod_incasare):
         super().__init__(coordinator, config_entry, cod_incasare)
@@ -486,6 +428,8 @@ class EonInvoiceBalanceProsumSensor(EonEntity, SensorEntity):
 class EonUserWalletSensor(EonEntity, SensorEntity):
     """Sensor for User Wallet."""
 
+    _data_keys = (KEY_USER_WALLET,)
+
     def __init__(self, coordinator, config_entry, cod_incasare):
         super().__init__(coordinator, config_entry, cod_incasare)
         # Note: Wallet might be global but we attach it here for entity structure.
@@ -520,6 +464,8 @@ class EonUserWalletSensor(EonEntity, SensorEntity):
 
 class EonReschedulingPlanSensor(EonEntity, SensorEntity):
     """Sensor for Rescheduling Plans."""
+
+    _data_keys = (KEY_RESCHEDULING_PLANS,)
     
     def __init__(self, coordinator, config_entry, cod_incasare):
         super().__init__(coordinator, config_entry, cod_incasare)
@@ -537,6 +483,8 @@ class EonReschedulingPlanSensor(EonEntity, SensorEntity):
 class EonPaymentNoticeSensor(EonEntity, SensorEntity):
     """Sensor for Payment Notices."""
 
+    _data_keys = (KEY_PAYMENT_NOTICES,)
+
     def __init__(self, coordinator, config_entry, cod_incasare):
         super().__init__(coordinator, config_entry, cod_incasare)
         self._attr_name = "Notificări de plată"
@@ -548,3 +496,94 @@ class EonPaymentNoticeSensor(EonEntity, SensorEntity):
     def state(self):
         data = self.contract_data.get(KEY_PAYMENT_NOTICES, [])
         return len(data) if data else 0
+
+
+class EonApiRequestsSensor(EonEntity, SensorEntity):
+    """Diagnostic sensor counting API requests."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, config_entry, cod_incasare):
+        super().__init__(coordinator, config_entry, cod_incasare)
+        self._attr_name = "Cereri API"
+        self._attr_unique_id = f"{DOMAIN}_api_requests_{config_entry.entry_id}"
+        self._attr_entity_id = f"sensor.{DOMAIN}_api_requests_{cod_incasare}"
+        self._attr_icon = "mdi:api"
+
+    @property
+    def state(self):
+        return self.coordinator.api_client.metrics.total_requests
+
+    @property
+    def extra_state_attributes(self):
+        attrs = super().extra_state_attributes
+        metrics = self.coordinator.api_client.metrics
+        attrs["Erori"] = metrics.total_errors
+        attrs["Autentificări"] = metrics.logins
+        attrs["Circuite"] = self.coordinator.api_client.circuit_states
+        for name, stats in sorted(metrics.endpoints.items()):
+            attrs[name] = (
+                f"{stats.requests} cereri, {stats.errors} erori, {stats.unauthorized} x 401, "
+                f"{stats.retries} reîncercări, {stats.throttled} x 429, {stats.bytes_received} octeți"
+            )
+        return attrs
+
+
+class EonApiLatencySensor(EonEntity, SensorEntity):
+    """Diagnostic sensor for the average API latency."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, config_entry, cod_incasare):
+        super().__init__(coordinator, config_entry, cod_incasare)
+        self._attr_name = "Latență API"
+        self._attr_unique_id = f"{DOMAIN}_api_latency_{config_entry.entry_id}"
+        self._attr_entity_id = f"sensor.{DOMAIN}_api_latency_{cod_incasare}"
+        self._attr_icon = "mdi:timer-outline"
+
+    @property
+    def state(self):
+        latency = self.coordinator.api_client.metrics.latency_avg
+        return round(latency * 1000) if latency is not None else None
+
+    @property
+    def unit_of_measurement(self):
+        return "ms"
+
+    @property
+    def extra_state_attributes(self):
+        attrs = super().extra_state_attributes
+        for name, stats in sorted(self.coordinator.api_client.metrics.endpoints.items()):
+            if stats.requests:
+                attrs[name] = f"medie {stats.latency_avg * 1000:.0f} ms, maxim {stats.latency_max * 1000:.0f} ms"
+        return attrs
+
+
+class EonRefreshDurationSensor(EonEntity, SensorEntity):
+    """Diagnostic sensor for the duration of the last refresh."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, config_entry, cod_incasare):
+        super().__init__(coordinator, config_entry, cod_incasare)
+        self._attr_name = "Durată actualizare"
+        self._attr_unique_id = f"{DOMAIN}_refresh_duration_{config_entry.entry_id}"
+        self._attr_entity_id = f"sensor.{DOMAIN}_refresh_duration_{cod_incasare}"
+        self._attr_icon = "mdi:timer-sync-outline"
+
+    @property
+    def state(self):
+        total = self.coordinator.refresh_timings.get("total")
+        return round(total, 2) if total is not None else None
+
+    @property
+    def unit_of_measurement(self):
+        return "s"
+
+    @property
+    def extra_state_attributes(self):
+        attrs = super().extra_state_attributes
+        for phase, duration in self.coordinator.refresh_timings.items():
+            attrs[f"Etapa {phase}"] = f"{duration:.2f} s"
+        attrs["Actualizări"] = self.coordinator.refresh_count
+        return attrs
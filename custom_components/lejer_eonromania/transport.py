@@ -0,0 +1,54 @@
+#  Copyright (c) 2026 tbutiu
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""HTTP transport dedicated to the E-ON Romania API."""
+
+from aiohttp import ClientSession, TCPConnector
+
+from .const import (
+    HEADERS_POST, DEFAULT_POOL_LIMIT_PER_HOST, DEFAULT_KEEPALIVE_TIMEOUT, DEFAULT_DNS_TTL,
+)
+
+try:
+    from aiohttp.compression_utils import HAS_BROTLI
+except ImportError:  # older aiohttp
+    HAS_BROTLI = False
+
+# Brotli is only offered when aiohttp can decode it
+ACCEPT_ENCODING = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+REQUEST_HEADERS = {**HEADERS_POST, "Accept-Encoding": ACCEPT_ENCODING}
+
+
+def create_session(
+    limit_per_host: int = DEFAULT_POOL_LIMIT_PER_HOST,
+    keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+    dns_ttl: int = DEFAULT_DNS_TTL,
+) -> ClientSession:
+    """Return a session with its own connection pool, tuned for a single API host.
+
+    Must be called from the event loop; the caller owns the session and closes it.
+    """
+    connector = TCPConnector(
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keepalive_timeout,
+        ttl_dns_cache=dns_ttl,
+        use_dns_cache=True,
+    )
+    return ClientSession(connector=connector)
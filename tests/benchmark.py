@@ -0,0 +1,205 @@
+#  Copyright (c) 2026 tbutiu
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""Offline benchmark of EonApiClient and EonRomaniaCoordinator.
+
+Runs against the local mock server in mock_eon_server.py, so no credentials or
+network access are needed:
+
+    python tests/benchmark.py --contracts 20 --latency 0.05 --payment-pages 5
+
+Each scenario reports wall time, request count, bytes served and peak memory.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Mock HA modules before importing custom_components
+def mock_module(name, pkg=False):
+    m = MagicMock()
+    if pkg:
+        m.__path__ = []
+    sys.modules[name] = m
+    return m
+
+if "homeassistant" not in sys.modules:
+    mock_module("homeassistant", pkg=True)
+    mock_module("homeassistant.config_entries")
+    mock_module("homeassistant.core")
+    mock_module("homeassistant.helpers", pkg=True)
+    mock_module("homeassistant.helpers.aiohttp_client")
+    mock_module("homeassistant.helpers.config_validation")
+    mock_module("homeassistant.helpers.update_coordinator")
+    mock_module("homeassistant.helpers.entity")
+    mock_module("homeassistant.helpers.entity_platform")
+    mock_module("homeassistant.helpers.typing")
+    mock_module("homeassistant.helpers.discovery")
+    mock_module("homeassistant.helpers.service")
+    mock_module("homeassistant.helpers.device_registry")
+    mock_module("homeassistant.helpers.entity_registry")
+    mock_module("homeassistant.helpers.area_registry")
+    mock_module("homeassistant.helpers.issue_registry")
+    mock_module("homeassistant.helpers.storage")
+    mock_module("homeassistant.helpers.event")
+    mock_module("homeassistant.const")
+    mock_module("homeassistant.exceptions")
+    mock_module("homeassistant.components", pkg=True)
+    mock_module("homeassistant.components.sensor")
+    mock_module("homeassistant.components.binary_sensor")
+    mock_module("homeassistant.components.button")
+    mock_module("homeassistant.util", pkg=True)
+
+    class MockClass:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    sys.modules["homeassistant.helpers.update_coordinator"].DataUpdateCoordinator = MockClass
+    sys.modules["homeassistant.helpers.update_coordinator"].CoordinatorEntity = MockClass
+    sys.modules["homeassistant.components.sensor"].SensorEntity = MockClass
+    sys.modules["homeassistant.components.binary_sensor"].BinarySensorEntity = MockClass
+    sys.modules["homeassistant.components.button"].ButtonEntity = MockClass
+    sys.modules["homeassistant.helpers.entity"].Entity = MockClass
+    sys.modules["homeassistant.core"].callback = lambda func: func
+    sys.modules["homeassistant.core"].HomeAssistant = MockClass
+
+import asyncio
+
+import aiohttp
+
+from custom_components.lejer_eonromania import api as api_module
+from custom_components.lejer_eonromania.api import EonApiClient
+from custom_components.lejer_eonromania.const import DEFAULT_RATE_LIMIT
+from custom_components.lejer_eonromania.coordinator import EonRomaniaCoordinator
+from mock_eon_server import MockEonConfig, MockEonServer
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of one benchmark scenario."""
+
+    name: str
+    wall_time: float
+    requests: int
+    bytes_sent: int
+    logins: int
+    unauthorized: int
+    not_modified: int
+    peak_memory: int
+
+    def format(self) -> str:
+        return (
+            f"{self.name:<24} {self.wall_time * 1000:9.1f} ms {self.requests:6d} req "
+            f"{self.bytes_sent / 1024:9.1f} KiB {self.peak_memory / 1024:9.1f} KiB peak "
+            f"(logins={self.logins}, 401={self.unauthorized}, 304={self.not_modified})"
+        )
+
+
+async def _measure(name: str, server: MockEonServer, scenario) -> BenchmarkResult:
+    """Run scenario() and return the server counters accumulated while it ran."""
+    stats = server.stats
+    before = (stats.requests, stats.bytes_sent, stats.logins, stats.unauthorized, stats.not_modified)
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        await scenario()
+        wall_time = time.perf_counter() - started
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    after = (stats.requests, stats.bytes_sent, stats.logins, stats.unauthorized, stats.not_modified)
+    requests, bytes_sent, logins, unauthorized, not_modified = (a - b for a, b in zip(after, before))
+    return BenchmarkResult(name, wall_time, requests, bytes_sent, logins, unauthorized, not_modified, peak_memory)
+
+
+async def run_benchmark(
+    config: MockEonConfig,
+    max_concurrency: int = 8,
+    update_interval: int = 3600,
+    rate_limit: float = DEFAULT_RATE_LIMIT,
+):
+    """Run the client and coordinator scenarios against a fresh mock server."""
+    results = []
+    async with MockEonServer(config) as server, aiohttp.ClientSession() as session:
+        with patch.dict(api_module.URLS, server.urls()):
+            api_client = EonApiClient(
+                session, "bench@example.com", "secret",
+                max_concurrency_per_host=max_concurrency, rate_limit=rate_limit,
+            )
+            cod = server.contract_ids[0]
+
+            async def single_contract():
+                await api_client.async_login()
+                await asyncio.gather(
+                    api_client.async_fetch_dateuser_data(cod),
+                    api_client.async_fetch_citireindex_data(cod),
+                    api_client.async_fetch_arhiva_data(cod),
+                    api_client.async_fetch_facturasold_data(cod),
+                    api_client.async_fetch_payments_data(cod),
+                )
+
+            results.append(await _measure("client_single_contract", server, single_contract))
+
+            coordinator = EonRomaniaCoordinator(
+                MagicMock(), api_client, update_interval=update_interval, max_concurrency=max_concurrency
+            )
+            coordinator.data = None
+            coordinator.async_update_listeners = lambda: None
+
+            async def refresh():
+                coordinator.data = await coordinator._async_update_data()
+
+            results.append(await _measure("coordinator_cold", server, refresh))
+            results.append(await _measure("coordinator_warm", server, refresh))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contracts", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds added to each response")
+    parser.add_argument("--payment-pages", type=int, default=3)
+    parser.add_argument("--payments-per-page", type=int, default=10)
+    parser.add_argument("--expire-token-every", type=int, default=0, help="inject 401s after N requests")
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument("--rate-limit", type=float, default=DEFAULT_RATE_LIMIT, help="client requests per second")
+    args = parser.parse_args(argv)
+
+    config = MockEonConfig(
+        contracts=args.contracts,
+        latency=args.latency,
+        payment_pages=args.payment_pages,
+        payments_per_page=args.payments_per_page,
+        expire_token_every=args.expire_token_every,
+    )
+    for result in asyncio.run(run_benchmark(
+        config, max_concurrency=args.max_concurrency, rate_limit=args.rate_limit
+    )):
+        print(result.format())
+
+
+if __name__ == "__main__":
+    main()
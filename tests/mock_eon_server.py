@@ -0,0 +1,252 @@
+#  Copyright (c) 2026 tbutiu
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+"""Local stand-in for api2.eon.ro, serving every route in const.URLS.
+
+The server generates deterministic payloads for a configurable number of
+contracts and can add latency, deepen the payments pagination and expire
+tokens to inject 401 responses. It counts requests and bytes per endpoint.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from aiohttp import web
+
+from custom_components.lejer_eonromania.const import BASE_URL, URLS
+
+POST_ENDPOINTS = {"login", "trimite_index"}
+FAKE_PDF = b"%PDF-1.4\n" + b"0" * 2048 + b"\n%%EOF\n"
+
+
+@dataclass
+class MockEonConfig:
+    """Knobs of the mock server."""
+
+    contracts: int = 2
+    # Seconds added to every response
+    latency: float = 0.0
+    payment_pages: int = 3
+    payments_per_page: int = 10
+    # Paid and prosumer invoice lists announce totalPages, payments only hasNext
+    invoice_pages: int = 2
+    invoices_per_page: int = 5
+    # Invalidate all issued tokens after this many authenticated requests (0 = never)
+    expire_token_every: int = 0
+    token_lifetime: int = 3600
+
+
+@dataclass
+class MockEonStats:
+    """Counters collected by the mock server."""
+
+    requests: int = 0
+    bytes_sent: int = 0
+    logins: int = 0
+    unauthorized: int = 0
+    not_modified: int = 0
+    compressed: int = 0
+    per_endpoint: Counter = field(default_factory=Counter)
+
+
+def _route_path(url: str) -> str:
+    """Return the aiohttp route path of a URLS template (query string removed)."""
+    return urlsplit(url.split("?", 1)[0]).path
+
+
+class MockEonServer:
+    """aiohttp application mimicking the E-ON API."""
+
+    def __init__(self, config: Optional[MockEonConfig] = None):
+        self.config = config or MockEonConfig()
+        self.stats = MockEonStats()
+        self._valid_tokens = set()
+        self._authenticated_requests = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url: Optional[str] = None
+
+        self.app = web.Application()
+        registered = set()
+        # Static paths first, so e.g. list-with-subcontracts is not taken for a {cod_incasare}
+        for name, url in sorted(URLS.items(), key=lambda item: "{" in _route_path(item[1])):
+            method = "POST" if name in POST_ENDPOINTS else "GET"
+            path = _route_path(url)
+            if (method, path) in registered:
+                continue
+            registered.add((method, path))
+            self.app.router.add_route(method, path, self._make_handler(name))
+
+    @property
+    def contract_ids(self):
+        return [f"{i + 1:012d}" for i in range(self.config.contracts)]
+
+    def urls(self) -> Dict[str, str]:
+        """Return const.URLS pointed at this server."""
+        return {name: url.replace(BASE_URL, self.base_url) for name, url in URLS.items()}
+
+    async def start(self) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    def _make_handler(self, name: str):
+        async def handler(request: web.Request) -> web.StreamResponse:
+            if self.config.latency:
+                await asyncio.sleep(self.config.latency)
+            self.stats.requests += 1
+            self.stats.per_endpoint[name] += 1
+
+            if name == "login":
+                return self._respond(request, await self._login(request), conditional=False)
+
+            if not self._authorized(request):
+                self.stats.unauthorized += 1
+                return self._count(web.json_response({"error": "unauthorized"}, status=401))
+
+            if name == "download_invoice":
+                # Invoice numbers starting with HTML get an error page, as a misbehaving gateway would send
+                if request.match_info["invoice_number"].startswith("HTML"):
+                    return self._count(web.Response(text="<html>maintenance</html>", content_type="text/html"))
+                return self._count(web.Response(body=FAKE_PDF, content_type="application/pdf"))
+            return self._respond(request, self._payload(name, request))
+
+        return handler
+
+    async def _login(self, request: web.Request) -> dict:
+        self.stats.logins += 1
+        claims = {"exp": int(time.time()) + self.config.token_lifetime, "n": self.stats.logins}
+        encoded = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+        token = f"header.{encoded}.signature"
+        self._valid_tokens.add(token)
+        return {"accessToken": token, "expiresIn": self.config.token_lifetime}
+
+    def _authorized(self, request: web.Request) -> bool:
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if token not in self._valid_tokens:
+            return False
+        self._authenticated_requests += 1
+        every = self.config.expire_token_every
+        if every and self._authenticated_requests % every == 0:
+            self._valid_tokens.clear()
+        return True
+
+    def _respond(self, request: web.Request, payload, conditional: bool = True) -> web.Response:
+        body = json.dumps(payload).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        if conditional and request.headers.get("If-None-Match") == etag:
+            self.stats.not_modified += 1
+            return self._count(web.Response(status=304, headers={"ETag": etag}))
+        headers = {"ETag": etag} if conditional else None
+        response = web.Response(body=body, content_type="application/json", headers=headers)
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            self.stats.compressed += 1
+            response.enable_compression()
+        return self._count(response)
+
+    def _count(self, response: web.Response) -> web.Response:
+        self.stats.bytes_sent += len(response.body or b"")
+        return response
+
+    def _payload(self, name: str, request: web.Request):
+        cod = request.match_info.get("cod_incasare") or request.query.get("accountContract", "")
+        seed = int(cod) if cod.isdigit() else 0
+
+        if name == "account_contracts_list":
+            return [{"contractDetails": {"accountContract": cod_id}} for cod_id in self.contract_ids]
+        if name == "user_wallet":
+            return {"balance": 0, "unallocatedAmount": 0, "updatedAt": "2026-01-01"}
+        if name == "unread_messages":
+            return {"count": 0}
+        if name == "current_date":
+            return {"date": "2026-01-01"}
+        if name == "dateuser":
+            return {
+                "accountContract": cod,
+                "consumptionPointCode": f"NLC{seed}",
+                "productType": "E.ON GAS",
+                "consumptionPointAddress": {"locality": {"localityName": "Cluj"}},
+                "supplierAndDistributionPrice": {"contractualPrice": 0.3, "priceComponents": {}},
+            }
+        if name == "citireindex":
+            return {
+                "readingPeriod": {"startDate": "2026-01-20", "endDate": "2026-01-28", "allowedReading": True},
+                "indexDetails": {"devices": [{
+                    "deviceNumber": f"DEV{seed}",
+                    "indexes": [{"ablbelnr": f"ABL{seed}", "currentValue": 1000 + seed, "oldValue": 900}],
+                }]},
+            }
+        if name == "conventieconsum":
+            return [{"conventionLine": {f"valueMonth{m}": 50 for m in range(1, 13)}}]
+        if name == "comparareanualagrafic":
+            return {"consumption": [
+                {"year": year, "month": month, "consumptionValue": 40 + month, "consumptionValueDayValue": 1}
+                for year in (2024, 2025) for month in range(1, 13)
+            ]}
+        if name == "arhiva":
+            return {"history": [
+                {"year": year, "meters": [{"indexes": [{"readings": [{"value": v} for v in range(12)]}]}]}
+                for year in (2023, 2024, 2025)
+            ]}
+        if name in ("facturasold", "invoices_list_unpaid"):
+            return [{"invoiceNumber": f"INV{seed}", "issuedValue": 120.5, "balanceValue": 120.5, "maturityDate": "15.02.2026"}]
+        if name in ("invoices_list_paid", "invoices_list_prosum"):
+            page = int(request.query.get("page", 1))
+            per_page = self.config.invoices_per_page
+            return {
+                "list": [
+                    {"invoiceNumber": f"{name[14:].upper()}{seed}-{(page - 1) * per_page + i}", "issueDate": "2025-12-01"}
+                    for i in range(per_page)
+                ],
+                "totalPages": self.config.invoice_pages,
+                "hasNext": page < self.config.invoice_pages,
+            }
+        if name == "payments_list":
+            page = int(request.query.get("page", 1))
+            per_page = self.config.payments_per_page
+            return {
+                "list": [
+                    {"paymentDate": f"{2026 - (page * per_page + i) // 12}-{12 - (page * per_page + i) % 12:02d}-01", "value": 100 + i, "cod": cod}
+                    for i in range(per_page)
+                ],
+                "hasNext": page < self.config.payment_pages,
+            }
+        return []
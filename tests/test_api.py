@@ -0,0 +1,779 @@
+#  Copyright (c) 2026 tbutiu
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+# Mock HA modules before importing custom_components
+def mock_module(name, pkg=False):
+    m = MagicMock()
+    if pkg:
+        m.__path__ = []
+    sys.modules[name] = m
+    return m
+
+mock_module("homeassistant", pkg=True)
+mock_module("homeassistant.config_entries")
+mock_module("homeassistant.core")
+mock_module("homeassistant.helpers", pkg=True)
+mock_module("homeassistant.helpers.aiohttp_client")
+mock_module("homeassistant.helpers.config_validation")
+mock_module("homeassistant.helpers.update_coordinator")
+mock_module("homeassistant.helpers.entity")
+mock_module("homeassistant.helpers.entity_platform")
+mock_module("homeassistant.helpers.typing")
+mock_module("homeassistant.helpers.discovery")
+mock_module("homeassistant.helpers.service")
+mock_module("homeassistant.helpers.device_registry")
+mock_module("homeassistant.helpers.entity_registry")
+mock_module("homeassistant.helpers.area_registry")
+mock_module("homeassistant.helpers.issue_registry")
+mock_module("homeassistant.helpers.storage")
+mock_module("homeassistant.helpers.event")
+mock_module("homeassistant.const")
+mock_module("homeassistant.exceptions")
+mock_module("homeassistant.components", pkg=True)
+mock_module("homeassistant.components.sensor")
+mock_module("homeassistant.components.binary_sensor")
+mock_module("homeassistant.components.button")
+mock_module("homeassistant.util", pkg=True)
+
+# Fix inheritance
+class MockClass:
+    def __init__(self, *args, **kwargs):
+        pass
+
+sys.modules["homeassistant.helpers.update_coordinator"].DataUpdateCoordinator = MockClass
+sys.modules["homeassistant.helpers.update_coordinator"].CoordinatorEntity = MockClass
+sys.modules["homeassistant.components.sensor"].SensorEntity = MockClass
+sys.modules["homeassistant.components.binary_sensor"].BinarySensorEntity = MockClass
+sys.modules["homeassistant.components.button"].ButtonEntity = MockClass
+sys.modules["homeassistant.helpers.entity"].Entity = MockClass
+sys.modules["homeassistant.core"].callback = lambda func: func
+sys.modules["homeassistant.core"].HomeAssistant = MockClass
+
+import asyncio
+import base64
+import hashlib
+from decimal import Decimal
+import os
+import json
+import time
+
+import pytest
+from custom_components.lejer_eonromania.api import (
+    EonApiClient, IndexReadings, Invoice, Payment, records_as_json, records_from_json, token_expiry,
+)
+from custom_components.lejer_eonromania.const import URLS
+from custom_components.lejer_eonromania.metrics import endpoint_name
+from custom_components.lejer_eonromania.ratelimit import CircuitBreaker, RequestBudget, TokenBucket, retry_after
+
+MOCK_CONTRACT = "0001111111"
+
+
+def make_payment(day, amount=100):
+    return {"paymentDate": f"2026-01-{day:02d}", "value": amount}
+
+
+class FakePaymentsApi(EonApiClient):
+    """EonApiClient serving payments_list pages from memory."""
+
+    def __init__(self, pages):
+        super().__init__(MagicMock(), "user", "pass")
+        self._token = "token"
+        self.pages = pages
+        self.requested_pages = []
+
+    async def _do_request(self, method, url, json_data=None, **kwargs):
+        page = int(url.rsplit("page=", 1)[1])
+        self.requested_pages.append(page)
+        return {"list": self.pages[page - 1], "hasNext": page < len(self.pages)}, 200
+
+
+@pytest.mark.asyncio
+async def test_payments_full_sync_walks_every_page():
+    """Without local history every page is fetched."""
+    api = FakePaymentsApi([[make_payment(5), make_payment(4)], [make_payment(3)]])
+
+    payments = await api.async_fetch_payments_data(MOCK_CONTRACT)
+
+    assert api.requested_pages == [1, 2]
+    assert [p.payment_date.day for p in payments] == [5, 4, 3]
+
+
+@pytest.mark.asyncio
+async def test_payments_incremental_sync_stops_at_known_records():
+    """With local history only the pages holding new records are fetched."""
+    known = [Payment.from_api(make_payment(day)) for day in (4, 3, 2, 1)]
+    api = FakePaymentsApi([
+        [make_payment(6), make_payment(5)],
+        [make_payment(4), make_payment(3)],
+        [make_payment(2), make_payment(1)],
+    ])
+
+    payments = await api.async_fetch_payments_data(MOCK_CONTRACT, known=known)
+
+    assert api.requested_pages == [1, 2]
+    assert [p.payment_date.day for p in payments] == [6, 5, 4, 3, 2, 1]
+    assert payments[2:] == known
+
+
+class FakeAuthApi(EonApiClient):
+    """EonApiClient whose server only accepts the most recently issued token."""
+
+    def __init__(self):
+        super().__init__(MagicMock(), "user", "pass")
+        self._token = "expired"
+        self.logins = 0
+
+    async def async_login(self):
+        self.logins += 1
+        await asyncio.sleep(0.01)
+        self._token = f"token-{self.logins}"
+        return True
+
+    async def _do_request(self, method, url, json_data=None, **kwargs):
+        await asyncio.sleep(0)
+        if self._token != f"token-{self.logins}":
+            return None, 401
+        return {"ok": True}, 200
+
+
+@pytest.mark.asyncio
+async def test_concurrent_401s_trigger_a_single_login():
+    """Concurrent requests hitting an expired token share one re-authentication."""
+    api = FakeAuthApi()
+
+    results = await asyncio.gather(*(api.async_fetch_user_wallet() for _ in range(10)))
+
+    assert api.logins == 1
+    assert results == [{"ok": True}] * 10
+
+
+@pytest.mark.asyncio
+async def test_token_is_renewed_before_expiry():
+    """A token about to expire is renewed before the request instead of after a 401."""
+    api = FakeAuthApi()
+    api.logins = 1
+    api._token = "token-1"
+    api._token_expires_at = time.time() + 10
+
+    assert await api.async_fetch_user_wallet() == {"ok": True}
+    assert api.logins == 2
+
+
+def test_token_expiry_from_jwt():
+    """The expiry is read from the JWT exp claim when expiresIn is missing."""
+    claims = base64.urlsafe_b64encode(json.dumps({"exp": 1893456000}).encode()).decode().rstrip("=")
+    assert token_expiry({"accessToken": f"header.{claims}.signature"}) == 1893456000
+    assert token_expiry({"accessToken": "opaque"}) is None
+
+
+def test_restore_session_reuses_only_valid_tokens():
+    """A persisted token is reused on startup only while it is valid."""
+    api = EonApiClient(MagicMock(), "user", "pass")
+
+    assert api.restore_session({"access_token": "old", "expires_at": time.time() - 1}) is False
+    assert api.session is None
+
+    expires_at = time.time() + 3600
+    assert api.restore_session({"access_token": "saved", "expires_at": expires_at}) is True
+    assert api.session == {"access_token": "saved", "expires_at": expires_at}
+
+
+class FakeResponse:
+    """Minimal aiohttp response used as an async context manager."""
+
+    def __init__(self, status, body=b"", headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return self.body
+
+    async def json(self):
+        return json.loads(self.body)
+
+    async def text(self):
+        return self.body.decode()
+
+
+class FakeSession:
+    """Session returning queued responses and recording request headers."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent_headers = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.sent_headers.append(headers)
+        return self.responses.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_reuses_cached_object():
+    """ETag validators are sent back and a 304 returns the previously parsed object."""
+    body = json.dumps({"history": [{"year": 2025}]}).encode()
+    session = FakeSession([
+        FakeResponse(200, body, {"ETag": '"v1"'}),
+        FakeResponse(304),
+        FakeResponse(200, body),
+    ])
+    api = EonApiClient(session, "user", "pass")
+    api._token = "token"
+
+    first = await api.async_fetch_arhiva_data(MOCK_CONTRACT)
+    second = await api.async_fetch_arhiva_data(MOCK_CONTRACT)
+    # Without validators an identical body is detected by its hash
+    third = await api.async_fetch_arhiva_data(MOCK_CONTRACT)
+
+    assert first == {"history": [{"year": 2025}]}
+    assert second is first
+    assert third is first
+    assert "If-None-Match" not in session.sent_headers[0]
+    assert session.sent_headers[1]["If-None-Match"] == '"v1"'
+
+
+def test_codec_decodes_json_or_text_and_sorts_keys():
+    from custom_components.lejer_eonromania.codec import decode_body, dumps_sorted, loads
+
+    assert decode_body(b'{"history": [{"year": 2025}]}') == {"history": [{"year": 2025}]}
+    assert decode_body(b"<html>maintenance</html>") == "<html>maintenance</html>"
+    # Non-string keys and values the JSON types do not cover still hash
+    assert list(loads(dumps_sorted({2026: 1, 2025: [Decimal("1.5")]}))) == ["2025", "2026"]
+
+
+@pytest.mark.asyncio
+async def test_large_bodies_are_decoded_off_the_loop_and_unchanged_ones_skipped():
+    from custom_components.lejer_eonromania.const import JSON_EXECUTOR_THRESHOLD
+
+    history = [{"year": 2000 + i % 30, "value": "x" * 64} for i in range(JSON_EXECUTOR_THRESHOLD // 64)]
+    body = json.dumps({"history": history}).encode()
+    assert len(body) >= JSON_EXECUTOR_THRESHOLD
+    session = FakeSession([FakeResponse(200, body), FakeResponse(200, body), FakeResponse(200, b"[]")])
+    api = EonApiClient(session, "user", "pass")
+    api._token = "token"
+
+    first = await api.async_fetch_arhiva_data(MOCK_CONTRACT)
+    second = await api.async_fetch_arhiva_data(MOCK_CONTRACT)
+    await api.async_fetch_conventieconsum_data(MOCK_CONTRACT)
+
+    assert first["history"] == history and second is first
+    assert (api.metrics.decoded_off_loop, api.metrics.decode_skipped, api.metrics.decoded) == (1, 1, 1)
+
+
+def test_endpoint_name_matches_url_templates():
+    """Request URLs map back to their URLS key, static paths taking precedence."""
+    assert endpoint_name(URLS["dateuser"].format(cod_incasare=MOCK_CONTRACT)) == "dateuser"
+    assert endpoint_name(URLS["account_contracts_list"]) == "account_contracts_list"
+    assert endpoint_name(URLS["payments_list"].format(cod_incasare=MOCK_CONTRACT, page=3)) == "payments_list"
+    assert endpoint_name("https://api2.eon.ro/unknown/path") == "/unknown/path"
+
+
+@pytest.mark.asyncio
+async def test_metrics_count_requests_bytes_and_retries():
+    """Requests are counted per endpoint, including 401s and the retry after a new login."""
+    body = json.dumps({"accountContract": MOCK_CONTRACT}).encode()
+    session = FakeSession([FakeResponse(401), FakeResponse(200, body), FakeResponse(404, b"missing")])
+    api = EonApiClient(session, "user", "pass")
+    api._token = "expired"
+
+    async def login():
+        api._token = "fresh"
+        return True
+    api.async_login = login
+
+    await api.async_fetch_dateuser_data(MOCK_CONTRACT)
+    await api.async_fetch_arhiva_data(MOCK_CONTRACT)
+
+    dateuser = api.metrics.endpoints["dateuser"]
+    assert (dateuser.requests, dateuser.unauthorized, dateuser.retries) == (2, 1, 1)
+    assert dateuser.bytes_received == len(body)
+    assert sum(dateuser.latency_histogram) == 2
+    assert api.metrics.endpoints["arhiva"].errors == 1
+    assert api.metrics.as_dict()["total_requests"] == 3
+
+
+def test_records_are_compact_and_round_trip():
+    """API payloads are reduced to slotted records that survive the snapshot store."""
+    invoice = Invoice.from_api({
+        "invoiceNumber": "F1", "issuedValue": 120.5, "balanceValue": "80.10",
+        "maturityDate": "15.03.2026", "unused": "x" * 100,
+    })
+    assert (invoice.issued_cents, invoice.balance_cents) == (12050, 8010)
+    assert invoice.maturity_date.isoformat() == "2026-03-15"
+    assert not hasattr(invoice, "__dict__")
+
+    readings = IndexReadings.from_api({
+        "readingPeriod": {"allowedReading": True, "startDate": "2026-03-01"},
+        "indexDetails": {"devices": [
+            {"deviceNumber": "D1", "indexes": [{"ablbelnr": "A1", "currentValue": 1234, "unit": "KWH"}]},
+        ]},
+    })
+    assert readings.allowed_reading is True
+    assert readings.devices[0].value == 1234
+    assert readings.devices[0].device_type == "electric"
+
+    # A malformed index leaves that meter without a value instead of failing the contract
+    readings = IndexReadings.from_api({"indexDetails": {"devices": [
+        {"deviceNumber": "D1", "indexes": [{"ablbelnr": "A1", "currentValue": "n/a"}]},
+        {"deviceNumber": "D2", "indexes": [{"ablbelnr": "A2", "oldValue": {"v": 1}}]},
+        {"deviceNumber": "D3", "indexes": [{"ablbelnr": "A3", "oldValue": "42"}]},
+    ]}})
+    assert [(d.ablbelnr, d.value) for d in readings.devices] == [("A1", None), ("A2", None), ("A3", 42)]
+
+    for key, value in (("facturasold", [invoice]), ("citireindex", readings), ("payments", [Payment.from_api(make_payment(1))])):
+        assert records_from_json(key, json.loads(json.dumps(records_as_json(value)))) == value
+
+
+@pytest.mark.asyncio
+async def test_throttled_request_honors_retry_after_and_slows_down():
+    """A 429 is retried after Retry-After and halves the client's request rate."""
+    body = json.dumps({"history": []}).encode()
+    session = FakeSession([
+        FakeResponse(429, headers={"Retry-After": "0"}),
+        FakeResponse(503, headers={"Retry-After": "0"}),
+        FakeResponse(200, body),
+    ])
+    api = EonApiClient(session, "user", "pass", rate_limit=100)
+    api._token = "token"
+
+    assert await api.async_fetch_arhiva_data(MOCK_CONTRACT) == {"history": []}
+    stats = api.metrics.endpoints["arhiva"]
+    assert (stats.requests, stats.throttled, stats.retries) == (3, 1, 2)
+    # Halved by the 429, then partly recovered by the success
+    assert 50 <= api.rate_limit < 100
+
+
+@pytest.mark.asyncio
+async def test_reading_submission_is_not_repeated_on_server_errors():
+    """A POST is sent once on a 5xx or timeout, and retried only if it never reached the server."""
+    from custom_components.lejer_eonromania.api import STATUS_NOT_SENT
+
+    api = EonApiClient(FakeSession([]), "user", "pass")
+    api._token = "token"
+    calls = []
+    responses = []
+
+    async def respond(method, url, json_data=None, conditional=False):
+        calls.append(method)
+        return responses.pop(0)
+
+    api._do_request_once = respond
+    for status in (503, 0):
+        calls.clear()
+        responses[:] = [(None, status, 0), ({"ok": True}, 200, None)]
+        assert await api.async_trimite_index(MOCK_CONTRACT, "A1", 100) is None
+        assert calls == ["POST"]
+
+    calls.clear()
+    responses[:] = [(None, STATUS_NOT_SENT, 0), (None, 429, 0), ({"ok": True}, 200, None)]
+    assert await api.async_trimite_index(MOCK_CONTRACT, "A1", 100) == {"ok": True}
+    assert calls == ["POST"] * 3
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_per_endpoint_family():
+    """Repeated failures open the circuit of one endpoint family only."""
+    api = EonApiClient(FakeSession([]), "user", "pass")
+    api._token = "token"
+    calls = []
+
+    async def failing(method, url, json_data=None, conditional=False):
+        calls.append(url)
+        return None, 503, 0
+
+    api._do_request_once = failing
+    for _ in range(3):
+        assert await api.async_fetch_arhiva_data(MOCK_CONTRACT) is None
+
+    # Five failures open the "meterreadings" circuit; later calls are not sent
+    assert len(calls) == 5
+    assert api.circuit_states == {"meterreadings": "open"}
+    assert api.metrics.endpoints["arhiva"].rejected == 1
+    assert api._circuit_breaker(URLS["facturasold"]).allow()
+
+
+def test_circuit_breaker_half_open_trial(monkeypatch):
+    """After the reset timeout a single trial request decides the circuit state."""
+    now = [1000.0]
+    monkeypatch.setattr("custom_components.lejer_eonromania.ratelimit.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] += 61
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial in flight
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    now[0] += 61
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_limits_rate():
+    """Beyond the burst, requests are spaced by the configured rate."""
+    bucket = TokenBucket(rate=100, capacity=2)
+    started = time.monotonic()
+    for _ in range(5):
+        await bucket.acquire()
+    assert time.monotonic() - started >= 0.025
+
+
+def test_retry_after_parsing():
+    assert retry_after({"Retry-After": "12"}) == 12
+    assert retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0
+    assert retry_after({}) is None
+
+
+
+class SlowSession:
+    """Session whose responses take a while, recording the peak of parallel requests."""
+
+    def __init__(self, body):
+        self.body = body
+        self.in_flight = 0
+        self.peak = 0
+
+    def request(self, method, url, headers=None, **kwargs):
+        session = self
+
+        class SlowResponse(FakeResponse):
+            async def __aenter__(self):
+                session.in_flight += 1
+                session.peak = max(session.peak, session.in_flight)
+                await asyncio.sleep(0.01)
+                return self
+
+            async def __aexit__(self, *exc):
+                session.in_flight -= 1
+                return False
+
+        return SlowResponse(200, self.body)
+
+
+@pytest.mark.asyncio
+async def test_registry_clients_share_one_budget():
+    """Accounts keep their own tokens but never exceed the shared host limit together."""
+    from custom_components.lejer_eonromania.clients import EonClientRegistry
+
+    session = SlowSession(json.dumps({"history": []}).encode())
+    registry = EonClientRegistry(session, RequestBudget(max_concurrency_per_host=2, rate_limit=1000, rate_burst=1000), {})
+    clients = [registry.get_client(f"entry_{i}", f"user{i}", "pass") for i in range(3)]
+    for i, client in enumerate(clients):
+        client._token = f"token{i}"
+
+    await asyncio.gather(*(client.async_fetch_arhiva_data(MOCK_CONTRACT) for client in clients for _ in range(4)))
+
+    assert session.peak == 2
+    assert len(registry) == 3
+    assert len({id(client._rate_limiter) for client in clients}) == 1
+    assert [client.metrics.total_requests for client in clients] == [4, 4, 4]
+
+
+@pytest.mark.asyncio
+async def test_registry_session_is_closed_with_the_last_entry():
+    from custom_components.lejer_eonromania.clients import async_get_registry, async_release_client
+    from custom_components.lejer_eonromania.const import DATA_CLIENTS
+
+    hass = MagicMock()
+    hass.data = {}
+    closing = []
+    hass.async_create_task = lambda coro: closing.append(asyncio.ensure_future(coro))
+    # The shared options come from the first entry, whichever entry sets up first
+    hass.config_entries.async_entries.return_value = [
+        MagicMock(options={"pool_limit_per_host": 3, "dns_ttl": 60, "rate_limit": 5, "rate_burst": 7}),
+        MagicMock(options={"pool_limit_per_host": 9}),
+    ]
+    registry = async_get_registry(hass)
+    assert registry.session.connector.limit_per_host == 3
+    assert registry.budget.max_concurrency_per_host == 3
+    assert registry.budget.rate_limiter.max_rate == 5
+    assert registry.budget.rate_limiter.capacity == 7
+    registry.get_client("a", "user_a", "pass")
+    registry.get_client("b", "user_b", "pass")
+    assert async_get_registry(hass) is registry
+
+    async_release_client(hass, "a")
+    assert hass.data[DATA_CLIENTS] is registry
+    assert not registry.session.closed
+    async_release_client(hass, "b")
+    assert DATA_CLIENTS not in hass.data
+    await asyncio.gather(*closing)
+    assert registry.session.closed
+
+
+@pytest.mark.asyncio
+async def test_changing_shared_options_reloads_all_entries():
+    from custom_components.lejer_eonromania import ConfigEntryState, _async_update_listener, _entry_settings
+    from custom_components.lejer_eonromania.clients import EonClientRegistry, shared_options
+    from custom_components.lejer_eonromania.const import DATA_CLIENTS, DOMAIN
+
+    primary = MagicMock(entry_id="a", options={}, data={"username": "a"}, state=ConfigEntryState.LOADED)
+    secondary = MagicMock(entry_id="b", options={}, data={"username": "b"}, state=ConfigEntryState.LOADED)
+    hass = MagicMock()
+    hass.config_entries.async_entries.return_value = [primary, secondary]
+    hass.config_entries.async_unload = AsyncMock(return_value=True)
+    hass.config_entries.async_setup = AsyncMock(return_value=True)
+    hass.config_entries.async_reload = AsyncMock(return_value=True)
+    hass.data = {
+        DATA_CLIENTS: EonClientRegistry(MagicMock(), RequestBudget(), shared_options(hass)),
+        DOMAIN: {entry.entry_id: {"settings": _entry_settings(entry)} for entry in (primary, secondary)},
+    }
+
+    # Saving the session changes nothing that needs a reload
+    secondary.data = {"username": "b", "session": {"token": "t"}}
+    await _async_update_listener(hass, secondary)
+    hass.config_entries.async_reload.assert_not_awaited()
+
+    # A secondary entry's options reload that entry only, without touching the shared session
+    secondary.options = {"warm_interval": 7200, "rate_limit": 50}
+    await _async_update_listener(hass, secondary)
+    hass.config_entries.async_reload.assert_awaited_once_with("b")
+    hass.config_entries.async_unload.assert_not_awaited()
+
+    primary.options = {"rate_limit": 20}
+    await _async_update_listener(hass, primary)
+    assert [c.args[0] for c in hass.config_entries.async_unload.await_args_list] == ["a", "b"]
+    assert [c.args[0] for c in hass.config_entries.async_setup.await_args_list] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_transport_prewarms_and_decodes_compressed_responses():
+    """Connections are opened ahead of the login and JSON bodies arrive gzipped."""
+    from unittest.mock import patch
+    from custom_components.lejer_eonromania import api as api_module
+    from custom_components.lejer_eonromania.transport import create_session
+    from mock_eon_server import MockEonServer
+
+    async with MockEonServer() as server:
+        session = create_session()
+        try:
+            with patch.dict(api_module.URLS, server.urls()):
+                api = EonApiClient(session, "user", "pass")
+                opened, logged_in = await asyncio.gather(api.async_prewarm(), api.async_login())
+                assert (opened, logged_in) == (2, True)
+                assert await api.async_fetch_arhiva_data(server.contract_ids[0]) is not None
+        finally:
+            await session.close()
+    assert server.stats.compressed == 2
+
+
+@pytest.mark.asyncio
+async def test_invoice_pdf_is_streamed_to_disk(tmp_path):
+    """PDFs are written via a temporary file, verified, and not downloaded twice."""
+    import aiohttp
+    from unittest.mock import patch
+    from custom_components.lejer_eonromania import api as api_module
+    from mock_eon_server import FAKE_PDF, MockEonServer
+
+    async with MockEonServer() as server, aiohttp.ClientSession() as session:
+        with patch.dict(api_module.URLS, server.urls()):
+            api = EonApiClient(session, "user", "pass")
+            target = tmp_path / "eon_invoices" / "factura_F1.pdf"
+
+            first = await api.async_download_invoice_pdf(MOCK_CONTRACT, "F1", str(target))
+            assert (first.size, first.skipped) == (len(FAKE_PDF), False)
+            assert target.read_bytes() == FAKE_PDF
+            assert not (tmp_path / "eon_invoices" / "factura_F1.pdf.part").exists()
+
+            second = await api.async_download_invoice_pdf(MOCK_CONTRACT, "F1", str(target))
+            assert second.skipped
+            assert second.sha1 == first.sha1
+
+            # A different file of the same length is replaced
+            target.write_bytes(b"x" * len(FAKE_PDF))
+            third = await api.async_download_invoice_pdf(MOCK_CONTRACT, "F1", str(target))
+            assert not third.skipped
+            assert target.read_bytes() == FAKE_PDF
+
+            # A non-PDF response leaves neither a file nor a temporary file behind
+            bad = tmp_path / "eon_invoices" / "factura_HTML1.pdf"
+            assert await api.async_download_invoice_pdf(MOCK_CONTRACT, "HTML1", str(bad)) is None
+            assert list((tmp_path / "eon_invoices").iterdir()) == [target]
+
+
+@pytest.mark.asyncio
+async def test_mirror_invoices_skips_saved_and_resumes(tmp_path):
+    """Every invoice list is mirrored once; a rerun only fetches what is missing."""
+    from custom_components.lejer_eonromania.api import PdfDownload
+    from custom_components.lejer_eonromania.archive import async_mirror_invoices
+
+    hass = MagicMock()
+    hass.async_add_executor_job = lambda func, *args: asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def download(cod, number, path):
+        if number == "BROKEN":
+            return None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        content = b"%PDF" + number.encode()
+        with open(path, "wb") as file:
+            file.write(content)
+        return PdfDownload(path, len(content), hashlib.sha1(content).hexdigest())
+
+    coordinator = MagicMock()
+    coordinator.contract_index = {MOCK_CONTRACT: object()}
+    coordinator.async_refresh_keys = AsyncMock()
+    coordinator.api_client.async_download_invoice_pdf = AsyncMock(side_effect=download)
+    coordinator.data = {"data_per_contract": {MOCK_CONTRACT: {
+        "paid_invoices_list": {"list": [{"invoiceNumber": "P1"}, {"invoiceNumber": "P/2"}]},
+        "facturasold": [Invoice.from_api({"invoiceNumber": "P1"}), Invoice.from_api({"invoiceNumber": "U1"})],
+        "prosumer_invoices_list": [{"invoiceNumber": "BROKEN"}],
+    }}}
+
+    first = await async_mirror_invoices(hass, coordinator, str(tmp_path))
+    assert (first["downloaded"], first["skipped"], first["failed"]) == (3, 0, 1)
+    assert (tmp_path / MOCK_CONTRACT / "factura_P_2.pdf").exists()
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert set(manifest) == {f"{MOCK_CONTRACT}/P1", f"{MOCK_CONTRACT}/P/2", f"{MOCK_CONTRACT}/U1"}
+
+    # Deleted and altered files are fetched again, saved ones are skipped without a request
+    (tmp_path / MOCK_CONTRACT / "factura_U1.pdf").unlink()
+    (tmp_path / MOCK_CONTRACT / "factura_P1.pdf").write_bytes(b"%PDFXX")
+    os.utime(tmp_path / MOCK_CONTRACT / "factura_P1.pdf", (0, 12345))
+    coordinator.api_client.async_download_invoice_pdf.reset_mock()
+    second = await async_mirror_invoices(hass, coordinator, str(tmp_path))
+    assert (second["downloaded"], second["skipped"], second["failed"]) == (2, 1, 1)
+    assert coordinator.api_client.async_download_invoice_pdf.await_count == 3
+    assert (tmp_path / MOCK_CONTRACT / "factura_P1.pdf").read_bytes() == b"%PDFP1"
+
+    # Files with the recorded size and mtime are not read again, unless verification is asked for
+    from unittest.mock import patch
+    from custom_components.lejer_eonromania import archive
+
+    with patch.object(archive, "file_sha1", wraps=archive.file_sha1) as hashed:
+        third = await async_mirror_invoices(hass, coordinator, str(tmp_path))
+        assert (third["downloaded"], third["skipped"]) == (0, 3)
+        hashed.assert_not_called()
+        await async_mirror_invoices(hass, coordinator, str(tmp_path), verify=True)
+        assert hashed.call_count == 3
+
+
+class FakePagedApi(EonApiClient):
+    """EonApiClient serving a list endpoint that announces its page count."""
+
+    def __init__(self, pages, announce_total=True, failing_pages=()):
+        super().__init__(MagicMock(), "user", "pass")
+        self._token = "token"
+        self.pages = pages
+        self.announce_total = announce_total
+        self.failing_pages = set(failing_pages)
+        self.requested_pages = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def _do_request(self, method, url, json_data=None, **kwargs):
+        page = int(url.rsplit("page=", 1)[1])
+        self.requested_pages.append(page)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if page in self.failing_pages:
+            return None, 500
+        data = {"list": self.pages[page - 1], "hasNext": page < len(self.pages)}
+        if self.announce_total:
+            data["totalPages"] = len(self.pages)
+        return data, 200
+
+
+def make_invoice(n):
+    return {"invoiceNumber": f"F{n}"}
+
+
+@pytest.mark.asyncio
+async def test_paginator_prefetches_pages_when_total_is_known():
+    """Pages after the first are fetched concurrently, but yielded in order."""
+    api = FakePagedApi([[make_invoice(p * 10 + i) for i in range(2)] for p in range(8)])
+
+    invoices = await api.async_fetch_invoices_list_paid(MOCK_CONTRACT)
+
+    assert [i["invoiceNumber"] for i in invoices] == [f"F{p * 10 + i}" for p in range(8) for i in range(2)]
+    assert sorted(api.requested_pages) == list(range(1, 9))
+    assert api.peak > 1
+
+
+@pytest.mark.asyncio
+async def test_paginator_stops_at_known_invoices_and_cancels_prefetch():
+    """An incremental sync stops at the first known invoice; pages fetched ahead are dropped."""
+    api = FakePagedApi([[make_invoice(9), make_invoice(8)], [make_invoice(7), make_invoice(6)]] + [[make_invoice(0)]] * 6)
+    known = [make_invoice(7), make_invoice(6)]
+
+    invoices = await api.async_fetch_invoices_list_paid(MOCK_CONTRACT, known)
+    await asyncio.sleep(0.02)
+
+    assert [i["invoiceNumber"] for i in invoices] == ["F9", "F8", "F7", "F6"]
+    # Page 2 reached the history; at most the prefetch window was requested beyond it
+    assert max(api.requested_pages) <= 2 + 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("announce_total", [True, False])
+async def test_paginator_failure_mid_list_keeps_the_known_history(announce_total):
+    """A page failing after the first one fails the whole fetch instead of returning part of the list."""
+    pages = [[make_invoice(9)], [make_invoice(8)], [make_invoice(7)]]
+    api = FakePagedApi(pages, announce_total=announce_total, failing_pages={2})
+
+    assert await api.async_fetch_invoices_list_paid(MOCK_CONTRACT) is None
+    assert await api.async_fetch_invoices_list_paid(MOCK_CONTRACT, [make_invoice(7)]) is None
+
+    payments = FakePagedApi(
+        [[make_payment(9)], [make_payment(8)], [make_payment(7)]],
+        announce_total=announce_total, failing_pages={2},
+    )
+    assert await payments.async_fetch_payments_data(MOCK_CONTRACT) is None
+
+    # Once the page is back, the whole list is fetched
+    api.failing_pages.clear()
+    invoices = await api.async_fetch_invoices_list_paid(MOCK_CONTRACT)
+    assert [i["invoiceNumber"] for i in invoices] == ["F9", "F8", "F7"]
+
+
+@pytest.mark.asyncio
+async def test_paginator_applies_cutoff_date():
+    """Records before the cutoff are dropped and no older page is requested."""
+    from datetime import date
+
+    api = FakePagedApi(
+        [[make_payment(9), make_payment(8)], [make_payment(7), make_payment(3)], [make_payment(2)]],
+        announce_total=False,
+    )
+    pages = [
+        [r["paymentDate"] for r in records]
+        async for records in api.async_iter_pages(
+            "https://api2.eon.ro/x?page={page}", "error",
+            cutoff=date(2026, 1, 5), date_of=lambda r: date.fromisoformat(r["paymentDate"]),
+        )
+    ]
+
+    assert pages == [["2026-01-09", "2026-01-08"], ["2026-01-07"]]
+    assert api.requested_pages == [1, 2]
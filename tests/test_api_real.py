@@ -52,6 +52,8 @@ mock_module("homeassistant.helpers.device_registry")
 mock_module("homeassistant.helpers.entity_registry")
 mock_module("homeassistant.helpers.area_registry")
 mock_module("homeassistant.helpers.issue_registry")
+mock_module("homeassistant.helpers.storage")
+mock_module("homeassistant.helpers.event")
 mock_module("homeassistant.const")
 mock_module("homeassistant.exceptions")
 mock_module("homeassistant.components", pkg=True)
@@ -75,6 +77,7 @@ sys.modules["homeassistant.components.sensor"].SensorEntity = MockClass
 sys.modules["homeassistant.components.binary_sensor"].BinarySensorEntity = MockClass
 sys.modules["homeassistant.components.button"].ButtonEntity = MockClass
 sys.modules["homeassistant.helpers.entity"].Entity = MockClass
+sys.modules["homeassistant.core"].callback = lambda func: func
 
 import logging
 import asyncio
@@ -130,10 +133,10 @@ async def test_real_login_and_fetch():
                 super().__init__(session, username, password)
                 self.login_data = None
             
-            async def _do_request(self, method: str, url: str, json_data: dict = None):
+            async def _do_request(self, method: str, url: str, json_data: dict = None, **kwargs):
                 """Override to capture and log request/response details."""
                 start_time = time.time()
-                resp_data, status = await super()._do_request(method, url, json_data)
+                resp_data, status = await super()._do_request(method, url, json_data, **kwargs)
                 duration = time.time() - start_time
                 
                 # Create a safe filename from URL
@@ -305,7 +308,7 @@ async def test_real_login_and_fetch():
             await asyncio.sleep(DELAY_SECONDS)
             invoices = await api.async_fetch_facturasold_data(code)
             if invoices:
-                 _LOGGER.info("[OK] Invoices (Unpaid): %s", json.dumps(invoices, indent=2))
+                 _LOGGER.info("[OK] Invoices (Unpaid): %s", json.dumps(invoices, indent=2, default=str))
             else:
                  _LOGGER.error("[FAIL] Invoices (Unpaid)")
 
@@ -321,7 +324,7 @@ async def test_real_login_and_fetch():
             await asyncio.sleep(DELAY_SECONDS)
             index = await api.async_fetch_citireindex_data(code)
             if index:
-                 _LOGGER.info("[OK] Index Reading: %s", json.dumps(index, indent=2))
+                 _LOGGER.info("[OK] Index Reading: %s", json.dumps(index, indent=2, default=str))
             else:
                  _LOGGER.error("[FAIL] Index Reading")
             
@@ -353,7 +356,7 @@ async def test_real_login_and_fetch():
             await asyncio.sleep(DELAY_SECONDS)
             payments = await api.async_fetch_payments_data(code)
             if payments:
-                 _LOGGER.info("[OK] Payments History: %s", json.dumps(payments, indent=2))
+                 _LOGGER.info("[OK] Payments History: %s", json.dumps(payments, indent=2, default=str))
             else:
                  _LOGGER.info("[INFO] Payments History is empty")
 
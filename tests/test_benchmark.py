@@ -0,0 +1,39 @@
+#  Copyright (c) 2026 tbutiu
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+#  OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+#  SOFTWARE.
+
+import pytest
+
+from benchmark import run_benchmark
+from mock_eon_server import MockEonConfig
+
+
+@pytest.mark.asyncio
+async def test_benchmark_against_mock_server():
+    """The harness drives client and coordinator end to end against the mock API."""
+    config = MockEonConfig(contracts=3, payment_pages=2, expire_token_every=15)
+
+    single, cold, warm = await run_benchmark(config, rate_limit=1000)
+
+    assert single.requests > 0 and single.bytes_sent > 0 and single.peak_memory > 0
+    # Every contract key is fetched once per contract, plus pagination and 401 retries
+    assert cold.requests >= 3 * 12
+    assert cold.unauthorized > 0 and cold.logins >= 1
+    # Nothing is due right after a full refresh: only the account-level calls run
+    assert warm.requests < cold.requests
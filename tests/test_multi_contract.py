@@ -45,6 +45,8 @@ mock_module("homeassistant.helpers.device_registry")
 mock_module("homeassistant.helpers.entity_registry")
 mock_module("homeassistant.helpers.area_registry")
 mock_module("homeassistant.helpers.issue_registry")
+mock_module("homeassistant.helpers.storage")
+mock_module("homeassistant.helpers.event")
 mock_module("homeassistant.const")
 mock_module("homeassistant.exceptions")
 mock_module("homeassistant.components", pkg=True)
@@ -64,14 +66,20 @@ sys.modules["homeassistant.components.sensor"].SensorEntity = MockClass
 sys.modules["homeassistant.components.binary_sensor"].BinarySensorEntity = MockClass
 sys.modules["homeassistant.components.button"].ButtonEntity = MockClass
 sys.modules["homeassistant.helpers.entity"].Entity = MockClass
+sys.modules["homeassistant.core"].callback = lambda func: func
+sys.modules["homeassistant.core"].HomeAssistant = MockClass
 
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
+import asyncio
+import json
 import logging
+import time
 from custom_components.lejer_eonromania.coordinator import EonRomaniaCoordinator
 from custom_components.lejer_eonromania.const import (
-    KEY_CONTRACTS, KEY_DATEUSER, KEY_CITIREINDEX, KEY_FACTURASOLD
+    KEY_CONTRACTS, KEY_DATEUSER, KEY_CITIREINDEX, KEY_FACTURASOLD, KEY_ARHIVA
 )
+from custom_components.lejer_eonromania.api import IndexReadings, Invoice, Payment
 from homeassistant.core import HomeAssistant
 
 # Constants for mocking
@@ -97,6 +105,35 @@ MOCK_DATEUSER = {"accountContract": MOCK_CONTRACT_1, "consumptionPointCode": "12
 MOCK_CITIRE = {"indexDetails": {"devices": []}}
 MOCK_INVOICES = []
 
+CONTRACT_FETCHER_NAMES = (
+    "async_fetch_dateuser_data", "async_fetch_citireindex_data",
+    "async_fetch_conventieconsum_data", "async_fetch_comparareanualagrafic_data",
+    "async_fetch_arhiva_data", "async_fetch_facturasold_data",
+    "async_fetch_invoice_balance_prosum", "async_fetch_invoices_list_prosum",
+    "async_fetch_invoices_list_paid", "async_fetch_rescheduling_plans",
+    "async_fetch_payment_notices", "async_fetch_payments_data",
+)
+
+
+def make_coordinator(hass, api_client, **kwargs):
+    """Create a coordinator with the state DataUpdateCoordinator would initialize."""
+    coordinator = EonRomaniaCoordinator(hass, api_client, update_interval=3600, **kwargs)
+    coordinator.hass = hass
+    coordinator.data = None
+    coordinator.async_set_updated_data = MagicMock(side_effect=lambda data: setattr(coordinator, "data", data))
+    coordinator.async_update_listeners = MagicMock()
+    return coordinator
+
+
+def make_api_client(fetch_return=None):
+    """Create an API client mock returning fetch_return for every contract key."""
+    api_client = MagicMock()
+    api_client.async_fetch_account_contracts_list = AsyncMock(return_value=MOCK_CONTRACTS_LIST)
+    api_client.async_fetch_user_wallet = AsyncMock(return_value={})
+    for name in CONTRACT_FETCHER_NAMES:
+        setattr(api_client, name, AsyncMock(return_value=fetch_return))
+    return api_client
+
 @pytest.mark.asyncio
 async def test_coordinator_multi_contract():
     """Test that coordinator correctly splits data for multiple contracts."""
@@ -124,7 +161,7 @@ async def test_coordinator_multi_contract():
     api_client.async_fetch_payments_data = AsyncMock(return_value={})
 
     # Initialize Coordinator
-    coordinator = EonRomaniaCoordinator(hass, api_client, update_interval=3600)
+    coordinator = make_coordinator(hass, api_client)
     
     # Trigger update
     result = await coordinator._async_update_data()
@@ -144,3 +181,567 @@ async def test_coordinator_multi_contract():
     assert api_client.async_fetch_dateuser_data.call_count == 2
     api_client.async_fetch_dateuser_data.assert_any_call(MOCK_CONTRACT_1)
     api_client.async_fetch_dateuser_data.assert_any_call(MOCK_CONTRACT_2)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_fetches_concurrently_under_limit():
+    """Test that per-contract fetches run in parallel without exceeding the limit."""
+    import asyncio
+
+    hass = MagicMock(spec=HomeAssistant)
+    in_flight = 0
+    peak = 0
+
+    async def slow_fetch(*args):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {}
+
+    api_client = make_api_client()
+    for name in CONTRACT_FETCHER_NAMES:
+        setattr(api_client, name, slow_fetch)
+
+    coordinator = make_coordinator(hass, api_client, max_concurrency=5)
+    result = await coordinator._async_update_data()
+
+    assert peak == 5
+    assert set(result["data_per_contract"]) == {MOCK_CONTRACT_1, MOCK_CONTRACT_2}
+    assert len(result["data_per_contract"][MOCK_CONTRACT_1]) == 12
+    assert KEY_DATEUSER in result["data_per_contract"][MOCK_CONTRACT_2]
+    # Phase timings are recorded for diagnostics
+    assert set(coordinator.refresh_timings) == {"accounts", "contracts", "index", "total"}
+    assert coordinator.refresh_timings["contracts"] >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_coordinator_refetches_only_expired_tiers():
+    """Test that warm and cold keys are carried over until their TTL expires."""
+    hass = MagicMock(spec=HomeAssistant)
+    api_client = make_api_client(fetch_return={"v": 1})
+    coordinator = make_coordinator(hass, api_client)
+
+    coordinator.data = await coordinator._async_update_data()
+    assert api_client.async_fetch_arhiva_data.call_count == 2
+
+    # Second tick an hour later: only hot keys are fetched again
+    with patch("custom_components.lejer_eonromania.coordinator.time.time", return_value=time.time() + 3600):
+        coordinator.data = await coordinator._async_update_data()
+
+    assert api_client.async_fetch_citireindex_data.call_count == 4
+    assert api_client.async_fetch_payments_data.call_count == 2
+    assert api_client.async_fetch_arhiva_data.call_count == 2
+    assert coordinator.data["data_per_contract"][MOCK_CONTRACT_1][KEY_ARHIVA] == {"v": 1}
+
+
+@pytest.mark.asyncio
+async def test_coordinator_warm_start_from_snapshot():
+    """Test that a stored snapshot becomes the data and keeps the per-key fetch times."""
+    hass = MagicMock(spec=HomeAssistant)
+    readings = IndexReadings.from_api({"indexDetails": {"devices": [{"deviceNumber": "D1"}]}})
+    api_client = make_api_client(fetch_return={"v": 1})
+    api_client.async_fetch_citireindex_data = AsyncMock(return_value=readings)
+    api_client.async_fetch_facturasold_data = AsyncMock(return_value=[])
+    api_client.async_fetch_payments_data = AsyncMock(return_value=[])
+    coordinator = make_coordinator(hass, api_client)
+    coordinator.data = await coordinator._async_update_data()
+    snapshot = json.loads(json.dumps(coordinator._snapshot()))
+
+    # Restart: a new coordinator loads the snapshot without calling the API
+    api_client = make_api_client(fetch_return={"v": 2})
+    restarted = make_coordinator(hass, api_client)
+    restarted._store = MagicMock()
+    restarted._store.async_load = AsyncMock(return_value=snapshot)
+
+    assert await restarted.async_load_snapshot() is True
+    assert restarted.data["data_per_contract"][MOCK_CONTRACT_1][KEY_ARHIVA] == {"v": 1}
+    assert restarted.data["data_per_contract"][MOCK_CONTRACT_1][KEY_CITIREINDEX] == readings
+    assert list(restarted.contract_index[MOCK_CONTRACT_1].devices) == ["D1"]
+    api_client.async_fetch_account_contracts_list.assert_not_called()
+
+    # Background revalidation an hour later only fetches keys whose TTL expired
+    with patch("custom_components.lejer_eonromania.coordinator.time.time", return_value=time.time() + 3600):
+        restarted.data = await restarted._async_update_data()
+    api_client.async_fetch_arhiva_data.assert_not_called()
+    assert restarted.data["data_per_contract"][MOCK_CONTRACT_1][KEY_CITIREINDEX] == {"v": 2}
+
+
+@pytest.mark.asyncio
+async def test_coordinator_reports_changed_keys():
+    """Test that only keys whose value changed are reported to entities."""
+    hass = MagicMock(spec=HomeAssistant)
+    api_client = make_api_client(fetch_return={"v": 1})
+    coordinator = make_coordinator(hass, api_client)
+    coordinator.data = await coordinator._async_update_data()
+    assert coordinator.keys_changed(MOCK_CONTRACT_1, (KEY_CITIREINDEX,))
+
+    # Same payloads (as new objects): nothing changed
+    api_client.async_fetch_citireindex_data = AsyncMock(side_effect=lambda cod: {"v": 1})
+    with patch("custom_components.lejer_eonromania.coordinator.time.time", return_value=time.time() + 3600):
+        coordinator.data = await coordinator._async_update_data()
+    assert not coordinator.keys_changed(MOCK_CONTRACT_1, (KEY_CITIREINDEX, KEY_ARHIVA))
+
+    # A new reading on one contract only
+    api_client.async_fetch_citireindex_data = AsyncMock(
+        side_effect=lambda cod: {"v": 2} if cod == MOCK_CONTRACT_1 else {"v": 1}
+    )
+    with patch("custom_components.lejer_eonromania.coordinator.time.time", return_value=time.time() + 7200):
+        coordinator.data = await coordinator._async_update_data()
+    assert coordinator.changed_keys[MOCK_CONTRACT_1] == {KEY_CITIREINDEX}
+    assert not coordinator.keys_changed(MOCK_CONTRACT_2, (KEY_CITIREINDEX,))
+
+
+@pytest.mark.asyncio
+async def test_coordinator_builds_contract_index():
+    """Test that the coordinator indexes devices, history and payments per contract."""
+    hass = MagicMock(spec=HomeAssistant)
+    api_client = make_api_client()
+    api_client.async_fetch_citireindex_data = AsyncMock(return_value=IndexReadings.from_api({
+        "indexDetails": {"devices": [
+            {"deviceNumber": "D1", "indexes": [{"ablbelnr": "A1", "unit": "KWH"}]},
+            {"deviceNumber": "D2", "indexes": [{"ablbelnr": "A2"}]},
+        ]},
+    }))
+    api_client.async_fetch_arhiva_data = AsyncMock(return_value={"history": [{"year": 2025}, {"year": 2026}]})
+    api_client.async_fetch_payments_data = AsyncMock(return_value=[
+        Payment.from_api({"paymentDate": day}) for day in ("2026-02-01", "2026-01-01", "2025-12-01")
+    ])
+    api_client.async_fetch_facturasold_data = AsyncMock(return_value=[
+        Invoice.from_api({"issuedValue": 10, "balanceValue": 10, "maturityDate": "20.03.2026"}),
+        Invoice.from_api({"issuedValue": 5, "balanceValue": 5, "maturityDate": "10.03.2026"}),
+    ])
+    coordinator = make_coordinator(hass, api_client)
+    coordinator.data = await coordinator._async_update_data()
+
+    index = coordinator.contract_index[MOCK_CONTRACT_1]
+    assert list(index.devices) == ["D1", "D2"]
+    assert index.device_type("D1") == "electric"
+    assert index.device_type("D2") == "gas"
+    assert index.first_ablbelnr == "A1"
+    assert set(index.history_by_year) == {2025, 2026}
+    assert len(index.payments_by_year[2026]) == 2
+    assert index.next_maturity.day == 10
+    assert index.unpaid_total == 15
+
+
+@pytest.mark.asyncio
+async def test_coordinator_serves_stale_values_on_failure():
+    """Failed fetches keep the last good value, report its age and schedule a retry."""
+    hass = MagicMock(spec=HomeAssistant)
+    api_client = make_api_client(fetch_return={"v": 1})
+    coordinator = make_coordinator(hass, api_client)
+    coordinator.data = await coordinator._async_update_data()
+    good = coordinator.data["data_per_contract"][MOCK_CONTRACT_1][KEY_CITIREINDEX]
+
+    # The hot key and the contracts list fail on the next tick
+    api_client.async_fetch_citireindex_data = AsyncMock(return_value=None)
+    api_client.async_fetch_account_contracts_list = AsyncMock(return_value=None)
+    with patch("custom_components.lejer_eonromania.coordinator.time.time", return_value=time.time() + 3600), \
+            patch("custom_components.lejer_eonromania.coordinator.async_call_later") as call_later:
+        coordinator.data = await coordinator._async_update_data()
+        assert coordinator.stale_age(MOCK_CONTRACT_1, (KEY_CITIREINDEX,)) >= 3600
+
+    assert coordinator.data["data_per_contract"][MOCK_CONTRACT_1][KEY_CITIREINDEX] is good
+    assert set(coordinator.data["data_per_contract"]) == {MOCK_CONTRACT_1, MOCK_CONTRACT_2}
+    assert coordinator.keys_changed(MOCK_CONTRACT_1, (KEY_CITIREINDEX,))
+    assert coordinator.stale_age(MOCK_CONTRACT_1, (KEY_ARHIVA,)) is None
+    call_later.assert_called_once()
+
+    # Only the failed key is due on the retry; recovering clears the stale state
+    api_client.async_fetch_citireindex_data = AsyncMock(return_value={"v": 1})
+    api_client.async_fetch_account_contracts_list = AsyncMock(return_value=MOCK_CONTRACTS_LIST)
+    api_client.async_fetch_arhiva_data.reset_mock()
+    with patch("custom_components.lejer_eonromania.coordinator.time.time", return_value=time.time() + 3660):
+        coordinator.data = await coordinator._async_update_data()
+    assert api_client.async_fetch_citireindex_data.await_count == 2
+    api_client.async_fetch_arhiva_data.assert_not_awaited()
+    assert coordinator.stale_age(MOCK_CONTRACT_1, (KEY_CITIREINDEX,)) is None
+
+
+@pytest.mark.asyncio
+async def test_stale_retry_fetches_only_the_failed_keys():
+    """The early retry refetches the stale pairs, not the wallet or the other contracts."""
+    hass = MagicMock(spec=HomeAssistant)
+    api_client = make_api_client(fetch_return={"v": 1})
+    coordinator = make_coordinator(hass, api_client)
+    coordinator.data = await coordinator._async_update_data()
+
+    api_client.async_fetch_citireindex_data = AsyncMock(
+        side_effect=lambda cod, *args, **kwargs: None if cod == MOCK_CONTRACT_1 else {"v": 1}
+    )
+    with patch("custom_components.lejer_eonromania.coordinator.time.time", return_value=time.time() + 3600), \
+            patch("custom_components.lejer_eonromania.coordinator.async_call_later"):
+        coordinator.data = await coordinator._async_update_data()
+    assert coordinator.stale_age(MOCK_CONTRACT_1, (KEY_CITIREINDEX,)) is not None
+
+    api_client.async_fetch_citireindex_data = AsyncMock(return_value={"v": 2})
+    api_client.async_fetch_user_wallet.reset_mock()
+    api_client.async_fetch_account_contracts_list.reset_mock()
+    await coordinator._async_retry_stale(None)
+
+    api_client.async_fetch_citireindex_data.assert_awaited_once()
+    assert api_client.async_fetch_citireindex_data.await_args.args[0] == MOCK_CONTRACT_1
+    api_client.async_fetch_user_wallet.assert_not_awaited()
+    api_client.async_fetch_account_contracts_list.assert_not_awaited()
+    assert coordinator.data["data_per_contract"][MOCK_CONTRACT_1][KEY_CITIREINDEX] == {"v": 2}
+    assert coordinator.stale_age(MOCK_CONTRACT_1, (KEY_CITIREINDEX,)) is None
+
+
+@pytest.mark.asyncio
+async def test_stale_retries_do_not_postpone_the_full_refresh():
+    """Retrying a key that keeps failing never restarts the coordinator timer."""
+    hass = MagicMock(spec=HomeAssistant)
+    api_client = make_api_client(fetch_return={"v": 1})
+    coordinator = make_coordinator(hass, api_client)
+    coordinator.data = await coordinator._async_update_data()
+
+    api_client.async_fetch_citireindex_data = AsyncMock(
+        side_effect=lambda cod, *args, **kwargs: None if cod == MOCK_CONTRACT_1 else {"v": 1}
+    )
+    now = time.time() + 3600
+    with patch("custom_components.lejer_eonromania.coordinator.time.time", return_value=now), \
+            patch("custom_components.lejer_eonromania.coordinator.async_call_later") as call_later:
+        coordinator.data = await coordinator._async_update_data()
+        coordinator.async_set_updated_data.reset_mock()
+        for _ in range(3):
+            await coordinator._async_retry_stale(None)
+        assert call_later.call_count == 4
+
+    coordinator.async_set_updated_data.assert_not_called()
+    assert coordinator.async_update_listeners.call_count == 3
+    assert coordinator.stale_age(MOCK_CONTRACT_1, (KEY_CITIREINDEX,)) is not None
+
+    # The regular tick still refreshes the healthy hot keys
+    api_client.async_fetch_facturasold_data.reset_mock()
+    with patch("custom_components.lejer_eonromania.coordinator.time.time", return_value=now + 3600), \
+            patch("custom_components.lejer_eonromania.coordinator.async_call_later"):
+        coordinator.data = await coordinator._async_update_data()
+    assert api_client.async_fetch_facturasold_data.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_coordinator_submits_readings_in_batch():
+    """Readings for many contracts are sent concurrently and only their readings refreshed."""
+    hass = MagicMock(spec=HomeAssistant)
+    api_client = make_api_client(fetch_return={})
+    api_client.async_fetch_citireindex_data = AsyncMock(return_value=IndexReadings.from_api({
+        "indexDetails": {"devices": [
+            # Without a device, the first meter having indexes is used
+            {"deviceNumber": "D0", "indexes": []},
+            {"deviceNumber": "D1", "indexes": [{"ablbelnr": "A1"}]},
+            {"deviceNumber": "D2", "indexes": [{"ablbelnr": "A2"}]},
+        ]},
+    }))
+    api_client.async_trimite_index = AsyncMock(side_effect=lambda cod, ablbelnr, value: None if value < 0 else {"ok": True})
+    coordinator = make_coordinator(hass, api_client)
+    coordinator.data = await coordinator._async_update_data()
+    api_client.async_fetch_citireindex_data.reset_mock()
+    api_client.async_fetch_arhiva_data.reset_mock()
+
+    results = await coordinator.async_submit_readings([
+        {"cod_incasare": MOCK_CONTRACT_1, "index": 100},
+        {"cod_incasare": MOCK_CONTRACT_2, "device_number": "D2", "index": 200},
+        {"cod_incasare": MOCK_CONTRACT_2, "device_number": "D9", "index": 300},
+        {"cod_incasare": "unknown", "index": 1},
+        {"cod_incasare": MOCK_CONTRACT_1, "ablbelnr": "A2", "index": -1},
+    ])
+
+    assert [r["success"] for r in results] == [True, True, False, False, False]
+    assert [r.get("ablbelnr") for r in results] == ["A1", "A2", None, None, "A2"]
+    assert [r.get("error") for r in results[2:]] == ["unknown_meter", "unknown_contract", "submission_failed"]
+    assert api_client.async_trimite_index.await_count == 3
+    # Only the readings of the two contracts are fetched again, in one update
+    assert api_client.async_fetch_citireindex_data.await_count == 2
+    api_client.async_fetch_arhiva_data.assert_not_awaited()
+    coordinator.async_update_listeners.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_coordinator_refreshes_selected_keys_only():
+    """A partial refresh fetches the requested pairs and merges them into the snapshot."""
+    hass = MagicMock(spec=HomeAssistant)
+    api_client = make_api_client(fetch_return={"v": 1})
+    coordinator = make_coordinator(hass, api_client)
+    coordinator.data = await coordinator._async_update_data()
+    untouched = coordinator.data["data_per_contract"][MOCK_CONTRACT_2]
+    for name in CONTRACT_FETCHER_NAMES:
+        getattr(api_client, name).reset_mock()
+    api_client.async_fetch_account_contracts_list.reset_mock()
+
+    api_client.async_fetch_facturasold_data = AsyncMock(return_value={"v": 2})
+    await coordinator.async_refresh_keys([
+        (MOCK_CONTRACT_1, KEY_FACTURASOLD), (MOCK_CONTRACT_1, KEY_FACTURASOLD),
+        (MOCK_CONTRACT_1, "unknown_key"), ("unknown_contract", KEY_FACTURASOLD),
+    ])
+
+    api_client.async_fetch_facturasold_data.assert_awaited_once_with(MOCK_CONTRACT_1)
+    api_client.async_fetch_account_contracts_list.assert_not_awaited()
+    assert coordinator.data["data_per_contract"][MOCK_CONTRACT_1][KEY_FACTURASOLD] == {"v": 2}
+    assert coordinator.data["data_per_contract"][MOCK_CONTRACT_2] is untouched
+    assert coordinator.changed_keys == {MOCK_CONTRACT_1: {KEY_FACTURASOLD}}
+
+
+@pytest.mark.asyncio
+async def test_partial_refresh_waits_for_a_running_full_refresh():
+    """A partial refresh merges into the result of a concurrent full refresh, never into older data."""
+    hass = MagicMock(spec=HomeAssistant)
+    api_client = make_api_client(fetch_return={})
+    coordinator = make_coordinator(hass, api_client)
+    coordinator.data = await coordinator._async_update_data()
+
+    release = asyncio.Event()
+
+    async def slow_wallet():
+        await release.wait()
+        return {"balance": 5}
+
+    api_client.async_fetch_user_wallet = AsyncMock(side_effect=slow_wallet)
+    full = asyncio.create_task(coordinator._async_update_data())
+    await asyncio.sleep(0)
+    partial = asyncio.create_task(coordinator.async_refresh_keys([(MOCK_CONTRACT_1, KEY_ARHIVA)]))
+    await asyncio.sleep(0.01)
+    api_client.async_fetch_arhiva_data.reset_mock()
+    assert not partial.done()
+
+    release.set()
+    # As DataUpdateCoordinator does, the full result becomes the data as soon as it returns
+    coordinator.data = await full
+    await partial
+    api_client.async_fetch_arhiva_data.assert_awaited_once()
+    assert coordinator.data["user_wallet"] == {"balance": 5}
+
+
+@pytest.mark.asyncio
+async def test_coordinator_publishes_fast_contracts_first():
+    """On later refreshes each contract is shown as soon as its own fetches finish."""
+    import asyncio
+
+    hass = MagicMock(spec=HomeAssistant)
+    api_client = make_api_client(fetch_return={"v": 1})
+    coordinator = make_coordinator(hass, api_client)
+    coordinator.data = await coordinator._async_update_data()
+
+    async def readings(cod):
+        await asyncio.sleep(0.05 if cod == MOCK_CONTRACT_2 else 0)
+        return {"v": 2}
+
+    published = {MOCK_CONTRACT_1: [], MOCK_CONTRACT_2: []}
+    for cod, seen in published.items():
+        coordinator.async_add_contract_listener(cod, lambda seen=seen: seen.append(
+            {cod: data[KEY_CITIREINDEX] for cod, data in coordinator.data["data_per_contract"].items()}
+        ))
+    api_client.async_fetch_citireindex_data = AsyncMock(side_effect=readings)
+    with patch("custom_components.lejer_eonromania.coordinator.time.time", return_value=time.time() + 3600):
+        coordinator.data = await coordinator._async_update_data()
+
+    # The fast contract was visible while the slow one still had its old reading;
+    # only its own listeners were woken, and the last contract waits for the full update
+    assert published[MOCK_CONTRACT_1] == [{MOCK_CONTRACT_1: {"v": 2}, MOCK_CONTRACT_2: {"v": 1}}]
+    assert published[MOCK_CONTRACT_2] == []
+    coordinator.async_update_listeners.assert_not_called()
+    assert coordinator.data["data_per_contract"][MOCK_CONTRACT_2][KEY_CITIREINDEX] == {"v": 2}
+    assert coordinator.changed_keys[MOCK_CONTRACT_2] == {KEY_CITIREINDEX}
+
+
+@pytest.mark.asyncio
+async def test_iter_contracts_bounds_contracts_in_flight():
+    """External consumers get one bundle per contract with a bounded number in flight."""
+    import asyncio
+
+    hass = MagicMock(spec=HomeAssistant)
+    api_client = make_api_client(fetch_return={"v": 1})
+    in_flight = peak = 0
+
+    async def dateuser(cod):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"accountContract": cod}
+
+    api_client.async_fetch_dateuser_data = AsyncMock(side_effect=dateuser)
+    coordinator = make_coordinator(hass, api_client)
+    codes = [f"C{i}" for i in range(6)]
+
+    bundles = [bundle async for bundle in coordinator.async_iter_contracts(codes, keys=[KEY_DATEUSER], limit=2)]
+
+    assert sorted(cod for cod, _ in bundles) == codes
+    assert all(data == {KEY_DATEUSER: {"accountContract": cod}} for cod, data in bundles)
+    assert peak == 2
+    assert not coordinator._fetched_at
+
+
+def test_track_entities_adds_and_retires_incrementally():
+    """Entities follow the discovered topology, rebuilt only when it changes."""
+    from custom_components.lejer_eonromania.entity import async_track_entities
+
+    class FakeEntity:
+        def __init__(self, year):
+            self.year = year
+            self.hass = MagicMock()
+            self.async_remove = MagicMock()
+
+    coordinator = MagicMock()
+    coordinator.data = {}
+    coordinator.last_update_success = True
+    coordinator.topology_generation = 1
+    listeners = []
+    coordinator.async_add_listener.side_effect = lambda cb: listeners.append(cb) or MagicMock()
+
+    years = ["2024"]
+    builds = []
+    added = []
+
+    def build(known):
+        builds.append(set(known))
+        return {("arhiva", year): lambda year=year: FakeEntity(year) for year in years}
+
+    async_track_entities(coordinator, MagicMock(), lambda entities: added.extend(entities), build)
+    assert [e.year for e in added] == ["2024"]
+
+    # Updates that leave the topology alone do not run the builder
+    listeners[0]()
+    assert len(builds) == 1
+
+    # A new year shows up on the next topology change, without duplicating the old one
+    years.append("2025")
+    coordinator.topology_generation = 2
+    listeners[0]()
+    assert [e.year for e in added] == ["2024", "2025"]
+    assert builds[-1] == {("arhiva", "2024")}
+
+    # A failed refresh never retires anything
+    years.remove("2024")
+    coordinator.topology_generation = 3
+    coordinator.last_update_success = False
+    listeners[0]()
+    added[0].async_remove.assert_not_called()
+
+    coordinator.last_update_success = True
+    listeners[0]()
+    added[0].async_remove.assert_called_once_with(force_remove=True)
+    added[1].async_remove.assert_not_called()
+
+    # A retired entity that comes back is added again
+    years.append("2024")
+    coordinator.topology_generation = 4
+    listeners[0]()
+    assert [e.year for e in added] == ["2024", "2025", "2024"]
+
+
+@pytest.mark.asyncio
+async def test_optional_sensors_survive_empty_lists():
+    """A sensor created for a list stays, showing 0, when the list becomes empty."""
+    from custom_components.lejer_eonromania.entity import async_track_entities
+    from custom_components.lejer_eonromania.sensor import EonPaymentNoticeSensor, _build_sensors
+
+    hass = MagicMock(spec=HomeAssistant)
+    api_client = make_api_client(fetch_return={"v": 1})
+    api_client.async_fetch_payment_notices = AsyncMock(return_value=[{"amount": 10}])
+    api_client.async_fetch_citireindex_data = AsyncMock(return_value=None)
+    coordinator = make_coordinator(hass, api_client)
+    coordinator.last_update_success = True
+    listeners = []
+    coordinator.async_add_listener = MagicMock(side_effect=lambda cb: listeners.append(cb) or MagicMock())
+    coordinator.data = await coordinator._async_update_data()
+
+    config_entry = MagicMock(entry_id="entry")
+    added = []
+    async_track_entities(
+        coordinator, config_entry, lambda entities: added.extend(entities),
+        lambda known: _build_sensors(coordinator, config_entry, known),
+    )
+    notices = [e for e in added if isinstance(e, EonPaymentNoticeSensor)]
+    assert len(notices) == 2
+    for entity in added:
+        entity.coordinator = coordinator
+        entity.hass = MagicMock()
+        entity.async_remove = MagicMock()
+
+    api_client.async_fetch_payment_notices = AsyncMock(return_value=[])
+    with patch("custom_components.lejer_eonromania.coordinator.time.time", return_value=time.time() + 3600):
+        coordinator.data = await coordinator._async_update_data()
+    listeners[0]()
+
+    for entity in notices:
+        entity.async_remove.assert_not_called()
+        assert entity.state == 0
+    assert len(added) == len(set(added))
+
+
+def test_topology_flattens_and_deduplicates_contracts():
+    """Collective contracts are replaced by their sub-contracts, each code once."""
+    from custom_components.lejer_eonromania.models import ContractTopology
+
+    topology = ContractTopology([
+        {"contractDetails": {"accountContract": "DUO", "type": "DUO"}, "subContracts": [
+            {"accountContract": MOCK_CONTRACT_1, "productType": "E.ON GAS"},
+            {"accountContract": MOCK_CONTRACT_2},
+        ]},
+        {"contractDetails": {"accountContract": MOCK_CONTRACT_2}},
+        {"contractId": "0003333333"},
+        {"contractDetails": {}},
+    ])
+
+    assert topology.codes == [MOCK_CONTRACT_1, MOCK_CONTRACT_2, "0003333333"]
+    assert topology.parents == {MOCK_CONTRACT_1: "DUO", MOCK_CONTRACT_2: "DUO"}
+    assert topology.product_types == {MOCK_CONTRACT_1: "E.ON GAS"}
+
+
+@pytest.mark.asyncio
+async def test_coordinator_fetches_contract_list_on_its_own_ttl():
+    """The contract list is fetched once per topology TTL, the wallet on every tick."""
+    hass = MagicMock(spec=HomeAssistant)
+    api_client = make_api_client(fetch_return={})
+    coordinator = make_coordinator(hass, api_client, topology_interval=86400)
+
+    coordinator.data = await coordinator._async_update_data()
+    assert coordinator.topology.codes == [MOCK_CONTRACT_1, MOCK_CONTRACT_2]
+
+    data = await coordinator._async_update_data()
+    assert api_client.async_fetch_account_contracts_list.call_count == 1
+    assert api_client.async_fetch_user_wallet.call_count == 2
+    assert set(data["data_per_contract"]) == {MOCK_CONTRACT_1, MOCK_CONTRACT_2}
+    assert KEY_CONTRACTS not in coordinator.changed_account_keys
+    coordinator.last_update_success = True
+    diagnostics = coordinator.diagnostics()
+    assert diagnostics["topology"]["contracts"] == 2 and diagnostics["topology"]["age"] < 5
+    assert set(diagnostics["refresh"]["key_ages"]) == {"contract_1", "contract_2"}
+
+    # Once expired, a changed list rebuilds the topology
+    coordinator._topology_fetched_at -= 86400
+    api_client.async_fetch_account_contracts_list.return_value = MOCK_CONTRACTS_LIST[:1]
+    data = await coordinator._async_update_data()
+    assert coordinator.topology.codes == [MOCK_CONTRACT_1]
+    assert list(data["data_per_contract"]) == [MOCK_CONTRACT_1]
+    assert KEY_CONTRACTS in coordinator.changed_account_keys
+
+
+@pytest.mark.asyncio
+async def test_download_last_invoice_uses_the_account_owning_the_contract():
+    """The service is shared by all entries and downloads through the contract's own account."""
+    from custom_components.lejer_eonromania import DOMAIN, _async_download_last_invoice
+    from custom_components.lejer_eonromania.const import KEY_PAID_INVOICES
+
+    def account(cod):
+        coordinator = MagicMock()
+        coordinator.contract_index = {cod: object()}
+        coordinator.async_refresh_keys = AsyncMock()
+        coordinator.data = {"data_per_contract": {cod: {KEY_PAID_INVOICES: [{"invoiceNumber": f"F{cod}"}]}}}
+        coordinator.api_client.async_download_invoice_pdf = AsyncMock(return_value=MagicMock(size=1, skipped=False))
+        return coordinator
+
+    first, second = account(MOCK_CONTRACT_1), account(MOCK_CONTRACT_2)
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"a": {"coordinator": first}, "b": {"coordinator": second}}}
+    handler = _async_download_last_invoice(hass)
+
+    await handler(MagicMock(data={"cod_incasare": MOCK_CONTRACT_2}))
+    first.api_client.async_download_invoice_pdf.assert_not_awaited()
+    assert second.api_client.async_download_invoice_pdf.await_args.kwargs["invoice_number"] == f"F{MOCK_CONTRACT_2}"
+
+    await handler(MagicMock(data={}))
+    first.api_client.async_download_invoice_pdf.assert_awaited_once()